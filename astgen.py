@@ -0,0 +1,613 @@
+# -----------------------------------------------------------------------------
+# narrtr: astgen.py
+# This file compiles narratr programs straight to Python code objects.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""A code generator backend that builds Python ASTs instead of source text.
+
+AstGen registers its own handler for every node type CodeGen handles, each
+returning Python ast nodes: statements as lists, expressions as single
+nodes. The resulting module is handed to compile(), so the game never
+exists as Python source that has to be parsed again. Line numbers come from
+the narratr AST, and the code object's file name is the narratr source, so
+tracebacks point into the story itself. The code object can be saved as a
+.pyc with write_pyc(), which python runs directly, or run in-process with
+run()."""
+
+import __builtin__
+import __future__
+import gc
+import ast
+import imp
+import struct
+import marshal
+from codegen import CodeGen, handles, install_runtime, _static_moves
+from optimize import dispatch_chain, constant_fields
+
+# Contexts and operators carry no position, so one of each is shared by
+# every node that needs it.
+_LOAD = ast.Load()
+_STORE = ast.Store()
+_PARAM = ast.Param()
+_DEL = ast.Del()
+_COMPARISONS = {"==": ast.Eq(), "!=": ast.NotEq(), "not": ast.NotEq(),
+                "<": ast.Lt(), ">": ast.Gt(), "<=": ast.LtE(),
+                ">=": ast.GtE()}
+_BINARY = {"+": ast.Add(), "-": ast.Sub(), "*": ast.Mult(), "/": ast.Div(),
+           "//": ast.FloorDiv()}
+_UNARY = {"+": ast.UAdd(), "-": ast.USub()}
+_NOT = ast.Not()
+_IS = ast.Is()
+
+
+def _name(name, ctx=_LOAD):
+    return ast.Name(name, ctx)
+
+
+def _self(attr, ctx=_LOAD):
+    return ast.Attribute(_name("self"), attr, ctx)
+
+
+def _call(func, *args):
+    return ast.Call(func, list(args), [], None, None)
+
+
+# scenes[sid], where scenes is a Scenes.
+def _scene(scenes, sid):
+    return ast.Subscript(scenes, ast.Index(ast.Num(sid)), _LOAD)
+
+
+def _method(name, params, body):
+    args = ast.arguments([_name(p, _PARAM) for p in ["self"] + params],
+                         None, None, [])
+    return ast.FunctionDef(name, args, body or [ast.Pass()], [])
+
+
+# Returns the expression for a str, bool or number.
+def _constant(value):
+    if type(value) is str:
+        return ast.Str(value)
+    if type(value) is bool:
+        return _name(str(value))
+    return ast.Num(value)
+
+
+# Gives a Python ast node the line number of the narratr node it came from.
+def _at(node, pynode):
+    if node.lineno:
+        pynode.lineno = node.lineno
+        pynode.col_offset = 0
+    return pynode
+
+
+def _number_lines(statements, last=1):
+    """Give every node under statements a line number, in the order compiled.
+
+    Nodes without one (such as those built for the boilerplate) take the
+    last line number seen. Python 2 can't record line numbers that go
+    backwards within a code object, so none are allowed to. Returns the last
+    line number given out."""
+    AST = ast.AST
+    stack = list(reversed(statements))
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        if node._attributes:
+            d = node.__dict__
+            if d.get("lineno", 0) < last:
+                node.lineno = last
+            else:
+                last = node.lineno
+            if "col_offset" not in d:
+                node.col_offset = 0
+        for field in reversed(node._fields):
+            value = getattr(node, field)
+            if type(value) is list:
+                for child in reversed(value):
+                    if isinstance(child, AST) and (child._fields or
+                                                   child._attributes):
+                        push(child)
+            elif isinstance(value, AST) and (value._fields or
+                                             value._attributes):
+                push(value)
+    return last
+
+
+class AstGen(CodeGen):
+    """Lowers a narratr AST to a Python module AST and code object.
+
+    Use it like CodeGen: process() the program, then call module() for the
+    Python ast.Module, or compile() for a code object."""
+    def __init__(self, diagnostics=None, optimize=True, keep_all=False):
+        CodeGen.__init__(self, diagnostics, optimize=optimize,
+                         keep_all=keep_all)
+        self.scene_classes = []
+        self.item_classes = []
+        self.main = []
+
+    def module(self):
+        """Return the whole program as an ast.Module.
+
+        Like code(), this must be run AFTER process(), and raises
+        CompileError if any errors have been reported."""
+        self.finish()
+        prologue = [ast.ImportFrom("sys", [ast.alias("exit", None)], 0),
+                    ast.ImportFrom("narratr_runtime",
+                                   [ast.alias(name, None) for name in
+                                    ["Scene", "Scenes", "pocket_class",
+                                     "_unset"]], 0),
+                    ast.Assign([_name("pocket", _STORE)],
+                               _call(_name("pocket_class")))]
+        # Classes are defined in the order they appear in the source, so
+        # their line numbers don't go backwards.
+        classes = sorted(self.scene_classes + self.item_classes,
+                         key=lambda c: getattr(c, "lineno", 0))
+        last = _number_lines(prologue + classes)
+        _number_lines(self.main, last)
+        return ast.Module(prologue + classes + self.main)
+
+    def compile(self, filename="<narratr>"):
+        """Return the program as a code object, as if compiled from a file
+        called filename."""
+        return compile(self.module(), filename, "exec",
+                       __future__.division.compiler_flag, True)
+
+    def code(self):
+        raise ValueError("AstGen generates code objects, not source; " +
+                         "use compile().")
+
+    def _add_scene(self, scene):
+        self.scene_classes.append(scene)
+
+    def _add_item(self, item):
+        self.item_classes.append(item)
+
+    # The main program creates the scenes and runs the game, exactly as
+    # CodeGen writes it.
+    def _add_main(self, startstate):
+        if self.started:
+            self._process_error("Multiple start scene declarations.",
+                                startstate.lineno)
+        self.started = True
+        main = [ast.Assign([_name("scenes", _STORE)],
+                           _call(_name("Scenes"), _call(_name("globals"))))]
+        start = self._start_scene(startstate)
+        loop = ast.While(_name("True"), [
+            ast.Assign([_name("next", _STORE)], _call(_name("next")))],
+            [])
+        main.append(ast.If(ast.Compare(_name("__name__"), [_COMPARISONS["=="]],
+                                       [ast.Str("__main__")]),
+                           [ast.Assign([_name("next", _STORE)],
+                                       ast.Attribute(_scene(_name("scenes"),
+                                                            start),
+                                                     "setup", _LOAD)),
+                            loop], []))
+        self.main = main
+
+    # A scene becomes a subclass of Scene with methods for the blocks it has
+    # code for, exactly as CodeGen writes it.
+    def _scene_gen(self, scene, sid):
+        self.tables = []
+        slots = self._place_variables(scene)
+        moves = self.static_moves = _static_moves(scene)
+        body = [ast.Assign([_name("__slots__", _STORE)],
+                           ast.Tuple([ast.Str(s) for s in slots], _LOAD))]
+        if moves is not None:
+            body.append(ast.Assign([_name("moves", _STORE)],
+                                   self._directions(moves[0])))
+        if self.gods:
+            methods = [_method("__init__", [], self._unset_gods())]
+        else:
+            methods = []
+        for c in scene.children:
+            if c.type == "setup_block" and c.children:
+                methods.append(_at(c, _method("setup", [], self._block_suite(
+                    c, "setup") + [ast.Return(_call(_self("action")))])))
+            elif c.type == "action_block" and c.children:
+                if len(c.children) != 1 or c[0].type != "suite":
+                    self._process_error("action block doesn't have suite " +
+                                        "child")
+                methods.append(_at(c, _method("respond", ["response"],
+                                              self._action_body(c[0]))))
+            elif c.type == "cleanup_block":
+                reset = [ast.TryExcept(
+                    [ast.Delete([_self(name, _DEL)])],
+                    [ast.ExceptHandler(_name("AttributeError"), None,
+                                       [ast.Pass()])], [])
+                    for name in self.shared]
+                statements = self._block_suite(c, "cleanup") + reset
+                if statements:
+                    methods.append(_at(c, _method("cleanup", [], statements)))
+        # The blocks fill in the dispatch tables, so these come last.
+        body += self._tables() + methods
+        return _at(scene, ast.ClassDef("s_" + str(sid), [_name("Scene")],
+                                       body, []))
+
+    # See CodeGen._unset_gods().
+    def _unset_gods(self):
+        return [ast.Assign([_self(g, _STORE) for g in self.gods],
+                           _name("_unset"))]
+
+    # Returns the assignments of the dispatch tables to class attributes.
+    def _tables(self):
+        return [ast.Assign([_name("__dispatch_" + str(i), _STORE)],
+                           ast.Dict([_constant(k) for k, v in table],
+                                    [ast.Num(v) for k, v in table]))
+                for i, table in enumerate(self.tables)]
+
+    # Returns the statements of a setup, action or cleanup block.
+    def _block_suite(self, c, name):
+        if len(c.children) not in [0, 1]:
+            self._process_error(name + " block has wrong number of children")
+        if len(c.children) == 0:
+            return []
+        if c[0].type != "suite":
+            self._process_error(name + " block doesn't have suite child")
+        return self.visit(c[0])
+
+    # An item becomes a class whose __init__() takes its parameters.
+    def _item_gen(self, item, iid):
+        iid = item.value
+        constants = constant_fields(item) if self.optimize else None
+        if constants is not None:
+            return _at(item, self._constant_item(iid, constants))
+        self.tables = []
+        self.variables = {}
+        self.gods = self._god_variables("item." + str(iid))
+        self.god_prefix = ""
+        if len(item.children) not in [1, 2]:
+            self._process_error("Wrong number of children of item",
+                                item.lineno)
+        if item[0].type != "itemparams":
+            self._process_error("Wrong number of items", item.lineno)
+        params = []
+        if item[0].children:
+            params = [str(param.value) for param in item[0][0].children]
+        body = self._unset_gods() if self.gods else []
+        if len(item.children) == 2:
+            if item[1].type != "suite":
+                self._process_error("Wrong type of child for item",
+                                    item.lineno)
+            body += self.visit(item[1])
+        slots = ast.Assign([_name("__slots__", _STORE)],
+                           ast.Tuple([ast.Str(f)
+                                      for f in self._item_fields(item)],
+                                     _LOAD))
+        return _at(item, ast.ClassDef(str(iid), [_name("object")],
+                                      [slots] + self._tables() +
+                                      [_method("__init__", params, body)],
+                                      []))
+
+    # See CodeGen._constant_item().
+    def _constant_item(self, iid, fields):
+        instance = ast.Attribute(_name("cls"), "__instance", _LOAD)
+        new = ast.FunctionDef("__new__", ast.arguments(
+            [_name("cls", _PARAM)], None, None, []), [
+            ast.If(ast.Compare(instance, [_IS], [_name("None")]),
+                   [ast.Assign([ast.Attribute(_name("cls"), "__instance",
+                                              _STORE)],
+                               _call(ast.Attribute(_name("object"),
+                                                   "__new__", _LOAD),
+                                     _name("cls")))], []),
+            ast.Return(instance)], [])
+        body = [ast.Assign([_name("__slots__", _STORE)],
+                           ast.Tuple([], _LOAD)),
+                ast.Assign([_name("__instance", _STORE)], _name("None"))]
+        body.extend(ast.Assign([_name(str(name), _STORE)], _constant(value))
+                    for name, value in fields)
+        return ast.ClassDef(str(iid), [_name("object")], body + [new], [])
+
+    # Statement handlers return lists of statements. The indentation level
+    # CodeGen passes them means nothing here.
+
+    @handles("suite", "statement", "simple_statement", "block_statement",
+             "flow_statement")
+    def _stmt_wrapper(self, node, indentlevel=1):
+        if len(node.children) != 1:
+            self._process_error("'" + node.type + "' has incorrect number " +
+                                "of children.", node.lineno)
+        return self.visit(node[0])
+
+    @handles("statements", "elif_statements")
+    def _stmt_list(self, node, indentlevel=1):
+        body = []
+        for child in node.children:
+            body.extend(self.visit(child))
+        return body
+
+    @handles("say_statement", "exposition")
+    def _stmt_say(self, smt, indentlevel=1):
+        return [_at(smt, ast.Print(None, self.visit(smt[0]), True))]
+
+    @handles("win_statement", "lose_statement")
+    def _stmt_win(self, smt, indentlevel=1):
+        body = []
+        if smt.children:
+            body.append(_at(smt, ast.Print(None, self.visit(smt[0]), True)))
+        body.append(_at(smt, ast.Expr(_call(_name("exit"), ast.Num(0)))))
+        return body
+
+    @handles("expression_statement")
+    def _stmt_expression(self, smt, indentlevel=1):
+        if len(smt.children) == 0:
+            self._process_error("expression statement has no children to" +
+                                " process.", smt.lineno)
+        if smt.value == "testlist":
+            return [_at(smt, ast.Expr(self._tuple(smt[0])))]
+        value = self._tuple(smt[1])
+        name = smt[0].value
+        if smt.value == "godis":
+            name = self.god_prefix + name
+            return [_at(smt, ast.If(
+                ast.Compare(_self(name), [_IS], [_name("_unset")]),
+                [ast.Assign([_self(name, _STORE)], value)], []))]
+        entry = self.symtab.getWithKey(smt[0].key)
+        if entry and entry.god:
+            target = _self(self.god_prefix + name, _STORE)
+        else:
+            target = self._variable_node(smt[0].key, name, _STORE)
+        return [_at(smt, ast.Assign([target], value))]
+
+    # See CodeGen._variable().
+    def _variable_node(self, key, name, ctx=_LOAD):
+        place = self.variables.get(key)
+        if place is None:
+            return _self(name, ctx)
+        if place[1]:
+            return _self(place[0], ctx)
+        return _name(place[0], ctx)
+
+    # See CodeGen._process_action_block().
+    @handles("continue_statement")
+    def _stmt_continue(self, smt, indentlevel=1):
+        if self.loops == 0:
+            return [_at(smt, ast.Return(None))]
+        return [_at(smt, ast.Continue())]
+
+    @handles("break_statement")
+    def _stmt_break(self, smt, indentlevel=1):
+        if self.loops == 0:
+            self._process_error("A break in an action block has to be in " +
+                                "a while loop.", smt.lineno)
+        return [_at(smt, ast.Break())]
+
+    @handles("moves_declaration")
+    def _stmt_moves(self, smt, indentlevel=1):
+        if smt is self.static_moves:
+            return []
+        if len(smt.children) != 1 or smt[0].type != "directionlist":
+            self._process_error("moves declaration has wrong children")
+        return [_at(smt, ast.If(ast.UnaryOp(_NOT, _self("_directions")),
+                                [ast.Assign([_self("_directions", _STORE)],
+                                            self._directions(smt[0]))],
+                                []))]
+
+    # Returns the dictionary of a directionlist, from direction to scene ID.
+    def _directions(self, directionlist):
+        keys = []
+        values = []
+        for d in directionlist.children:
+            if len(d.children) != 1:
+                self._process_error("incorrect children of direction")
+            self._check_scene(d[0])
+            keys.append(ast.Str(str(d.value)))
+            values.append(ast.Num(d[0].value))
+        return ast.Dict(keys, values)
+
+    @handles("moveto_statement")
+    def _stmt_moveto(self, smt, indentlevel=1):
+        if len(smt.children) != 1 or smt[0].type != "sceneid":
+            self._process_error("moveto has the wrong children")
+        return [_at(smt, ast.Expr(_call(_self("cleanup")))),
+                _at(smt, ast.Return(ast.Attribute(
+                    _scene(_self("_scenes"), smt[0].value), "setup",
+                    _LOAD)))]
+
+    @handles("while_statement")
+    def _stmt_while(self, smt, indentlevel=1):
+        if smt[0].type != "test" or smt[1].type != "suite":
+            self._process_error("Invalid while loop", smt.lineno)
+        return [_at(smt, ast.While(self.visit(smt[0]),
+                                   self._loop_body(smt[1]), []))]
+
+    @handles("if_statement", "elif_statement")
+    def _stmt_if(self, smt, indentlevel=1):
+        if smt[0].type != "test" or smt[1].type != "suite":
+            self._process_error("Invalid if tree", smt.lineno)
+        chain = (self.optimize and smt.type == "if_statement" and
+                 dispatch_chain(smt))
+        if chain:
+            return self._stmt_dispatch(smt, chain)
+        orelse = []
+        if smt.type == "if_statement":
+            if smt[3]:
+                orelse = self.visit(smt[3])
+            # Each elif is an if in the else branch of the one before.
+            if smt[2]:
+                for elif_smt in reversed(self.visit(smt[2])):
+                    elif_smt.orelse = orelse
+                    orelse = [elif_smt]
+        return [_at(smt, ast.If(self.visit(smt[0]), self.visit(smt[1]),
+                                orelse))]
+
+    # See CodeGen._process_dispatch().
+    def _stmt_dispatch(self, smt, chain):
+        subject, branches = chain
+        suites = [smt[3], smt[1]]
+        if smt[2]:
+            suites.extend(e[1] for e in smt[2].children)
+        lookup = _call(ast.Attribute(_self(self._add_table(branches)), "get",
+                                     _LOAD), self.visit(subject), ast.Num(0))
+        branch = _name("_branch", _STORE)
+        handler = ast.ExceptHandler(_name("TypeError"), None, [
+            ast.Assign([branch], ast.Num(0))])
+        return [_at(smt, ast.TryExcept([ast.Assign([branch], lookup)],
+                                       [handler], [])),
+                _at(smt, self._dispatch_tree(suites, 0, len(suites) - 1))]
+
+    # Returns the if that runs suites[_branch], for lo <= _branch <= hi.
+    def _dispatch_tree(self, suites, lo, hi):
+        if hi - lo >= 3:
+            mid = (lo + hi + 1) // 2
+            return ast.If(ast.Compare(_name("_branch"), [_COMPARISONS["<"]],
+                                      [ast.Num(mid)]),
+                          [self._dispatch_tree(suites, lo, mid - 1)],
+                          [self._dispatch_tree(suites, mid, hi)])
+        orelse = self.visit(suites[hi]) if suites[hi] else [ast.Pass()]
+        for i in range(hi - 1, lo - 1, -1):
+            body = self.visit(suites[i]) if suites[i] else [ast.Pass()]
+            orelse = [ast.If(ast.Compare(_name("_branch"),
+                                         [_COMPARISONS["=="]], [ast.Num(i)]),
+                             body, orelse)]
+        return orelse[0]
+
+    # Expression handlers return a single expression, except for testlist,
+    # args and calllist, which return lists of them.
+
+    # A testlist as a value is a tuple, unless it holds just one test.
+    def _tuple(self, testlist):
+        values = self.visit(testlist)
+        if len(values) == 1:
+            return values[0]
+        return ast.Tuple(values, _LOAD)
+
+    @handles("testlist", "args")
+    def _expr_list(self, node):
+        h = self.handlers
+        return [h[child.type](self, child) for child in node.children]
+
+    @handles("test", "expression", "or_test", "and_test", "not_test",
+             "comparison", "arithmetic_expression", "term", "factor")
+    def _expr_operator(self, node):
+        h = self.handlers
+        children = node.children
+        left = children[0]
+        left = h[left.type](self, left)
+        if len(children) == 1:
+            t = node.type
+            if t == "not_test" and node.value == "not":
+                return ast.UnaryOp(_NOT, left)
+            if t == "factor" and node.value != "power":
+                return ast.UnaryOp(_UNARY[node.value], left)
+            return left
+        right = children[-1]
+        right = h[right.type](self, right)
+        if node.type == "or_test":
+            return ast.BoolOp(ast.Or(), [left, right])
+        if node.type == "and_test":
+            return ast.BoolOp(ast.And(), [left, right])
+        if node.type == "comparison":
+            return ast.Compare(left, [_COMPARISONS[children[1].value]],
+                               [right])
+        return ast.BinOp(left, _BINARY[node.value], right)
+
+    @handles("atom")
+    def _expr_atom(self, atom):
+        if atom.children:
+            child = atom.children[0]
+            return self.handlers[child.type](self, child)
+        if atom.v_type == "string":
+            return ast.Str(str(atom.value))
+        if not atom.v_type:
+            self._process_error("Name Error: " + str(atom.value) +
+                                " is not defined.", atom.lineno)
+        entry = self.symtab.getWithKey(atom.key)
+        if not entry:
+            return _name(atom.value)
+        if entry.god:
+            return _self(self.god_prefix + atom.value)
+        return self._variable_node(atom.key, atom.value)
+
+    @handles("number")
+    def _expr_number(self, number):
+        return ast.Num(number.value)
+
+    @handles("boolean")
+    def _expr_boolean(self, boolean):
+        return _name(str(boolean.value))
+
+    @handles("list")
+    def _expr_list_literal(self, nlist):
+        if not nlist.children:
+            return ast.List([], _LOAD)
+        return ast.List(self.visit(nlist[0]), _LOAD)
+
+    @handles("power")
+    def _expr_power(self, power):
+        h = self.handlers
+        children = power.children
+        first = children[0]
+        if power.value == "trailer" and first.v_type == "id" and \
+                first.value == "pocket" and \
+                not self.symtab.get("pocket", "GLOBAL"):
+            self._pocket_method(power)
+        value = h[first.type](self, first)
+        for trailer in children[1:]:
+            value = h[trailer.type](self, trailer, value)
+        return value
+
+    # A trailer is handed the expression it follows, and returns that
+    # expression with the attribute looked up or the call made.
+    @handles("trailer")
+    def _expr_trailer(self, trailer, value):
+        if len(trailer.children) != 1:
+            self._process_error("'trailer' has incorrect " +
+                                "number of children.", trailer.lineno)
+        if trailer.value == "dot":
+            return ast.Attribute(value, str(trailer[0]), _LOAD)
+        return ast.Call(value, self.visit(trailer[0]), [], None, None)
+
+    @handles("calllist")
+    def _expr_calllist(self, calllist):
+        if not calllist.value:
+            return []
+        return self.visit(calllist[0])
+
+
+def compile_program(ast_, symtab, filename="<narratr>", diagnostics=None,
+                    keep_all=False):
+    """Compile a parsed narratr program to a Python code object.
+
+    Raises CompileError if the program has errors. The Python AST is made of
+    many more objects than the narratr one, and none of them are garbage
+    until it has been compiled, so the cyclic garbage collector is kept from
+    scanning them over and over while it is built."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        a = AstGen(diagnostics, keep_all=keep_all)
+        a.process(ast_, symtab)
+        return a.compile(filename)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def write_pyc(code, path):
+    """Save a code object as a .pyc file, which python can run directly.
+
+    A copy of the runtime it imports is put next to it."""
+    with open(path, 'wb') as f:
+        f.write(imp.get_magic())
+        f.write(struct.pack("<I", 0))
+        marshal.dump(code, f)
+    install_runtime(path)
+
+
+def run(code):
+    """Run a compiled game in this process, as its own __main__ module.
+
+    The game reads from sys.stdin and prints to sys.stdout; when it ends,
+    it raises SystemExit."""
+    namespace = {"__name__": "__main__", "__builtins__": __builtin__}
+    exec code in namespace
@@ -0,0 +1,149 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_ast_memory.py
+# This file measures the memory and parse time taken by large ASTs.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""AST memory with slotted nodes versus the old dictionary-based nodes.
+
+The scenes and items of every sample program that compiles are copied,
+with fresh scene IDs and item names, until the program has the requested
+number of scenes. It is then parsed twice: once with node.Node, and once
+with the parser patched to build LegacyNode, a copy of the node class as it
+was before it had slots. For each AST we count the nodes and add up the
+memory held by the node objects themselves (and their __dict__, if any)
+and by their lists of children.
+
+Usage: python benchmarks/bench_ast_memory.py [scenes]"""
+
+import os
+import re
+import sys
+import glob
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import parser
+from node import Node
+from incremental import split_blocks
+from diagnostics import CompileError
+
+
+class LegacyNode:
+    def __init__(self, v, t, c=[], v_type=None, lineno=0, key=None):
+        self.value = v
+        self.type = t
+        self.children = c
+        self.v_type = v_type
+        self.lineno = lineno
+        self.key = key
+
+    def is_leaf(self):
+        return len(self.children) == 0
+
+    def __getitem__(self, index):
+        return self.children[index]
+
+
+def scaled_program(scenes):
+    """Scene and item blocks from the sample programs, renumbered."""
+    programs = []
+    p = parser.ParserForNarratr()
+    for path in sorted(glob.glob(os.path.join(ROOT, "sampleprograms",
+                                              "*.ntr"))):
+        with open(path) as f:
+            source = f.read()
+        try:
+            p.parse(source)
+        except CompileError:
+            continue
+        programs.append([b for b in split_blocks(source)
+                         if b.kind != "start"])
+    blocks = []
+    made = 0
+    copy = 0
+    while made < scenes:
+        for program in programs:
+            # Each copy of a program gets its own range of scene IDs and
+            # its own item names.
+            offset = copy * 1000
+            copy += 1
+            for b in program:
+                text = re.sub(r"\$([0-9]+)",
+                              lambda m: "$" + str(int(m.group(1)) + offset),
+                              b.text)
+                if b.kind == "item":
+                    text = text.replace("item " + b.key, "item %s_%d"
+                                        % (b.key, copy), 1)
+                else:
+                    made += 1
+                blocks.append(text)
+            if made >= scenes:
+                break
+    return "\n\n".join(blocks) + "\n"
+
+
+def measure(tree):
+    """(nodes, bytes) held by the nodes of tree and their child lists."""
+    seen = set()
+    nodes = 0
+    size = 0
+    stack = [tree]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, dict):
+            stack.extend(n.values())
+            continue
+        if n is None or not hasattr(n, "children") or id(n) in seen:
+            continue
+        seen.add(id(n))
+        nodes += 1
+        size += sys.getsizeof(n)
+        if hasattr(n, "__dict__"):
+            size += sys.getsizeof(n.__dict__)
+        if id(n.children) not in seen:
+            seen.add(id(n.children))
+            size += sys.getsizeof(n.children)
+        stack.extend(n.children)
+    return nodes, size
+
+
+def parse(source, node_class):
+    parser.Node = node_class
+    try:
+        p = parser.ParserForNarratr()
+        start = time.time()
+        ast = p.parse(source)
+        return ast, time.time() - start
+    finally:
+        parser.Node = Node
+
+
+def main():
+    scenes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = scaled_program(scenes)
+    print "%d scenes, %d lines of source" % (scenes, source.count("\n"))
+    print "%-8s %10s %12s %10s %10s" % ("nodes", "count", "bytes",
+                                        "bytes/node", "parse (s)")
+    results = {}
+    for name, cls in [("legacy", LegacyNode), ("slots", Node)]:
+        ast, seconds = parse(source, cls)
+        count, size = measure(ast)
+        results[name] = size
+        print "%-8s %10d %12d %10.1f %10.2f" % (name, count, size,
+                                                float(size) / count, seconds)
+    print "memory saved: %.1f%%" % (100.0 * (1 - float(results["slots"]) /
+                                             results["legacy"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_astgen.py
+# This file compares the source and bytecode backends at game launch.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""What it costs to go from a parsed program to a runnable code object.
+
+A program of the requested number of scenes is built and parsed as in
+bench_ast_memory.py. It is then taken to a code object three ways:
+
+    source    CodeGen's text, compiled by Python (what running the .py does)
+    ast       AstGen's module, compiled without any source text
+    pyc       a code object saved by write_pyc(), loaded again (what running
+              the .pyc does, once it has been written)
+
+The best of several runs of each is reported.
+
+Usage: python benchmarks/bench_astgen.py [scenes] [repeats]"""
+
+import os
+import sys
+import time
+import marshal
+import __future__
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+import parser
+import codegen
+import astgen
+from bench_ast_memory import scaled_program
+
+
+def best_of(repeats, f):
+    best = None
+    for i in range(repeats):
+        start = time.time()
+        result = f()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    scenes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    p = parser.ParserForNarratr()
+    ast = p.parse(scaled_program(scenes))
+
+    def source():
+        c = codegen.CodeGen()
+        c.process(ast, p.symtab)
+        return compile(c.code(), "game.py", "exec",
+                       __future__.division.compiler_flag, True)
+
+    def bytecode():
+        return astgen.compile_program(ast, p.symtab, "game.ntr")
+
+    source_time, code = best_of(repeats, source)
+    ast_time, code = best_of(repeats, bytecode)
+    data = marshal.dumps(code)
+    pyc_time = best_of(repeats, lambda: marshal.loads(data))[0]
+    print "%d scenes, %d KB of bytecode" % (scenes, len(data) / 1024)
+    print "source  %7.3f s" % source_time
+    print "ast     %7.3f s" % ast_time
+    print "pyc     %7.3f s" % pyc_time
+
+if __name__ == "__main__":
+    main()
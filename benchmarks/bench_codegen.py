@@ -0,0 +1,55 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_codegen.py
+# This file measures the throughput of the code generator.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Code generation throughput, in AST nodes per second.
+
+A program of the requested number of scenes is built and parsed as in
+bench_ast_memory.py, and its nodes counted. Code is then generated for it
+several times over, and the best time is reported.
+
+Usage: python benchmarks/bench_codegen.py [scenes] [repeats]"""
+
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+import parser
+import codegen
+from bench_ast_memory import scaled_program, measure
+
+
+def main():
+    scenes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    p = parser.ParserForNarratr()
+    ast = p.parse(scaled_program(scenes))
+    nodes = measure(ast)[0]
+    best = None
+    for i in range(repeats):
+        start = time.time()
+        c = codegen.CodeGen()
+        c.process(ast, p.symtab)
+        code = c.code()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print "%d scenes, %d nodes, %d KB of code" % (scenes, nodes,
+                                                  len(code) / 1024)
+    print "best of %d: %.3f s, %d nodes/s" % (repeats, best, nodes / best)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_emitter.py
+# This file measures the memory taken to generate code for large programs.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Generating code into a string versus streaming it into a file.
+
+A program of each requested number of scenes is built as in
+bench_ast_memory.py. For each, a child process parses it and then generates
+its code, either with CodeGen.code() or by streaming it into a file with
+generate_file(). The child reports how much its peak memory grew while
+generating, beyond what the AST already took.
+
+Usage: python benchmarks/bench_emitter.py [scenes ...]"""
+
+import os
+import sys
+import time
+import resource
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+import parser
+import codegen
+from bench_ast_memory import scaled_program
+
+
+def peak_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode, path):
+    with open(path) as f:
+        source = f.read()
+    p = parser.ParserForNarratr()
+    ast = p.parse(source)
+    before = peak_kb()
+    start = time.time()
+    if mode == "string":
+        c = codegen.CodeGen()
+        c.process(ast, p.symtab)
+        code = c.code()
+        with open(path + ".py", "w") as f:
+            f.write(code)
+    else:
+        codegen.generate_file(ast, p.symtab, path + ".py")
+    print time.time() - start, peak_kb() - before, \
+        os.path.getsize(path + ".py")
+
+
+def main():
+    if sys.argv[1:2] == ["child"]:
+        child(sys.argv[2], sys.argv[3])
+        return
+    sizes = [int(n) for n in sys.argv[1:]] or [1000, 4000, 16000]
+    fd, path = tempfile.mkstemp(suffix=".ntr")
+    os.close(fd)
+    print "%8s %10s %8s %10s %12s" % ("scenes", "code (KB)", "mode",
+                                      "time (s)", "growth (KB)")
+    try:
+        for scenes in sizes:
+            with open(path, "w") as f:
+                f.write(scaled_program(scenes))
+            for mode in ["string", "stream"]:
+                out = subprocess.check_output([sys.executable,
+                                               os.path.abspath(__file__),
+                                               "child", mode, path])
+                seconds, growth, size = out.split()
+                print "%8d %10d %8s %10.2f %12d" % (
+                    scenes, int(size) / 1024, mode, float(seconds),
+                    int(growth))
+    finally:
+        for name in [path, path + ".py"]:
+            if os.path.exists(name):
+                os.remove(name)
+
+if __name__ == "__main__":
+    main()
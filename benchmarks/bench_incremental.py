@@ -0,0 +1,71 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_incremental.py
+# This file measures recompiling a large game after editing one scene.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Full versus incremental recompiles of a game after a one-scene edit.
+
+A ring of scenes is compiled once to warm up the IncrementalCompiler. Then
+one scene's text is edited and the program is compiled again, both from
+scratch and incrementally.
+
+Usage: python benchmarks/bench_incremental.py [scenes] [repeats]"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+
+from parser import ParserForNarratr
+from codegen import CodeGen
+from incremental import IncrementalCompiler
+from bench_moves import ring_program
+
+
+def full_compile(source, p):
+    ast = p.parse(source)
+    c = CodeGen()
+    c.process(ast, p.symtab)
+    return c.code()
+
+
+def main():
+    scenes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    source = ring_program(scenes)
+    p = ParserForNarratr()
+
+    full = 0.0
+    incremental = 0.0
+    for i in range(repeats):
+        compiler = IncrementalCompiler()
+        compiler.compile(source, p)
+        edited = source.replace("right($2)", "right($%d)" % (i + 3), 1)
+
+        start = time.time()
+        expected = full_compile(edited, p)
+        full += time.time() - start
+
+        start = time.time()
+        code = compiler.compile(edited, p)
+        incremental += time.time() - start
+        assert code == expected and compiler.compiled == 1
+
+    print "%d scenes, one edited" % scenes
+    print "full recompile:        %8.2f ms" % (full / repeats * 1000)
+    print "incremental recompile: %8.2f ms" % (incremental / repeats * 1000)
+    print "speedup:               %8.2fx" % (full / incremental)
+
+if __name__ == "__main__":
+    main()
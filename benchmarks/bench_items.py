@@ -0,0 +1,122 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_items.py
+# This file measures the memory held by the items a compiled game makes.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Item memory with slotted and constant items versus plain classes.
+
+Two items are compiled with the current code generator: a lamp, which is
+the same every time it is made, and a pony, which is made from a parameter
+and has a god variable. The game is loaded in-process, and we make the
+requested number of items, half of each, in three ways:
+
+legacy      the classes as CodeGen made them before items had slots, with
+            every instance keeping its variables in a __dict__.
+slots       the classes made with optimize=False, which have slots but make
+            a new lamp every time.
+current     the classes made by default, which hand out one lamp.
+
+For each we add up the memory held by the distinct objects made (and their
+__dict__, if any) and time how long making them took.
+
+Usage: python benchmarks/bench_items.py [items]"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+
+from parser import ParserForNarratr
+from codegen import CodeGen
+
+ITEMS = """scene $1 {
+    setup:
+    action:
+    cleanup:
+}
+item lamp() {
+    name is "lamp"
+    weight is 2
+}
+item pony(pid) {
+    id is pid
+    name is "pony"
+    god happy is true
+}
+start: $1
+"""
+
+
+def compile_program(optimize=True):
+    p = ParserForNarratr(write_tables=0, debug=0)
+    ast = p.parse(ITEMS)
+    c = CodeGen(optimize=optimize, keep_all=True)
+    c.process(ast, p.symtab)
+    return c.code()
+
+
+def legacy_program():
+    """The slotted classes, turned back into plain ones."""
+    return re.sub(r"class (lamp|pony)\(object\):\n    __slots__ = .*\n",
+                  r"class \1:\n", compile_program(optimize=False))
+
+
+def make(code, count):
+    """Make count items with the classes in code; return them and the time
+    it took."""
+    ns = {"__name__": "narratr_bench"}
+    exec code in ns
+    lamp, pony = ns["lamp"], ns["pony"]
+    start = time.time()
+    items = []
+    for i in xrange(count // 2):
+        items.append(lamp())
+        items.append(pony(i))
+    return items, time.time() - start
+
+
+def measure(items):
+    """(objects, bytes) held by the distinct objects in items."""
+    seen = set()
+    size = 0
+    for item in items:
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if hasattr(item, "__dict__"):
+            size += sys.getsizeof(item.__dict__)
+    return len(seen), size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print "%d items" % count
+    print "%-8s %10s %12s %12s %10s" % ("classes", "objects", "bytes",
+                                        "bytes/item", "make (s)")
+    results = {}
+    for name, code in [("legacy", legacy_program()),
+                       ("slots", compile_program(optimize=False)),
+                       ("current", compile_program())]:
+        items, seconds = make(code, count)
+        objects, size = measure(items)
+        results[name] = size
+        print "%-8s %10d %12d %12.1f %10.3f" % (name, objects, size,
+                                                float(size) / count, seconds)
+    print "memory saved: %.1f%%" % (100.0 * (1 - float(results["current"]) /
+                                             results["legacy"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_moves.py
+# This file measures the latency of moving between scenes in a compiled game.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Compare scene dispatch strategies for generated games.
+
+A ring of scenes is compiled with the current code generator and loaded
+in-process. The player is scripted to type "move right" forever, and we
+time how long each move takes with two dispatch loops over the same scene
+objects:
+
+direct      the trampoline emitted by CodeGen (next = next()).
+exec        the old runtime, which built a "scenes[N].setup()" string for
+            every move and ran it with exec.
+
+Usage: python benchmarks/bench_moves.py [scenes] [moves]"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+
+import narratr_runtime
+from parser import ParserForNarratr
+from codegen import CodeGen
+
+
+class EndOfScript(Exception):
+    pass
+
+
+def ring_program(n):
+    """Source for n scenes, each with moves to its left and right."""
+    blocks = []
+    for i in range(1, n + 1):
+        left = (i - 2) % n + 1
+        right = i % n + 1
+        blocks.append("scene $%d {\n    setup:\n        moves left($%d), "
+                      "right($%d)\n    action:\n    cleanup:\n}\n"
+                      % (i, left, right))
+    blocks.append("start: $1\n")
+    return "\n".join(blocks)
+
+
+def compile_program(source):
+    p = ParserForNarratr(write_tables=0, debug=0)
+    ast = p.parse(source)
+    c = CodeGen()
+    c.process(ast, p.symtab)
+    return c.code()
+
+
+def load_game(code, moves):
+    """Execute generated code as a module whose input is scripted.
+
+    The input is read by the runtime the game imports, so that is where the
+    script goes."""
+    state = {"left": moves}
+
+    def scripted_input(prompt=""):
+        if state["left"] == 0:
+            raise EndOfScript()
+        state["left"] -= 1
+        return "move right"
+
+    narratr_runtime.raw_input = scripted_input
+    ns = {"__name__": "narratr_bench"}
+    exec code in ns
+    return ns
+
+
+def run_direct(ns):
+    next = ns["scenes"][1].setup
+    try:
+        while True:
+            next = next()
+    except EndOfScript:
+        pass
+
+
+def run_exec(ns):
+    target = "scenes[1].setup()"
+    try:
+        while True:
+            exec "next = " + target in ns
+            target = "scenes[" + \
+                ns["next"].im_self.__class__.__name__[2:] + "].setup()"
+    except EndOfScript:
+        pass
+
+
+def measure(code, moves, runner):
+    ns = load_game(code, moves)
+    start = time.time()
+    runner(ns)
+    return (time.time() - start) / moves
+
+
+def main():
+    scenes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    code = compile_program(ring_program(scenes))
+
+    direct = measure(code, moves, run_direct)
+    legacy = measure(code, moves, run_exec)
+    print "%d scenes, %d moves" % (scenes, moves)
+    print "exec dispatch:   %8.3f us/move" % (legacy * 1e6)
+    print "direct dispatch: %8.3f us/move" % (direct * 1e6)
+    print "speedup:         %8.2fx" % (legacy / direct)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_package.py
+# This file measures the start-up of big games written as packages.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Start-up time and memory of a game as one file versus as a package.
+
+A ring of scenes (see bench_moves.py) is written out twice:
+
+file        one .py file, as CodeGen writes it, which python compiles every
+            time it is run, as it does any script.
+package     a package from PackageGen, with a module for each scene, each
+            imported when the player first enters it.
+
+Each is run in a fresh python as it would be played, once beforehand so
+that the package's modules have been compiled to bytecode. The player makes
+the requested number of moves and then types exit; we report the time from
+starting the game to its end, and the peak resident memory of the process.
+
+Usage: python benchmarks/bench_package.py [scenes] [moves] [repeats]"""
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+
+from parser import ParserForNarratr
+from codegen import CodeGen
+from package import write_package
+from bench_moves import ring_program
+
+SCRIPT = """
+import resource, runpy, sys, time
+start = time.time()
+sys.argv = [%r]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+seconds = time.time() - start
+# ru_maxrss keeps the high water mark of the benchmark that started us, which
+# holds the compiled game, so Linux's own figure for this process is used.
+try:
+    with open("/proc/self/status") as f:
+        peak = [l.split()[1] for l in f if l.startswith("VmHWM:")][0]
+except IOError:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print
+print seconds, peak
+"""
+
+
+def write_games(scenes, directory):
+    """Write the ring as a file and as a package; return their paths."""
+    source = ring_program(scenes)
+    p = ParserForNarratr(write_tables=0, debug=0)
+    c = CodeGen()
+    c.process(p.parse(source), p.symtab)
+    path = os.path.join(directory, "ring.py")
+    c.construct(path)
+    p = ParserForNarratr(write_tables=0, debug=0)
+    package = os.path.join(directory, "ring.pkg")
+    write_package(p.parse(source), p.symtab, package)
+    return path, package
+
+
+def measure(path, moves):
+    """(seconds, peak KB) of playing the game at path once."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    p = subprocess.Popen([sys.executable, "-c", SCRIPT % path], env=env,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    output = p.communicate("move right\n" * moves + "exit\n")[0]
+    seconds, peak = output.split("\n")[-2].split()
+    return float(seconds), int(peak)
+
+
+def main():
+    scenes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    directory = tempfile.mkdtemp()
+    try:
+        games = write_games(scenes, directory)
+        print "%d scenes, %d moves" % (scenes, moves)
+        print "%-8s %12s %12s" % ("game", "time (ms)", "peak (KB)")
+        for name, path in zip(["file", "package"], games):
+            measure(path, moves)
+            results = [measure(path, moves) for i in range(repeats)]
+            print "%-8s %12.1f %12d" % (name,
+                                        min(r[0] for r in results) * 1000,
+                                        min(r[1] for r in results))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
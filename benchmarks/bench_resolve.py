@@ -0,0 +1,131 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_resolve.py
+# This file measures the cost of attributing names to their scopes.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Resolving names as they are parsed versus walking each block afterwards.
+
+A program of the requested number of scenes is built as in
+bench_ast_memory.py and parsed twice, adding up the time spent attributing
+names to scopes: once by ParserForNarratr, which notes names as they are
+reduced and resolves them once per block, and once by LegacyParser, which
+walks every scene and item recursively after reducing it, as the parser
+used to. Both must produce the same symbol table. Finally
+each parses a scene with one deeply parenthesized expression, which the
+recursive walk can't handle.
+
+Usage: python benchmarks/bench_resolve.py [scenes]"""
+
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+
+import parser
+from node import Node
+from bench_ast_memory import scaled_program
+
+
+class TimedParser(parser.ParserForNarratr):
+    """Adds up the time spent resolving names."""
+    resolving = 0.0
+
+    def resolve(self, scope):
+        start = time.time()
+        parser.ParserForNarratr.resolve(self, scope)
+        self.resolving += time.time() - start
+
+
+class LegacyParser(parser.ParserForNarratr):
+    resolving = 0.0
+
+    def resolve(self, scope):
+        self.refs = []
+
+    def p_scene_block(self, p):
+        parser.ParserForNarratr.p_scene_block(self, p)
+        start = time.time()
+        self.pass_down(p[0], p[2])
+        self.resolving += time.time() - start
+
+    def p_item_block(self, p):
+        parser.ParserForNarratr.p_item_block(self, p)
+        start = time.time()
+        self.pass_down(p[0], "item." + p[2])
+        self.resolving += time.time() - start
+
+    def pass_down(self, branch, scope):
+        for i, child in enumerate(branch.children):
+            if not isinstance(child, Node):
+                continue
+            if child.type == "expression_statement":
+                if child[0].type == "id":
+                    child[0].key = self.symtab.getKey(child[0].value, scope)
+                    entry = self.symtab.getWithKey(child[0].key)
+                    if not entry:
+                        self.symtab.insert(child[0].value, None, None, scope,
+                                           False)
+                elif child[0].type == "god_id":
+                    child[0].key = self.symtab.getKey(child[0].value, scope)
+                    entry = self.symtab.getWithKey(child[0].key)
+                    if not entry:
+                        self.symtab.insert(child[0].value, None, None, scope,
+                                           True)
+            elif child.type == "atom" and child.v_type == "id":
+                entry = self.symtab.get(child.value, scope)
+                if entry:
+                    child.key = self.symtab.getKey(child.value, scope)
+            self.pass_down(child, scope)
+
+
+def deep_program(depth):
+    return ("scene $1 {\n    setup:\n        x is 1\n" +
+            "        y is " + "(" * depth + "x" + ")" * depth + "\n" +
+            "    action:\n    cleanup:\n}\n")
+
+
+def main():
+    scenes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    source = scaled_program(scenes)
+    print "%d scenes, %d lines of source" % (scenes, source.count("\n"))
+    tables = {}
+    # Collecting the large heap of nodes would swamp the difference.
+    gc.disable()
+    for name, cls in [("legacy", LegacyParser), ("resolve", TimedParser)]:
+        p = cls()
+        start = time.time()
+        p.parse(source)
+        elapsed = time.time() - start
+        tables[name] = sorted(p.symtab.table)
+        print "%-8s parse %6.2f s  resolving %6.3f s  %6d symbols" % (
+            name, elapsed, p.resolving, len(p.symtab.table))
+        del p
+        gc.collect()
+    print "same symbol table: %s" % (tables["legacy"] == tables["resolve"])
+
+    gc.enable()
+
+    source = deep_program(400)
+    for name, cls in [("legacy", LegacyParser),
+                      ("resolve", parser.ParserForNarratr)]:
+        try:
+            cls().parse(source)
+            print "%-8s 400 nested parentheses: ok" % name
+        except RuntimeError as e:
+            print "%-8s 400 nested parentheses: %s" % (name, e)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -----------------------------------------------------------------------------
+# narrtr: benchmarks/bench_startup.py
+# This file measures how long it takes to construct a ParserForNarratr.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Cold and warm ParserForNarratr() construction times.
+
+Three ways of getting a parser are compared:
+
+prebuilt    the default: load narratr_parsetab with no grammar checks.
+checked     yacc() introspects and validates the grammar, then loads
+            narratr_parsetab after comparing signatures.
+generated   yacc() introspects the grammar and generates the tables from
+            scratch, as happens when no table file can be found.
+
+"cold" is the first construction in a fresh interpreter, including the
+imports. "warm" is the average of later constructions in the same process.
+
+Usage: python benchmarks/bench_startup.py [repeats]"""
+
+import os
+import sys
+import time
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+MODES = {
+    "prebuilt": "",
+    "checked": "prebuilt=False, tabmodule='narratr_parsetab', debug=0, " +
+               "write_tables=0",
+    "generated": "prebuilt=False, debug=0, write_tables=0, " +
+                 "tabmodule='no_such_tables'",
+}
+
+SCRIPT = """
+import sys, time
+start = time.time()
+sys.path.insert(0, %r)
+from parser import ParserForNarratr
+ParserForNarratr(%s)
+cold = time.time() - start
+start = time.time()
+for i in range(%d):
+    ParserForNarratr(%s)
+print cold, (time.time() - start) / %d
+"""
+
+
+def measure(mode, repeats):
+    args = MODES[mode]
+    script = SCRIPT % (ROOT, args, repeats, args, repeats)
+    out = subprocess.check_output([sys.executable, "-c", script],
+                                  stderr=open(os.devnull, 'w'))
+    cold, warm = out.split()
+    return float(cold), float(warm)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print "%-10s %12s %12s" % ("mode", "cold (ms)", "warm (ms)")
+    for mode in ["prebuilt", "checked", "generated"]:
+        cold, warm = measure(mode, repeats)
+        print "%-10s %12.2f %12.2f" % (mode, cold * 1000, warm * 1000)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# -----------------------------------------------------------------------------
+# narrtr: build.py
+# This file compiles many narratr games in a single run.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import argparse
+from multiprocessing import Pool
+from parser import ParserForNarratr
+from codegen import generate_file, install_runtime
+from cache import CompileCache, DEFAULT_DIR
+from incremental import compile_file, seed_fragments
+from diagnostics import CompileError
+
+# Each worker process builds one parser (and so runs lex() and yacc() once)
+# and keeps it for every file it is handed.
+_parser = None
+_cache = None
+
+
+def find_sources(paths):
+    """Expand files and directories into a sorted list of .ntr files."""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(".ntr"):
+                        sources.append(os.path.join(root, name))
+        else:
+            sources.append(path)
+    return sources
+
+
+def output_path(source, base, output_dir):
+    """Where the game compiled from source should be written."""
+    if output_dir is None:
+        return source + ".py"
+    if base is not None:
+        rel = os.path.relpath(source, base)
+    else:
+        rel = os.path.basename(source)
+    return os.path.join(output_dir, rel + ".py")
+
+
+def _init_worker(cache_dir):
+    global _parser, _cache
+    _parser = ParserForNarratr()
+    if cache_dir is not None:
+        _cache = CompileCache(cache_dir)
+    else:
+        _cache = None
+
+
+def _compile_one(job):
+    """Compile one file in a worker.
+
+    Returns (source, ok, seconds, note, diagnostics), where diagnostics is
+    a list of the errors and warnings found, as strings."""
+    source, outfile = job
+    start = time.time()
+    note = ""
+    diagnostics = []
+    try:
+        with open(source, 'r') as f:
+            text = f.read()
+        outdir = os.path.dirname(outfile)
+        if outdir and not os.path.isdir(outdir):
+            os.makedirs(outdir)
+        cached = _cache.get(text) if _cache else None
+        code = None
+        if cached:
+            code = cached[2]
+            diagnostics = [str(d) for d in cached[3]]
+            note = "cached"
+            # So that the next edit only recompiles the blocks it changes.
+            seed_fragments(source, cached[4], _cache)
+        elif _cache:
+            # Only the blocks that changed since this file was last built
+            # are recompiled.
+            code, compiler = compile_file(source, text, _parser, _cache)
+            diagnostics = [str(d) for d in compiler.diagnostics]
+            try:
+                _cache.put(text, None, None, code, compiler.diagnostics,
+                           compiler.fragments)
+            except (IOError, OSError):
+                # The file compiled; it just won't be a cache hit next time.
+                pass
+            if compiler.reused:
+                note = "%d of %d blocks reused" % (
+                    compiler.reused, compiler.reused + compiler.compiled)
+        else:
+            # Nothing else needs the code, so it is streamed into outfile.
+            ast = _parser.parse(text, fresh=True)
+            c = generate_file(ast, _parser.symtab, outfile,
+                              _parser.diagnostics)
+            diagnostics = [str(d) for d in c.diagnostics]
+        if code is not None:
+            with open(outfile, 'w') as f:
+                f.write(code)
+            install_runtime(outfile)
+    except CompileError as e:
+        errors = len(e.diagnostics.errors())
+        return (source, False, time.time() - start,
+                "%d error%s" % (errors, "" if errors == 1 else "s"),
+                [str(d) for d in e.diagnostics])
+    except (IOError, OSError) as e:
+        return source, False, time.time() - start, str(e), diagnostics
+    return source, True, time.time() - start, note, diagnostics
+
+
+def build(paths, jobs=1, output_dir=None, cache_dir=None, out=sys.stdout):
+    """Compile every .ntr file under paths, printing a timing report.
+
+    jobs is the number of worker processes. Returns the number of files
+    that failed to compile."""
+    sources = find_sources(paths)
+    base = None
+    if len(paths) == 1 and os.path.isdir(paths[0]):
+        base = paths[0]
+    work = [(s, output_path(s, base, output_dir)) for s in sources]
+
+    start = time.time()
+    if jobs > 1:
+        pool = Pool(jobs, _init_worker, (cache_dir,))
+        try:
+            results = pool.map(_compile_one, work, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        _init_worker(cache_dir)
+        results = [_compile_one(job) for job in work]
+    wall = time.time() - start
+
+    failed = 0
+    busy = 0.0
+    for source, ok, seconds, note, diagnostics in results:
+        busy += seconds
+        if not ok:
+            failed += 1
+        out.write("%-6s %9.1f ms  %s%s\n" % ("ok" if ok else "FAILED",
+                                             seconds * 1000, source,
+                                             "  (" + note + ")" if note
+                                             else ""))
+        for message in diagnostics:
+            out.write("       " + message + "\n")
+    out.write("\n%d files, %d ok, %d failed in %.2f s " %
+              (len(results), len(results) - failed, failed, wall) +
+              "(%.2f s compiling, %d jobs)\n" % (busy, jobs))
+    return failed
+
+
+def main(argv):
+    argparser = argparse.ArgumentParser(prog="narratr.py build")
+    argparser.add_argument('paths', nargs='+',
+                           help='.ntr files, or directories to search')
+    argparser.add_argument('-j', '--jobs', type=int, default=1,
+                           help='number of worker processes. defaults to 1')
+    argparser.add_argument('-o', '--output-dir', action="store",
+                           help='write games here instead of next to their' +
+                           ' sources')
+    argparser.add_argument('--cache-dir', action="store", default=DEFAULT_DIR,
+                           help='directory for cached compiles. defaults' +
+                           ' to ' + DEFAULT_DIR)
+    argparser.add_argument('--no-cache', action="store_true",
+                           help='always recompile, and do not touch the' +
+                           ' compile cache')
+    args = argparser.parse_args(argv)
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    if build(args.paths, max(1, args.jobs), args.output_dir, cache_dir):
+        sys.exit(1)
@@ -0,0 +1,170 @@
+# -----------------------------------------------------------------------------
+# narrtr: cache.py
+# This file defines the on-disk cache of compiled narratr programs.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+import os
+import hashlib
+import tempfile
+import cPickle as pickle
+from diagnostics import Diagnostics
+
+VERSION = "1"
+
+# These are the files whose contents determine what the compiler produces,
+# including the parser tables, the diagnostics kept with each entry, the
+# runtime generated code is written against, and the backends that build
+# from a cached AST. Editing any of them invalidates every entry in the
+# cache.
+COMPILER_FILES = ["lexer.py", "parser.py", "narratr_parsetab.py", "node.py",
+                  "symtab.py", "diagnostics.py", "codegen.py", "astgen.py",
+                  "package.py", "narratr_runtime.py", "cache.py",
+                  "incremental.py", "emitter.py", "optimize.py"]
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".narratr", "cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_compiler_version = None
+
+
+def compiler_version():
+    """Return a string identifying this build of the compiler.
+
+    It is the cache format VERSION followed by a hash of the compiler's own
+    source files, so a cache is never reused across compiler changes."""
+    global _compiler_version
+    if _compiler_version is None:
+        h = hashlib.sha1()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in COMPILER_FILES:
+            try:
+                with open(os.path.join(here, name), 'rb') as f:
+                    h.update(f.read())
+            except IOError:
+                h.update(name)
+        _compiler_version = VERSION + "-" + h.hexdigest()
+    return _compiler_version
+
+
+class CompileCache:
+    """A directory of compiled programs, keyed by source hash.
+
+    Each entry holds the AST, the symbol table, the generated Python and the
+    errors and warnings reported while compiling one source text, and, if it
+    was compiled incrementally, its blocks (see incremental.py). The
+    directory is kept under max_bytes by evicting the least recently used
+    entries whenever a new one is written."""
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, source):
+        """The cache key for a source text: its hash plus compiler version."""
+        h = hashlib.sha1(compiler_version())
+        h.update("\0")
+        h.update(source)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".ntrc")
+
+    def get(self, source):
+        """Return (ast, symtab, code, diagnostics, fragments) for source, or
+        None on a miss. diagnostics is a Diagnostics holding what was
+        reported when source was compiled, so a hit can report it again.
+        fragments is None unless source was compiled incrementally."""
+        entry = self.load(self.key(source))
+        if entry is None:
+            return None
+        return entry["ast"], entry["symtab"], entry["code"], \
+            entry["diagnostics"], entry["fragments"]
+
+    def put(self, source, ast, symtab, code, diagnostics=None,
+            fragments=None):
+        """Store the compiled form of source, then enforce the size bound."""
+        if diagnostics is None:
+            diagnostics = Diagnostics()
+        self.store(self.key(source),
+                   {"ast": ast, "symtab": symtab, "code": code,
+                    "diagnostics": diagnostics, "fragments": fragments})
+
+    def load(self, key):
+        """Return the object stored under key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (IOError, OSError):
+            return None
+        except Exception:
+            # A truncated or stale entry is treated as a miss.
+            self._remove(path)
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key, entry):
+        """Store any picklable object under key, then enforce the bound."""
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                if not os.path.isdir(self.directory):
+                    raise
+        # Write to a temporary file and rename it into place, so concurrent
+        # compiles never read a half-written entry.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp, self._path(key))
+        except:
+            self._remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until under max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".ntrc"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove every entry in the cache."""
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".ntrc"):
+                    self._remove(os.path.join(self.directory, name))
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -15,20 +15,265 @@
 #
 # -----------------------------------------------------------------------------
 
-from sys import stderr, exit
+import os
+import re
+import sys
+import inspect
+import narratr_runtime
 from node import Node
+from diagnostics import Diagnostics, CompileError
+from emitter import Emitter
+from optimize import ConstantFolder, references, live_blocks
+from optimize import dispatch_chain, constant_fields
+
+
+# Generated games import the parts of a game that are the same in every game
+# from narratr_runtime.py, which install_runtime() puts next to them. Games
+# run in this process (see astgen.run()) import the compiler's own copy.
+RUNTIME = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       "narratr_runtime.py")
+sys.modules.setdefault("narratr_runtime", narratr_runtime)
+_runtime_source = None
+
+
+def install_runtime(path):
+    """Put a copy of narratr_runtime.py next to the game at path.
+
+    A game can only import its runtime from its own directory (or from
+    somewhere else on python's path), so every way of writing a game out
+    calls this. The copy is only written if it is missing or out of date,
+    which leaves the bytecode python compiled it to the first time a game
+    imported it to be reused."""
+    global _runtime_source
+    if _runtime_source is None:
+        with open(RUNTIME) as f:
+            _runtime_source = f.read()
+    target = os.path.join(os.path.dirname(os.path.abspath(path)),
+                          "narratr_runtime.py")
+    if os.path.exists(target):
+        with open(target) as f:
+            if f.read() == _runtime_source:
+                return
+    # Several builds can write into the same directory at once, so the copy
+    # is renamed into place whole.
+    tmp = target + "." + str(os.getpid()) + ".tmp"
+    with open(tmp, 'w') as f:
+        f.write(_runtime_source)
+    os.rename(tmp, target)
+
+
+# The names a generated game's modules define (see the frontmatter, and the
+# main program of CodeGen, AstGen and PackageGen), besides the classes of its
+# scenes, and the builtins the generated code uses. An item of the same name
+# would take the place of one of them, or be replaced by it.
+_GLOBALS = frozenset(["division", "exit", "pocket", "pocket_class", "_unset",
+                      "Scene", "Scenes", "SceneModules", "scenes", "next",
+                      "object", "globals", "AttributeError", "TypeError"])
+_SCENE_CLASS = re.compile(r"s_\d+$")
+
+
+# The methods pocket has in generated programs.
+_POCKET_METHODS = frozenset(["add", "get", "remove", "has", "update"])
+
+
+def handles(*types):
+    """Register a CodeGen method as the handler for nodes of these types.
+
+    CodeGen.visit() hands each node to the handler for its type with a
+    single dictionary lookup. A subclass (a different backend, or one that
+    runs an optimization pass as it generates) can handle a type differently
+    by registering a method of its own for it, or by overriding the method
+    registered in CodeGen."""
+    def register(method):
+        method.handles = types
+        return method
+    return register
+
+
+# Looking up a type with no handler gives this, which reports the error.
+def _unexpected(self, node, *args):
+    self._process_error("Found unexpected node type '" + str(node.type) +
+                        "'.", node.lineno)
+
+
+class _Handlers(dict):
+    def __missing__(self, t):
+        return _unexpected
+
+
+# The handler table of each class: node type -> function. A method only
+# registers types under its name, so an override of it (registered again or
+# not) handles the same types.
+_handler_tables = {}
+
+
+def _handlers(cls):
+    table = _handler_tables.get(cls)
+    if table is None:
+        names = {}
+        for klass in reversed(inspect.getmro(cls)):
+            for name, value in vars(klass).iteritems():
+                for t in getattr(value, "handles", ()):
+                    names[t] = name
+        table = _Handlers((t, getattr(cls, name).im_func)
+                          for t, name in names.iteritems())
+        _handler_tables[cls] = table
+    return table
+
+
+# Returns the moves declaration of a scene that can become a table on its
+# class, or None. That is the case if it is the scene's only moves
+# declaration, and a statement of its own in the setup block: it is then
+# bound to run before the action block first asks for the scene's
+# directions, and nothing else can change them.
+def _static_moves(scene):
+    found = []
+    stack = [scene]
+    while stack:
+        node = stack.pop()
+        if node.type == "moves_declaration":
+            found.append(node)
+        stack.extend(c for c in node.children if isinstance(c, Node))
+    if len(found) != 1:
+        return None
+    moves = found[0]
+    if len(moves.children) != 1 or moves[0].type != "directionlist":
+        return None
+    for c in scene.children:
+        if c.type != "setup_block" or len(c.children) != 1:
+            continue
+        suite = c[0]
+        statements = suite.children
+        if suite.value == "statements" and statements:
+            statements = statements[0].children
+        for node in statements:
+            while node.type in ("statement", "simple_statement",
+                                "flow_statement") and node.children:
+                node = node[0]
+            if node is moves:
+                return moves
+    return None
+
+
+# The blocks of a scene, each of which becomes a method of its class.
+_SCENE_BLOCKS = ("setup_block", "action_block", "cleanup_block")
+
+
+# Yields the symbol table key of every name used under node.
+def _keys(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.key is not None:
+            yield node.key
+        stack.extend(c for c in node.children if isinstance(c, Node))
+
+
+# Returns, for the symbol table key of each name a scene uses, the set of the
+# scene's blocks that use it.
+def _block_uses(scene):
+    uses = {}
+    for block in scene.children:
+        if block.type in _SCENE_BLOCKS:
+            for key in _keys(block):
+                uses.setdefault(key, set()).add(block.type)
+    return uses
+
+
+# _process_error() raises this to abandon the block being generated. The
+# error has already been reported by then; generation carries on with the
+# next block.
+class _BlockError(Exception):
+    pass
+
+
+def generate_file(ast, symtab, path, diagnostics=None, keep_all=False):
+    """Generate the code for a parsed program straight into a file.
+
+    The code is streamed out as each block is generated, so it is never all
+    held in memory. It is written next to path and only renamed into place
+    if the program compiles, so a failed compile leaves any earlier file
+    untouched. Returns the CodeGen used; raises CompileError if there were
+    errors, and IOError or OSError if the file can't be written."""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, 'w') as f:
+            c = CodeGen(diagnostics, f, keep_all=keep_all)
+            c.process(ast, symtab)
+            c.finish()
+        os.rename(tmp, path)
+        install_runtime(path)
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return c
 
 
 class CodeGen:
-    def __init__(self):
+    # Where the main program finds the scene classes: here, in its own
+    # module (see package.py for a backend that puts them elsewhere).
+    scene_classes = "globals()"
+
+    # Errors and warnings are reported to diagnostics, a Diagnostics sink.
+    # Pass the parser's to collect a whole compile's diagnostics in one place.
+    # If stream (such as an open file) is given, the program is written to it
+    # a chunk at a time as each block is generated, rather than being kept
+    # in memory; call finish() once every block has been processed. Unless
+    # optimize is False, constant expressions in each scene and item are
+    # folded (see optimize.py) before code is generated for it, which
+    # changes the AST, and folder.removed counts the nodes taken out; long
+    # if/elif chains comparing a name to literals also look the name up in
+    # a table instead (see dispatch_chain()). Unless keep_all is True,
+    # process() leaves out the scenes that can't be reached and the items
+    # that are never used, warning about each; dropped lists them as
+    # ("scene", ID) and ("item", name) pairs.
+    def __init__(self, diagnostics=None, stream=None, optimize=True,
+                 keep_all=False):
         self.frontmatter = "#!/usr/bin/env python\n" + \
                             "from __future__ import division\n" + \
-                            "from sys import exit\n\n"
-        self.scenes = []
+                            "from sys import exit\n" + \
+                            "from narratr_runtime import Scene, Scenes, " + \
+                            "pocket_class, _unset\n\n" + \
+                            "pocket = pocket_class()\n\n"
+        self.out = Emitter(stream)
+        self.out.write(self.frontmatter + "\n")
+        self.section = "scenes"
+        self.scenes_added = 0
+        self.items_added = 0
         self.scene_nums = []
-        self.items = []
         self.item_names = []
-        self.main = ""
+        # The IDs of the scenes that had errors, which still exist as far as
+        # the start state is concerned.
+        self.failed_scenes = set()
+        self.started = False
+        self.finished = False
+        self.handlers = _handlers(self.__class__)
+        self.folder = ConstantFolder() if optimize else None
+        self.optimize = optimize
+        self.keep_all = keep_all
+        self.dropped = []
+        # The moves declaration of the scene being generated that is a table
+        # on its class (see _static_moves()).
+        self.static_moves = None
+        # The dispatch tables of the scene or item being generated, which
+        # go on its class.
+        self.tables = []
+        # Where the variables of the scene being generated live (see
+        # _place_variables()), and those it shares between its blocks.
+        self.variables = {}
+        self.shared = []
+        # The god variables of the scene or item being generated, and what
+        # their attributes are called: a scene's have g_ before their names
+        # (see _place_variables()), an item's have their names as they are.
+        self.gods = []
+        self.god_prefix = ""
+        # While an action block is being generated, how many of its while
+        # loops the statement being generated is in; None otherwise.
+        self.loops = None
+        if diagnostics is None:
+            diagnostics = Diagnostics()
+        self.diagnostics = diagnostics
 
     def process(self, node, symtab):
         """Call first: generate target code given narratr AST and symbol table.
@@ -39,68 +284,210 @@ class CodeGen:
         to identify the high level nodes (i.e. scenes, items, and startstate),
         sending the appropriate nodes to the appropriate functions for
         processing. Note we know the structure of the AST, so we don't need
-        DFS or other tree searching algorithms, which improves efficiency."""
+        DFS or other tree searching algorithms, which improves efficiency.
+
+        An error in one block doesn't stop the others from being processed.
+        If there were any, CompileError is raised once all are done."""
         self.symtab = symtab
         if len(node.children) != 1 or node[0].type != "blocks":
-            self._process_error("Unexpected Parse Tree - Incorrect number" +
-                                "or type of children for the top node",
-                                node.lineno)
+            self.diagnostics.error("Unexpected Parse Tree - Incorrect " +
+                                   "number or type of children for the " +
+                                   "top node", node.lineno or None)
+            raise CompileError(self.diagnostics)
         blocks = node[0].children
+        live = None if self.keep_all else self._live_blocks(blocks)
         for block in blocks:
             if type(block) is dict:
                 for key, s_i in block.iteritems():
-                    if s_i.type == "scene_block":
-                        self._add_scene(self._scene_gen(s_i, key))
-                    elif s_i.type == "item_block":
-                        self._add_item(self._item_gen(s_i, key))
-            elif block.type == "start_state":
+                    self.process_block(s_i, key, keep=live is None or
+                                       key in live[s_i.type])
+            else:
+                self.process_block(block)
+        if self.diagnostics.errors():
+            raise CompileError(self.diagnostics)
+
+    # Returns the keys of the scene and item blocks the program can use,
+    # keyed by block type.
+    def _live_blocks(self, blocks):
+        tables = {"scene_block": {}, "item_block": {}}
+        start = 1
+        # Going backwards, the start state seen last is the one that is
+        # used, the first in the program.
+        for block in reversed(blocks):
+            if type(block) is dict:
+                for key, b in block.iteritems():
+                    if b.type in tables:
+                        tables[b.type][key] = references(b)
+            elif isinstance(block, Node) and block.type == "start_state":
+                start = block.value
+        scenes, items = live_blocks(start, tables["scene_block"],
+                                    tables["item_block"])
+        return {"scene_block": scenes, "item_block": items}
+
+    def process_block(self, block, key=None, symtab=None, keep=True):
+        """Generate target code for a single top-level block.
+
+        block is a scene_block, item_block or start_state node, and key is
+        its scene ID or item name. The generated code is added to the program
+        exactly as process() would, and for scenes and items it is also
+        returned, so that a caller compiling blocks one at a time (see
+        incremental.py) can keep it and hand it back to add_generated() in a
+        later build. If symtab is given, it replaces the symbol table used
+        for this and later blocks. If the block has errors, they are reported
+        to diagnostics and None is returned. If keep is False, the block is
+        still checked for errors, but is then left out of the program, as
+        with drop()."""
+        if symtab is not None:
+            self.symtab = symtab
+        try:
+            if block.type == "start_state":
                 self._add_main(block)
+                return None
+            if key is None:
+                key = block.value
+            if self.folder and block.type in ("scene_block", "item_block"):
+                self.folder.fold(block)
+            if block.type == "scene_block":
+                code = self._scene_gen(block, key)
+            elif block.type == "item_block":
+                if key in _GLOBALS or _SCENE_CLASS.match(str(key)):
+                    self._process_error("Item '" + str(key) + "' has the " +
+                                        "name of part of the game itself. " +
+                                        "Call it something else.",
+                                        block.lineno)
+                code = self._item_gen(block, key)
             else:
                 self._process_error("Found unexpected block types.",
                                     block.lineno)
+            if keep:
+                self.add_generated(block.type, key, code)
+            else:
+                self.drop(block.type, key, block.lineno)
+            return code
+        except _BlockError:
+            if block.type == "scene_block":
+                self.failed_scenes.add(block.value if key is None else key)
+            return None
+
+    def add_generated(self, block_type, key, code):
+        """Add code that process_block() generated for a scene or item.
+
+        Start states can't be added this way, as their code depends on every
+        scene in the program; send them through process_block() after all of
+        the scenes have been added."""
+        if block_type == "scene_block":
+            self.scene_nums.append(key)
+            self._add_scene(code)
+        elif block_type == "item_block":
+            self.item_names.append(key)
+            self._add_item(code)
+        else:
+            raise ValueError("Found unexpected block types.")
+
+    def drop(self, block_type, key, lineno=None):
+        """Leave a scene or item out of the program, with a warning.
+
+        This is for blocks that the program can never use."""
+        if block_type == "scene_block":
+            self.dropped.append(("scene", key))
+            self._process_warning("Scene $" + str(key) + " can't be " +
+                                  "reached from the start scene, so it " +
+                                  "has been left out.", lineno)
+        elif block_type == "item_block":
+            self.dropped.append(("item", key))
+            self._process_warning("Item '" + str(key) + "' is never used, " +
+                                  "so it has been left out.", lineno)
+        else:
+            raise ValueError("Found unexpected block types.")
+
+    def visit(self, node, *args):
+        """Return the code for node, from the handler for its type.
+
+        Statement handlers take the indentation level as well; expression
+        handlers take just the node. (Handlers look each other up in
+        self.handlers directly, which saves a call per node.)"""
+        if not isinstance(node, Node):
+            self._process_error("Something bad happened while processing " +
+                                "'" + str(node) + "'. Unfortunately, that " +
+                                "is all we know.")
+        return self.handlers[node.type](self, node, *args)
 
     def construct(self, outputfile="stdout"):
         """Class second: write the generated code to a file.
 
-        This function takes the instance variables constructed by the
-        process() function and writes them to an output file. (As such, it must
-        be run AFTER process()! It is intended to be called externally, within
-        the main compiler. It takes one argument, outputfile, which is a string
-        of the location where the file should be written. By convention, that
-        file should be in the form of *.ntrc. If no outputfile is specified or
-        the outputfile is specified as "stdout", the code prints to standard
-        out (e.g. usually the terminal window). That's mainly for debugging
-        purposes, and should not be used in the production compiler, as the
-        line breaks are only approximations."""
-        if self.main == "":
-            self._process_warning("No start scene specified. " +
-                                  "Defaulting to $1.")
-            self._add_main(1)
-
+        This function takes the code generated by the process() function and
+        writes it to an output file. (As such, it must be run AFTER
+        process()! It is intended to be called externally, within the main
+        compiler. It takes one argument, outputfile, which is a string of the
+        location where the file should be written. By convention, that file
+        should be in the form of *.ntrc. If no outputfile is specified or the
+        outputfile is specified as "stdout", the code prints to standard out
+        (e.g. usually the terminal window). That's mainly for debugging
+        purposes, and should not be used in the production compiler."""
+        code = self.code()
         if outputfile == "stdout":
-            print self.frontmatter
-            print "\n".join(self.scenes)
-            print "\n".join(self.items)
-            print self.main
+            print code
         else:
             with open(outputfile, 'w') as f:
-                f.write(self.frontmatter)
-                f.write("\n")
-                f.write("\n".join(self.scenes))
-                f.write("\n\n")
-                f.write("\n".join(self.items))
-                f.write("\n\n")
-                f.write(self.main)
-
-    # This function is used internally to add a scene to the scene list. It
+                f.write(code)
+            install_runtime(outputfile)
+
+    def finish(self):
+        """Complete the program once every block has been processed.
+
+        The main program is emitted (starting at $1 if no start state was
+        given) and everything still buffered is written to the stream.
+        Raises CompileError if any errors have been reported, in which case
+        what was written to the stream is not a working program."""
+        if not self.finished:
+            self.finished = True
+            if not self.started:
+                self._process_warning("No start scene specified. " +
+                                      "Defaulting to $1.")
+                try:
+                    self._add_main(1)
+                except _BlockError:
+                    pass
+            self.out.flush()
+        if self.diagnostics.errors():
+            raise CompileError(self.diagnostics)
+
+    def code(self):
+        """Return the generated program as a single string.
+
+        Like construct(), this must be run AFTER process(). It is what
+        construct() writes, and is useful to callers (such as the compile
+        cache) that want to keep the generated code around. It can't be used
+        when the code was written to a stream. Raises CompileError if any
+        errors have been reported."""
+        self.finish()
+        return self.out.getvalue()
+
+    # Moves output on to the next part of the program: the scene classes,
+    # then the item classes, then the main program. The parts are separated
+    # by a blank line, and a part may be empty.
+    def _section(self, section):
+        parts = ["scenes", "items", "main"]
+        while parts.index(self.section) < parts.index(section):
+            self.out.write("\n\n")
+            self.section = parts[parts.index(self.section) + 1]
+
+    # This function is used internally to add a scene to the program. It
     # takes a string *with correct indentation*.
     def _add_scene(self, scene):
-        self.scenes.append(scene)
+        if self.scenes_added:
+            self.out.write("\n\n")
+        self.out.write(scene)
+        self.scenes_added += 1
 
-    # This function is used internally to add a item to the item list. It
+    # This function is used internally to add a item to the program. It
     # takes a string *with correct indentation*.
     def _add_item(self, item):
-        self.items.append(item)
+        self._section("items")
+        if self.items_added:
+            self.out.write("\n")
+        self.out.write(item)
+        self.items_added += 1
 
     # This function generates the code for a start state given a start state
     # node. If start state code has already been generated, it produces a
@@ -109,131 +496,146 @@ class CodeGen:
     # state of 1. This should only be used internally.
     # Comments on the literal Python functions are in-line below.
     def _add_main(self, startstate):
-        if self.main == "":
-            # ABOUT THE POCKET CLASS: here we define the pocket class and
-            # initialize a global instance. The methods are fairly self
-            # explanatory.
-            self.main = '''class pocket_class:
-    def __init__(self):
-        self.data = {}
-
-    def add(self, key, val, verbose=True):
-        if self.data.get(key, None):
-            print " ** '" + key + "' is already in your pocket. **"
-        else:
-            self.data[key] = val
-            if verbose:
-                print " ** '" + key + "' is now in your pocket. **"
-
-    def update(self, key, val):
-        self.data[key] = val
-
-    def get(self, key):
-        return self.data.get(key)
-
-    def remove(self, key):
-        del self.data[key]
-
-    def has(self, key):
-        if self.data.get(key, None):
-            return True
-        return False
-
-pocket = pocket_class()\n'''
-    # ABOUT THE RESPONSE CODE: the default response code, which is dropped
-    # into a function called get_response(), waits for user input. When it
-    # it receives this input, it strips the case (i.e. everything is made
-    # lower case), removes all punctuation except double quotes (to allow
-    # the programmer to add conversational capabilities), converts all
-    # whitespace characters into a single space, and then checks for specific
-    # situations we agree with the programmer to handle by default. 'exit'
-    # will terminate the game (there is no current way to save game state),
-    # and "move" followed by a single token will check the dictionary of
-    # directions (which it takes as an argument) for an applicable direction.
-    # If it does not appear in the dictionary, an error is reported so the user
-    # is not confused.  If it does appear, it encodes the next scene's function
-    # call within a list so that it can easily be identified by the caller
-    # function, which will return that piece of code. This is a centerpiece of
-    # our approach to avoiding an overflow of activation records in large
-    # games.
-            self.main += '''def get_response(direction):
-    response = raw_input(" -->> ")
-    response = response.lower()
-    response = response.translate(None,
-                "!#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~")
-    response = ' '.join(response.split())
-    if response == "exit":
-        print "== GAME TERMINATED =="
-        exit(0)
-    elif response[:5] == "move " and len(response.split(" ")) == 2:
-        if response.split(" ")[1] in direction:
-            return ["s_" + str(direction[response.split(" ")[1]])\\
-                + "_inst.setup()"]
-        else:
-            print "\\"" + response.split(" ")[1] + "\\" is not a "\\
-                + "valid direction from this scene."
-    else:
-        return response\n\n'''
-
-            # Create an instance of each scene that has been declared.
-            for s in self.scene_nums:
-                self.main += "s_" + str(s) + "_inst = s_" + str(s) + "()\n"
-
-            if isinstance(startstate, Node):
-                ss = startstate.value
-            else:
-                ss = startstate
-
-            if ss in self.scene_nums:
-                self.startstate = ss
-            else:
-                self._process_error("Start scene $" + str(ss) +
-                                    " does not exist.")
-
-            self.main += "if __name__ == '__main__':\n    next = s_"\
-                + str(self.startstate) + "_inst.setup()\n    while True:\n"\
-                + "        exec 'next = ' + next"
+        if not self.started:
+            self.started = True
+            self._section("main")
+            out = self.out
+
+            # Scenes are made as the player first enters them (see Scenes in
+            # narratr_runtime.py), from the classes defined above.
+            out.line("scenes = Scenes(" + self.scene_classes + ")")
+
+            self.startstate = self._start_scene(startstate)
+
+            # The main loop is a trampoline: every scene returns the bound
+            # setup method of the scene to move to, rather than calling it, so
+            # the stack never grows no matter how many moves are made.
+            out.line("if __name__ == '__main__':")
+            out.indent()
+            out.line("next = scenes[" + str(self.startstate) + "].setup")
+            out.line("while True:")
+            out.indent()
+            out.line("next = next()")
+            out.dedent()
+            out.dedent()
         else:
             self._process_error("Multiple start scene declarations.",
                                 startstate.lineno)
 
+    # Returns the scene ID a start state names, checking that it exists.
+    def _start_scene(self, startstate):
+        if isinstance(startstate, Node):
+            ss = startstate.value
+        else:
+            ss = startstate
+        if ss not in self.scene_nums and ss not in self.failed_scenes:
+            self._process_error("Start scene $" + str(ss) +
+                                " does not exist.")
+        return ss
+
     # This function takes a scene node and processes it, translating into
     # valid Python (really, a Python class). Iterates through the children
     # of the input node and constructs the setup, cleanup, and action blocks
-    # using boilerplate code. This should only be used internally. In the
-    # action_block part, adding while(true) loop to get response and then
-    # process it. def achition is now taking direction as argument, direction
-    # is an empty dictionary by default.
+    # as methods. This should only be used internally. The class is a
+    # subclass of Scene (see narratr_runtime.py), which runs the loop that
+    # asks for responses and hands each to the action block, and which does
+    # nothing for a block with no code. The class's moves table holds the
+    # scene's directions if they can be worked out here; otherwise Scene's
+    # empty one is used.
     def _scene_gen(self, scene, sid):
-        commands = []
-        direction_sign = False
+        methods = []
+        self.tables = []
+        slots = self._place_variables(scene)
+        moves = self.static_moves = _static_moves(scene)
+        if self.gods:
+            methods.append("def __init__(self):" + self._unset_gods())
         for c in scene.children:
             if c.type == "SCENEID":
                 sid = c.value
 
             elif c.type == "setup_block":
-                commands += self._process_setup_block(c)
+                methods.append(self._process_setup_block(c))
 
             elif c.type == "cleanup_block":
-                commands += self._process_cleanup_block(c)
+                methods.append(self._process_cleanup_block(c))
 
             elif c.type == "action_block":
-                commands += self._process_action_block(c)
-
-        self.scene_nums.append(sid)
-        scene_code = "class s_" + str(sid) + ":\n    def __init__(self):"\
-            + "\n        self.__namespace = {}\n        "\
-            + "self.directions = {}\n\n    " + "\n    ".join(commands)
-
+                methods.append(self._process_action_block(c))
+
+        scene_code = "class s_" + str(sid) + "(Scene):\n    __slots__ = " + \
+            repr(tuple(slots))
+        if moves is not None:
+            scene_code += "\n    moves = {" + \
+                self._process_directionlist(moves[0]) + "}"
+        scene_code += self._tables_code()
+        for method in methods:
+            if method:
+                scene_code += "\n\n    " + method
         return scene_code
 
+    # Decides where each of a scene's variables lives. One that only one of
+    # its blocks uses is a local of that block's method, called v_ and its
+    # name, as a Python local is the cheapest kind of variable there is. One
+    # the blocks share is an attribute of the same name, which cleanup()
+    # deletes so the next visit starts without it. God variables are
+    # attributes called g_ and their name, so that none of them can take the
+    # place of what a scene gets from Scene. The action block runs once for
+    # each response, so its variables are attributes too, to last from one
+    # response to the next. Returns the attributes a scene adds to Scene's:
+    # its god variables, then its shared ones.
+    def _place_variables(self, scene):
+        self.variables = {}
+        self.shared = []
+        self.god_prefix = "g_"
+        for key, blocks in sorted(_block_uses(scene).iteritems()):
+            entry = self.symtab.getWithKey(key)
+            if entry is None or entry.god:
+                continue
+            name = "v_" + str(entry.symbol)
+            shared = len(blocks) > 1 or "action_block" in blocks
+            self.variables[key] = (name, shared)
+            if shared:
+                self.shared.append(name)
+        self.gods = [self.god_prefix + g
+                     for g in self._god_variables(scene.value)]
+        return self.gods + self.shared
+
+    # Returns the names of the god variables declared in scope.
+    def _god_variables(self, scope):
+        return sorted(str(symbol) for symbol, entry
+                      in self.symtab.entries(scope).iteritems() if entry.god)
+
+    # Returns the line of __init__() that starts each god variable off
+    # undeclared.
+    def _unset_gods(self):
+        return "\n        " + " = ".join("self." + g for g in self.gods) + \
+            " = _unset"
+
+    # Returns the Python for the variable with the symbol table key key and
+    # the name name, which is not a god variable. An item's variables are
+    # attributes of the item.
+    def _variable(self, key, name):
+        place = self.variables.get(key)
+        if place is None:
+            return "self." + name
+        if place[1]:
+            return "self." + place[0]
+        return place[0]
+
     # This function takes a item node and processes the node. It creates
     # a class for the item which includes initiation function and other
-    # functions for different item types.
+    # functions for different item types. Nothing but the item's body gives
+    # an item attributes, so its variables are its __slots__.
     def _item_gen(self, item, iid):
         iid = item.value
-        self.item_names.append(iid)
-        item_code = "class " + str(iid) + ":\n    "
+        constants = constant_fields(item) if self.optimize else None
+        if constants is not None:
+            return self._constant_item(iid, constants)
+        self.tables = []
+        self.variables = {}
+        self.gods = self._god_variables("item." + str(iid))
+        self.god_prefix = ""
+        item_code = ""
         if len(item.children) not in [1, 2]:
             self._process_error("Wrong number of children of item",
                                 item.lineno)
@@ -243,15 +645,60 @@ pocket = pocket_class()\n'''
             item_code += "def __init__(self"
             item_code += self._process_itemparams(item[0])
             item_code += "):"
-        if len(item.children) == 1:
+            if self.gods:
+                item_code += self._unset_gods()
+        if len(item.children) == 1 and not self.gods:
             item_code += "\n        pass"
         elif len(item.children) == 2:
             if item[1].type != "suite":
                 self._process_error("Wrong type of child for item",
                                     item.lineno)
             else:
-                item_code += self._process_suite(item[1], 2)
-        return item_code
+                item_code += self.visit(item[1], 2)
+        return "class " + str(iid) + "(object):\n    __slots__ = " + \
+            repr(tuple(self._item_fields(item))) + self._tables_code() + \
+            "\n\n    " + item_code
+
+    # Returns the class of an item that is the same every time it is made.
+    # Its variables are class attributes, and __new__() makes the one
+    # instance there is the first time it is called and returns it from
+    # then on. So, unlike two instances of any other item, two of these are
+    # equal: lamp() == lamp() is True.
+    def _constant_item(self, iid, fields):
+        return "class " + str(iid) + "(object):\n    __slots__ = ()" + \
+            "\n    __instance = None" + \
+            "".join("\n    " + str(name) + " = " + repr(value)
+                    for name, value in fields) + \
+            "\n\n    def __new__(cls):" + \
+            "\n        if cls.__instance is None:" + \
+            "\n            cls.__instance = object.__new__(cls)" + \
+            "\n        return cls.__instance"
+
+    # Returns the names of an item's variables, god variables included.
+    def _item_fields(self, item):
+        return sorted(str(symbol) for symbol
+                      in self.symtab.entries("item." + str(item.value)))
+
+    # Returns the class attributes that hold the dispatch tables, one per
+    # line, each line starting with a newline.
+    def _tables_code(self):
+        return "".join("\n    __dispatch_" + str(i) + " = {" +
+                       ", ".join(repr(k) + ": " + str(v) for k, v in table) +
+                       "}" for i, table in enumerate(self.tables))
+
+    # Adds a dispatch table for the literals of each branch of a chain, and
+    # returns its name. Each literal is mapped to the number of the first
+    # branch that has it, counting from 1.
+    def _add_table(self, branches):
+        table = []
+        seen = {}
+        for i, literals in enumerate(branches):
+            for value in literals:
+                if value not in seen:
+                    seen[value] = True
+                    table.append((value, i + 1))
+        self.tables.append(table)
+        return "__dispatch_" + str(len(self.tables) - 1)
 
     # This function takes item parameters and processes its first children
     # node if it exits.
@@ -277,29 +724,29 @@ pocket = pocket_class()\n'''
         return ", " + ", ".join(commands)
 
     # Code for adding a setup block. Takes as input a single "setup block"
-    # node. Adds boilerplate code (function definition, empty dictionary for
-    # direction, and at the end, the code to move to the action block), and
-    # sends the child nodes to _process_suite() to generate their code.
+    # node. Adds boilerplate code (function definition, and at the end, the
+    # code to move to the action block), and sends the child nodes to
+    # _process_suite() to generate their code. A setup block with no code
+    # is left to Scene, which moves straight on to the action block.
     def _process_setup_block(self, c):
         commands = []
         commands.append("def setup(self):")
         if len(c.children) not in [0, 1]:
             self._process_error("setup block has wrong number of children")
-        if len(c.children) == 1:
-            if c[0].type != "suite":
-                self._process_error("setup block doesn't have suite child")
-            else:
-                commands.append(self._process_suite(c[0], 2))
-        commands.append("    return self.action()\n")
-        return commands
+        if len(c.children) == 0:
+            return ""
+        if c[0].type != "suite":
+            self._process_error("setup block doesn't have suite child")
+        commands.append(self.visit(c[0], 2))
+        commands.append("    return self.action()")
+        return "\n    ".join(commands)
 
     # Code for adding a cleanup block. Takes as input a single "cleanup block"
-    # node. Adds boilerplate code (function definition and "pass" if necessary,
-    # explained below), then sends the child nodes to _process_suite() to
-    # generate their code. "pass" is required in the scenario that there are no
-    # child nodes, in which case Python syntactically requires code, we need to
-    # be able to execute the function, but we don't want anything to happen. #
-    # "pass" is a Python command that does nothing, so it fits the bill.
+    # node. Adds the function definition, then sends the child nodes to
+    # _process_suite() to generate their code, and deletes the variables
+    # the scene's blocks share, which only last one visit. If there is
+    # nothing to do, the block is left to Scene, whose cleanup() does
+    # nothing.
     def _process_cleanup_block(self, c):
         commands = []
         commands.append("def cleanup(self):")
@@ -309,179 +756,105 @@ pocket = pocket_class()\n'''
             if c[0].type != "suite":
                 self._process_error("cleanup block doesn't have suite child")
             else:
-                commands.append(self._process_suite(c[0], 2))
-        commands.append("    self.__namespace = {}")
-        return commands
+                commands.append(self.visit(c[0], 2))
+        for name in self.shared:
+            commands += ["    try:", "        del self." + name,
+                         "    except AttributeError:", "        pass"]
+        if len(commands) == 1:
+            return ""
+        return "\n    ".join(commands)
 
     # Code for adding an action block. Takes as input a single "action block"
-    # node. Adds boilerplate code (function definition, initialize "response"
-    # as an empty string so it does not trip up the REPL loop, and add a "while
-    # True:" loop to get the REPL loop). The action block itself takes the
-    # direction dictionary for that scene as a parameter so it can pass it to
-    # the get_response() function. It also passes the name of the class so
-    # get_response() knows which scene's cleanup block to call if the user is
-    # trying to move between scenes.
+    # node. The action block becomes respond(), which Scene's action()
+    # calls with each response the player gives (see narratr_runtime.py),
+    # so the code here is only the block's own. A continue that isn't in a
+    # while loop of the block's goes on to the next response, so it
+    # becomes a return; a break there would end the loop that asks for
+    # responses, which leaves the game with no scene to go on to, so it is
+    # an error.
     def _process_action_block(self, c):
         commands = []
-        commands.append("def action(self):")
-        commands.append("    response = \"\"\n        while True:")
+        commands.append("def respond(self, response):")
         if len(c.children) not in [0, 1]:
             self._process_error("action block has wrong number of children")
-        commands.append("        response = get_response(" +
-                        "self.directions)\n            " +
-                        "if isinstance(response, list):" +
-                        "\n                self.cleanup()\n" +
-                        "                return response[0]\n")
-        if len(c.children) == 1:
-            if c[0].type != "suite":
-                self._process_error("action block doesn't have suite child")
-            else:
-                commands.append(self._process_suite(c[0], 3)[5:])
-
-        return commands
-
-    # This function processes suite node and distinguishes its children
-    # nodes from simple statement if the value of the suite is "simple"
-    # and statements if the value is not specified.
+        if len(c.children) == 0:
+            return ""
+        if c[0].type != "suite":
+            self._process_error("action block doesn't have suite child")
+        commands.append(self._action_body(c[0], 2))
+        return "\n    ".join(commands)
+
+    # Visits the suite of an action block, keeping count of the while loops
+    # each statement in it is in.
+    def _action_body(self, suite, *args):
+        self.loops = 0
+        try:
+            return self.visit(suite, *args)
+        finally:
+            self.loops = None
+
+    # Visits the suite of a while loop, which is one more loop for the
+    # statements in it if it is in an action block.
+    def _loop_body(self, suite, *args):
+        if self.loops is None:
+            return self.visit(suite, *args)
+        self.loops += 1
+        try:
+            return self.visit(suite, *args)
+        finally:
+            self.loops -= 1
+
+    # A suite is either a single simple statement or a list of statements.
+    @handles("suite")
     def _process_suite(self, suite, indentlevel=1):
-        commands = ""
         if len(suite.children) != 1:
             self._process_error("Too many children in suite.")
-        else:
-            if suite.value == "simple":
-                commands += self._process_simple_smt(suite[0],
-                                                     indentlevel)
-            else:
-                commands += self._process_statements(suite[0],
-                                                     indentlevel)
-        return commands
+        return self.visit(suite[0], indentlevel)
 
     # This function processes statements node which contains
     # several statement nodes as its children nodes.
+    @handles("statements")
     def _process_statements(self, statements, indentlevel=1):
-        commands = ''
-        for smt in statements.children:
-            commands += self._process_statement(smt, indentlevel)
-        return commands
-
-    # This function processes statement node which contains two
-    # different types of statements: simple statement and
-    # block statement.
+        visit = self.visit
+        return "".join([visit(smt, indentlevel)
+                        for smt in statements.children])
+
+    # A statement wraps either a simple statement or a block statement, and
+    # a simple statement wraps one of the statements below; each is handed
+    # on to the handler for what it wraps.
+    @handles("statement", "simple_statement")
     def _process_statement(self, statement, indentlevel=1):
-        commands = ''
-        if statement.value == "simple":
-            commands += self._process_simple_smt(statement[0],
-                                                 indentlevel)
-        elif statement.value == "block":
-            commands += self._process_block_smt(statement[0],
-                                                indentlevel)
-        else:
-            self._process_error("Not accepted ")
-        return commands
-
-    # Statement is actually a suite node, but we're keeping the name for
-    # backwards-compatability. This function takes suite node and passes
-    # to different types of simple statements based on the value of the
-    # suite node.
-    def _process_simple_smt(self, smt, indentlevel=1):
-        commands = ''
-        prefix = "\n" + "    "*indentlevel
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'simple statement'. Unfortunately, that is " +
-                                "all we know.")
-        if len(smt.children) == 0:
+        if len(statement.children) == 0:
             self._process_error("Simple statement has no children to process.",
-                                smt.lineno)
-        if smt.value == "say":
-            commands += prefix + self._process_say_smt(smt[0])
-        elif smt.value == "exposition":
-            commands += prefix + self._process_expo_smt(smt[0])
-        elif smt.value == "win":
-            commands += self._process_win_smt(smt[0], indentlevel)
-        elif smt.value == "lose":
-            commands += self._process_lose_smt(smt[0], indentlevel)
-        elif smt.value == "expression":
-            commands += self._process_expression_smt(smt[0],
-                                                     indentlevel)
-        elif smt.value == "flow":
-            commands += self._process_flow_smt(smt[0], indentlevel)
-        return commands
+                                statement.lineno)
+        return self.visit(statement[0], indentlevel)
 
     # This function takes block statement node which includes
     # "if statement" and "while statement" type children
     # nodes.
+    @handles("block_statement")
     def _process_block_smt(self, smt, indentlevel):
-        commands = ''
-        prefix = "\n" + "    "*indentlevel
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'block statement'. Unfortunately, that is " +
-                                "all we know.")
         if len(smt.children) != 1:
             self._process_error("Block statement has no children to process.",
                                 smt.lineno)
-        if smt[0].type == "if_statement":
-            commands += prefix + \
-                        self._process_ifstatement(smt[0], indentlevel)
-        elif smt[0].type == "while_statement":
-            commands += prefix + \
-                        self._process_whilestatement(smt[0],
-                                                     indentlevel)
-        else:
-            self._process_error("Block statement does not have valid child " +
-                                "node.")
-        return commands
+        return "\n" + "    "*indentlevel + self.visit(smt[0], indentlevel)
 
-    # Say statement function is called from simple statement and
-    # passes node to _process_testlist()
-    def _process_say_smt(self, smt):
-        commands = 'print '
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'say statement'. Unfortunately, that is " +
-                                "all we know.")
-        if len(smt.children) == 0:
-            self._process_error("Say statement has no children to process.",
-                                smt.lineno)
-        commands += self._process_testlist(smt[0])
-        return commands
-
-    # Exposition statement passes node to _process_testlist
-    def _process_expo_smt(self, smt):
-        commands = 'print '
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'exposition statement'. Unfortunately, " +
-                                "that is all we know.")
+    # Say and exposition statements print their testlist.
+    @handles("say_statement", "exposition")
+    def _process_say_smt(self, smt, indentlevel=1):
         if len(smt.children) == 0:
-            self._process_error("Exposition statement has no children to" +
-                                " process.", smt.lineno)
-        commands += self._process_testlist(smt[0])
-        return commands
+            self._process_error(("Say" if smt.type == "say_statement" else
+                                 "Exposition") + " statement has no " +
+                                "children to process.", smt.lineno)
+        return "\n" + "    "*indentlevel + 'print ' + \
+            self._process_testlist(smt[0])
 
-    # Win statement prints the string if there is and exits the scene
+    # Win and lose statements print the string if there is one, and end the
+    # game.
+    @handles("win_statement", "lose_statement")
     def _process_win_smt(self, smt, indentlevel):
         prefix = "\n" + "    "*indentlevel
         commands = ""
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'win statement'. Unfortunately, that is " +
-                                "all we know.")
-        if len(smt.children) != 0:
-            commands += prefix + "print "\
-                        + self._process_testlist(smt[0])
-        commands += prefix + "exit(0)"
-        return commands
-
-    # Lose statement prints the string if there is and exits the scene
-    def _process_lose_smt(self, smt, indentlevel):
-        prefix = "\n" + "    "*indentlevel
-        commands = ""
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'lose statement'. Unfortunately, that is " +
-                                "all we know.")
         if len(smt.children) != 0:
             commands += prefix + "print "\
                         + self._process_testlist(smt[0])
@@ -492,15 +865,13 @@ pocket = pocket_class()\n'''
     # of the node is "testlist", then the function passes it to testlist
     # function. If the value of the node is "is", it indicates that a
     # new variable being declared. If the value of the node is "godis",
-    # the function creates namespace for the god variable and makes sure
-    # that the god variable can only be declared onece.
+    # the god variable is given its value unless it already has one, so
+    # that it is only declared once. Every god variable starts off as
+    # _unset (see _unset_gods()), so this is one attribute check.
+    @handles("expression_statement")
     def _process_expression_smt(self, smt, indentlevel):
         prefix = '\n' + '    '*indentlevel
         commands = ''
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'expression statement'. Unfortunately," +
-                                " that is all we know.")
         if len(smt.children) == 0:
             self._process_error("expression statement has no children to" +
                                 " process.",
@@ -509,73 +880,54 @@ pocket = pocket_class()\n'''
             commands += prefix + self._process_testlist(smt[0])
         elif smt.value == "is":
             entry = self.symtab.getWithKey(smt[0].key)
-            if entry and (entry.god or isinstance(entry.scope, str) and
-                          entry.scope.startswith("item")):
-                commands += prefix + "self." + smt[0].value + " = "
+            if entry and entry.god:
+                commands += prefix + "self." + self.god_prefix + \
+                    smt[0].value + " = "
             else:
-                commands += prefix + "self.__namespace['" + \
-                            smt[0].value + "'] = "
+                commands += prefix + \
+                    self._variable(smt[0].key, smt[0].value) + " = "
             commands += self._process_testlist(smt[1])
         elif smt.value == "godis":
-            commands += prefix + "try:"
-            commands += prefix + "    self." + smt[0].value
-            commands += prefix + "except AttributeError:"
-            commands += prefix + "    self." + smt[0].value + " = "
+            name = "self." + self.god_prefix + smt[0].value
+            commands += prefix + "if " + name + " is _unset:"
+            commands += prefix + "    " + name + " = "
             commands += self._process_testlist(smt[1])
         return commands
 
-    # This function takes flow statement node and passes the node to different
-    # flow statements.
+    # This function takes flow statement node and passes the node to the
+    # handler for the flow statement it wraps.
+    @handles("flow_statement")
     def _process_flow_smt(self, smt, indentlevel):
-        prefix = "\n" + "    "*indentlevel
-        commands = ""
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'flow statement'. Unfortunately, that is " +
-                                "all we know.")
         if len(smt.children) != 1:
             self._process_error("Flow statement has incorrect number of " +
                                 "children to process.", smt.lineno)
-
-        if smt[0].type == "continue_statement":
-            commands += prefix + self._process_continue(smt[0])
-        elif smt[0].type == "break_statement":
-            commands += prefix + self._process_break(smt[0])
-        elif smt[0].type == "moves_declaration":
-            commands += prefix + self._process_moves_dec(smt[0])
-        elif smt[0].type == "moveto_statement":
-            commands += self._process_moveto(smt[0], indentlevel)
-        else:
-            self._process_error("flow statement has wrong type of child")
-        return commands
-
-    # This function takes continue statement node and return "continue"
-    # if there is no error.
-    def _process_continue(self, smt):
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'continue statement'. Unfortunately, that " +
-                                "is all we know.")
-        return "continue"
-
-    # This function takes break statement node and "return" "break" if
-    # there is no error
-    def _process_break(self, smt):
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'break statement'. Unfortunately, that is " +
-                                "all we know.")
-        return "break"
+        return self.visit(smt[0], indentlevel)
+
+    # This function takes continue statement node and returns "continue".
+    @handles("continue_statement")
+    def _process_continue(self, smt, indentlevel):
+        if self.loops == 0:
+            return "\n" + "    "*indentlevel + "return"
+        return "\n" + "    "*indentlevel + "continue"
+
+    # This function takes break statement node and returns "break".
+    @handles("break_statement")
+    def _process_break(self, smt, indentlevel):
+        if self.loops == 0:
+            self._process_error("A break in an action block has to be in " +
+                                "a while loop.", smt.lineno)
+        return "\n" + "    "*indentlevel + "break"
 
     # This function takes moves_declaration type and produces a direction
-    # dictionary whose the key is the direction and the value is the scene
-    # id.
-    def _process_moves_dec(self, smt):
-        commands = "if not self.directions: self.directions = {"
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'moves declaration'. Unfortunately, that " +
-                                "is all we know.")
+    # dictionary whose the key is the direction and the value is the scene.
+    # A declaration that has become a table on the scene's class produces
+    # nothing.
+    @handles("moves_declaration")
+    def _process_moves_dec(self, smt, indentlevel):
+        if smt is self.static_moves:
+            return ""
+        commands = "\n" + "    "*indentlevel + \
+            "if not self._directions: self._directions = {"
         if len(smt.children) != 1:
             self._process_error("moves declaration has wrong number of " +
                                 "children")
@@ -585,13 +937,10 @@ pocket = pocket_class()\n'''
             commands += self._process_directionlist(smt[0]) + "}"
         return commands
 
-    # This function creates the directionlist.
+    # This function creates the directionlist, from direction to scene ID,
+    # checking that every scene it leads to exists.
     def _process_directionlist(self, smt):
         commands = ""
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'directionlist'. Unfortunately, that is " +
-                                "all we know.")
         if len(smt.children) < 1:
             self._process_error("directionlist has no children")
         l = len(smt.children) - 1
@@ -600,6 +949,7 @@ pocket = pocket_class()\n'''
             if len(d.children) != 1:
                 self._process_error("incorrect children of direction")
             else:
+                self._check_scene(d[0])
                 commands += str(d[0].value)
                 if l != i:
                     commands += ", "
@@ -607,23 +957,26 @@ pocket = pocket_class()\n'''
 
     # This function takes moveto_statement type node and adds return
     # function in current cleanup() function.
+    @handles("moveto_statement")
     def _process_moveto(self, smt, indentlevel):
         commands = ""
         prefix = "\n" + "    "*indentlevel
-        if not isinstance(smt, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'moveto statement'. Unfortunately, that is " +
-                                "all we know.")
         commands += prefix + "self.cleanup()"
         if len(smt.children) != 1:
             self._process_error("moveto has the wrong number of children")
         elif smt[0].type != "sceneid":
             self._process_error("moveto has wrong kind of child")
         else:
-            commands += prefix + "return 's_" + str(smt[0].value)
-            commands += "_inst.setup()'"
+            commands += prefix + "return self._scenes[" + \
+                str(smt[0].value) + "].setup"
         return commands
 
+    # Reports an error if there is no scene with the ID of a sceneid node.
+    def _check_scene(self, sceneid):
+        if self.symtab.get(sceneid.value, "GLOBAL") is None:
+            self._process_error("Scene $" + str(sceneid.value) +
+                                " does not exist.", sceneid.lineno)
+
     # This function returns the value of the direction node.
     def _process_direction(self, smt):
         if not isinstance(smt, Node):
@@ -634,143 +987,169 @@ pocket = pocket_class()\n'''
 
     # This function takes testlist node and iterates through all its children
     # nodes which are test nodes.
+    @handles("testlist")
     def _process_testlist(self, testlist):
-        if not isinstance(testlist, Node):
-            self._process_error("Something bad happened while processing " +
-                                "'testlist'. Unfortunately, that is all we " +
-                                "know.")
         if len(testlist.children) == 0:
             self._process_error("Testlist has no children to process.",
                                 testlist.lineno)
-        tests = testlist.children
-        testcode = []
-        for test in tests:
-            testcode.append(self._process_test(test))
-        return ", ".join(testcode)
-
-    # This function takes test node. Since the only children node of test node
-    # is or_test node, the function passes the node to or_test fuction after
-    # doing the error checking.
+        h = self.handlers
+        return ", ".join([h[test.type](self, test)
+                          for test in testlist.children])
+
+    # Nodes such as test, expression, and the or_test, and_test, not_test,
+    # comparison, arithmetic_expression, term and factor nodes that don't
+    # hold an operator, just wrap one child. That child's code is theirs.
+    # Expression handlers are called often enough that they look up the
+    # handlers of their children themselves, rather than through visit(),
+    # and get at children through the children list.
+    @handles("test", "expression")
     def _process_test(self, test):
-        if not isinstance(test, Node) or test.type != "test":
-            self._process_error("Something bad happened while processing " +
-                                "'test'. Unfortunately, that is all we know.")
-        if len(test.children) != 1:
-            self._process_error("'test' has incorrect number of children.",
-                                test.lineno)
-        return self._process_or_test(test[0])
+        children = test.children
+        if len(children) != 1:
+            self._process_error("'" + test.type + "' has incorrect number " +
+                                "of children.", test.lineno)
+        child = children[0]
+        return self.handlers[child.type](self, child)
 
     # This function takes or_test node. The number of children node of
     # or_test node can only be one or two. If the value of the node is
     # "or", it indicates an or logic expression. If it is not, it indicates
     # the children node is an and test node.
+    @handles("or_test")
     def _process_or_test(self, or_test):
-        if not isinstance(or_test, Node) or or_test.type != "or_test":
-            self._process_error("Something bad happened while processing " +
-                                "'or_test'. Unfortunately, that is all we " +
-                                "know.")
-        if len(or_test.children) not in [1, 2]:
-            self._process_error("'or_test' has incorrect number of children.",
-                                or_test.lineno)
+        h = self.handlers
+        children = or_test.children
+        left = children[0]
         if or_test.value == 'or':
-            return '(' + self._process_or_test(or_test[0]) + ') or ' \
-                    + self._process_and_test(or_test[1])
-        else:
-            return self._process_and_test(or_test[0])
+            right = children[1]
+            return '(' + h[left.type](self, left) + ') or ' + \
+                h[right.type](self, right)
+        return h[left.type](self, left)
 
     # This function takes and_test node. The number of children node of
     # and_test node can only be one or two. If the value of the node is
     # "and", it indicates an and logic expression. If it is not, it indicates
     # a not test node.
+    @handles("and_test")
     def _process_and_test(self, and_test):
-        if not isinstance(and_test, Node) or and_test.type != "and_test":
-            self._process_error("Something bad happened while processing " +
-                                "'and_test'. Unfortunately, that is all we " +
-                                "know.")
-        if len(and_test.children) not in [1, 2]:
-            self._process_error("'and_test' has incorrect number of children.",
-                                and_test.lineno)
+        h = self.handlers
+        children = and_test.children
+        left = children[0]
         if and_test.value == 'and':
-            return '(' + self._process_and_test(and_test[0]) + \
-                    ') and ' + self._process_not_test(and_test[1])
-        else:
-            return self._process_not_test(and_test[0])
-
-    # This function takes not test node. The number of its children node
-    # can only be one. If the value of the node is "not", the function
-    # would add "not" to the logic expression and recursively calls the
-    # not_test function. Otherwise, the function passes the children node
-    # to comparison function.
+            right = children[1]
+            return '(' + h[left.type](self, left) + ') and ' + \
+                h[right.type](self, right)
+        return h[left.type](self, left)
+
+    # This function takes not test node. If the value of the node is "not",
+    # the function adds "not" to the logic expression of its child.
+    @handles("not_test")
     def _process_not_test(self, not_test):
-        if not isinstance(not_test, Node) or not_test.type != "not_test":
-            self._process_error("Something bad happened while processing " +
-                                "'not_test'. Unfortunately, that is all we " +
-                                "know.")
-        if len(not_test.children) != 1:
-            self._process_error("'not_test' has incorrect number of children.",
-                                not_test.lineno)
+        child = not_test.children[0]
         if not_test.value == 'not':
-            return 'not ' + self._process_not_test(not_test[0])
-        else:
-            return self._process_comparison(not_test[0])
+            return 'not ' + self.handlers[child.type](self, child)
+        return self.handlers[child.type](self, child)
 
     # This function takes comparison node. The children nodes of comparison
     # node are comparison, comparison operator and expression if the
     # value is "comparison". Otherwise, the children node is expression node.
+    @handles("comparison")
     def _process_comparison(self, comparison):
-        if not isinstance(comparison, Node) or comparison.type != "comparison":
-            self._process_error("Something bad happened while processing " +
-                                "'comparison'. Unfortunately, that is all we" +
-                                " know.")
-        if len(comparison.children) not in [1, 3]:
-            self._process_error("'comparison' has incorrect number of " +
-                                "children.", comparison.lineno)
+        h = self.handlers
+        children = comparison.children
+        left = children[0]
         if comparison.value == 'comparison':
-            return '(' + self._process_comparison(comparison[0]) + \
-                   ') ' + self._process_comparisonop(comparison[1]) \
-                   + " " + self._process_expression(comparison[2])
-        else:
-            return self._process_expression(comparison[0])
-
-    # This function takes comparison operator node.
-    def _process_comparisonop(self, comparisonop):
-        return comparisonop.value
+            if len(children) != 3:
+                self._process_error("'comparison' has incorrect number of " +
+                                    "children.", comparison.lineno)
+            right = children[2]
+            return '(' + h[left.type](self, left) + ') ' + \
+                children[1].value + " " + h[right.type](self, right)
+        return h[left.type](self, left)
 
     # This function takes while node. If the value of its children node
     # is test, the function passes the children node to _process_test
     # function to get the while condition. If it is not, it passes the
     # children node to the _process_suite, adds one to indentlevel and
     # processes the statement.
+    @handles("while_statement")
     def _process_whilestatement(self, smt, indentlevel=1):
         commands = "while "
         if smt[0].type != "test":
             self._process_error("No test in while loop", smt.lineno)
         else:
-            commands += self._process_test(smt[0]) + ":"
+            commands += self.visit(smt[0]) + ":"
         if smt[1].type != "suite":
             self._process_error("No suite in while loop", smt.lineno)
         else:
-            commands += self._process_suite(smt[1], indentlevel+1)
+            commands += self._loop_body(smt[1], indentlevel+1)
         return commands
 
     # This function takes statement node with "if" value, or an elif node.
     # Note, because of the embedding structure, we need to process it this
     # way, and the constructions are identical, except "if" vs "elif" token.
+    @handles("if_statement")
     def _process_ifstatement(self, smt, indentlevel):
+        chain = self.optimize and dispatch_chain(smt)
+        if chain:
+            return self._process_dispatch(smt, chain, indentlevel)
         prefix = "\n" + "    "*indentlevel
         commands = prefix + "if "
-        commands += self._process_test(smt[0]) + ":"
-        commands += self._process_suite(smt[1], indentlevel+1)
+        commands += self.visit(smt[0]) + ":"
+        commands += self.visit(smt[1], indentlevel+1)
         if smt[2]:
-            commands += self._process_elifstatements(smt[2],
-                                                     indentlevel)
+            commands += self.visit(smt[2], indentlevel)
         if smt[3]:
             commands += prefix + "else:"
-            commands += self._process_suite(smt[3], indentlevel+1)
+            commands += self.visit(smt[3], indentlevel+1)
+        return commands
+
+    # An if statement that dispatch_chain() recognizes looks its name up in
+    # a table on the class, giving the number of the branch to take, or 0
+    # for the else branch. The branch is then found by comparing numbers, in
+    # a tree of ifs. A value that can't be a dictionary key is equal to none
+    # of the literals, so it takes the else branch.
+    def _process_dispatch(self, smt, chain, indentlevel):
+        prefix = "\n" + "    "*indentlevel
+        subject, branches = chain
+        suites = [smt[1]]
+        if smt[2]:
+            suites.extend(e[1] for e in smt[2].children)
+        suites.insert(0, smt[3])
+        name = self._add_table(branches)
+        return prefix + "try:" + \
+            prefix + "    _branch = self." + name + ".get(" + \
+            self.visit(subject) + ", 0)" + \
+            prefix + "except TypeError:" + \
+            prefix + "    _branch = 0" + \
+            self._dispatch_tree(suites, 0, len(suites) - 1, indentlevel)
+
+    # Returns the ifs that run suites[_branch], for lo <= _branch <= hi.
+    def _dispatch_tree(self, suites, lo, hi, indentlevel):
+        prefix = "\n" + "    "*indentlevel
+        if hi - lo >= 3:
+            mid = (lo + hi + 1) // 2
+            return prefix + "if _branch < " + str(mid) + ":" + \
+                self._dispatch_tree(suites, lo, mid - 1, indentlevel + 1) + \
+                prefix + "else:" + \
+                self._dispatch_tree(suites, mid, hi, indentlevel + 1)
+        commands = ""
+        for i in range(lo, hi + 1):
+            if i == lo:
+                commands += prefix + "if _branch == " + str(i) + ":"
+            elif i < hi:
+                commands += prefix + "elif _branch == " + str(i) + ":"
+            else:
+                commands += prefix + "else:"
+            if suites[i]:
+                commands += self.visit(suites[i], indentlevel + 1)
+            else:
+                commands += prefix + "    pass"
         return commands
 
     # This function takes elifstaments node and iterates through
     # all its children node which is elifstatement node.
+    @handles("elif_statements")
     def _process_elifstatements(self, elif_smts, indentlevel):
         commands = ""
         for child in elif_smts.children:
@@ -778,44 +1157,37 @@ pocket = pocket_class()\n'''
                 self._process_error("Invalid child of elif_statements",
                                     elif_smts.lineno)
             else:
-                commands += self._process_elifstatement(child, indentlevel)
+                commands += self.visit(child, indentlevel)
         return commands
 
     # This function takes elif statement node. If the children type
     # is test, it passes the node to process_test. Otherwise, it
     # passes the children node to process_test. This function has
     # a simliar structure with while statement.
+    @handles("elif_statement")
     def _process_elifstatement(self, smt, indentlevel):
         prefix = "\n" + "    "*indentlevel
         commands = prefix + "elif "
         if smt[0].type != "test":
             self._process_error("Invalid elif tree", smt.lineno)
         else:
-            commands += self._process_test(smt[0]) + ":"
+            commands += self.visit(smt[0]) + ":"
         if smt[1].type != "suite":
             self._process_error("Invalid elif tree", smt.lineno)
         else:
-            commands += self._process_suite(smt[1], indentlevel+1)
+            commands += self.visit(smt[1], indentlevel+1)
         return commands
 
-    # This function takes "expression" node. Expression node
-    # only has arithmetic_expression as its children node. The function
-    # passes the node to the process_arithmetic_expression function.
-    def _process_expression(self, expression):
-        return self._process_arithmetic_expression(expression[0])
-
     # This function takes atom nodes. If the atom node is a leaf node,
     # it could be a string node or an id node. For the string node, the
     # function returns the value. For the id or the godid node, the
-    # function returns "self.__namespace" or "self." If the node is not
-    # a leaf node, the function passes children node to different
-    # functions which deal with test, list, number and boolean.
+    # function returns the variable (see _variable()) or "self." If the node
+    # is not a leaf node, its child is a test (which is parenthesized), list,
+    # number or boolean.
+    @handles("atom")
     def _process_atom(self, atom):
-        if not isinstance(atom, Node) or atom.type != "atom":
-            self._process_error("Something bad happened while processing " +
-                                "'atom'. Unfortunately, that is all we " +
-                                "know.")
-        if atom.is_leaf():
+        children = atom.children
+        if not children:
             if atom.v_type == "string":
                 return repr(str(atom.value))
             else:
@@ -827,114 +1199,64 @@ pocket = pocket_class()\n'''
                     if not entry:
                         return atom.value
                     if entry and entry.god:
-                        return "self." + atom.value
+                        return "self." + self.god_prefix + atom.value
                     else:
-                        return "self.__namespace['" + atom.value + "']"
-        if len(atom.children) != 1:
+                        return self._variable(atom.key, atom.value)
+        if len(children) != 1:
             self._process_error("'atom' has incorrect number of " +
                                 "children.", atom.lineno)
+        child = children[0]
         if atom.value == "test":
-            return "(" + self._process_test(atom[0]) + ")"
-        elif atom.value == "list":
-            return self._process_list(atom[0])
-        elif atom.value == "number":
-            return self._process_number(atom[0])
-        elif atom.value == "boolean":
-            return self._process_boolean(atom[0])
-        else:
-            self._process_error("'atom' has unknown child type.", atom.lineno)
+            return "(" + self.handlers[child.type](self, child) + ")"
+        return self.handlers[child.type](self, child)
 
-    # This function processes number nodes.
+    # Numbers and booleans are leaves, and are written as they are. Floats
+    # are written with repr(), as str() rounds them to 12 digits.
+    @handles("number", "boolean")
     def _process_number(self, number):
-        if not isinstance(number, Node) or number.type != "number":
-            self._process_error("Something bad happened while processing " +
-                                "'number'. Unfortunately, that is all we " +
-                                "know.")
-        if number.is_leaf():
+        if not number.children:
+            if type(number.value) is float:
+                return repr(number.value)
             return str(number.value)
         else:
-            self._process_error("'number' has children. It should be sterile.",
-                                number.lineno)
-
-    # This function processes boolean nodes.
-    def _process_boolean(self, boolean):
-        if not isinstance(boolean, Node) or boolean.type != "boolean":
-            self._process_error("Something bad happened while processing " +
-                                "'boolean'. Unfortunately, that is all we " +
-                                "know.")
-        if boolean.is_leaf():
-            return str(boolean.value)
-        else:
-            self._process_error("'boolean' has children. It should be " +
-                                "sterile.", boolean.lineno)
+            self._process_error("'" + number.type + "' has children. It " +
+                                "should be sterile.", number.lineno)
 
     # This function takes arithmetic expressions node. The function
     # recursively processes the arithmetic expression if the value
     # of its children node is not term. The arithmetic expression
     # is composed of arithmetic expression, arithmetic operator and
-    # term.
+    # term. Terms (multiply and divide, which have higher precedence than
+    # plus and minus) are built the same way.
+    @handles("arithmetic_expression", "term")
     def _process_arithmetic_expression(self, arith_exp):
-        if not isinstance(arith_exp, Node) or \
-           arith_exp.type != "arithmetic_expression":
-            self._process_error("Something bad happened while processing " +
-                                "'arithmetic_expression'. Unfortunately, " +
-                                "that is all we know.")
-        if len(arith_exp.children) not in [1, 2]:
-            self._process_error("'arithmetic_expression' has incorrect " +
-                                "number of children.", arith_exp.lineno)
-        if arith_exp.value == "term":
-            return self._process_term(arith_exp[0])
-        elif arith_exp.value in ['+', '-']:
-            return '(' + \
-                self._process_arithmetic_expression(arith_exp[0]) + \
-                ') ' + arith_exp.value + ' ' + \
-                self._process_term(arith_exp[1])
-        else:
-            self._process_error("Illegal operation type for " +
-                                "'arithmetic_expression'", arith_exp.lineno)
-
-    # This function takes term node. Term node deals with multiple and divide,
-    # which have higher precedence than plus and minus. If the value of
-    # children node is factor, the function passes the node to
-    # _process_factor function.
-    def _process_term(self, term):
-        if not isinstance(term, Node) or term.type != "term":
-            self._process_error("Something bad happened while processing " +
-                                "'term'. Unfortunately, " +
-                                "that is all we know.")
-        if len(term.children) not in [1, 2]:
-            self._process_error("'term' has incorrect " +
-                                "number of children.", term.lineno)
-        if term.value == "factor":
-            return self._process_factor(term[0])
-        elif term.value in ['*', '/', '//']:
-            return '(' + \
-                self._process_term(term[0]) + \
-                ') ' + term.value + ' ' + \
-                self._process_factor(term[1])
+        h = self.handlers
+        children = arith_exp.children
+        if len(children) == 1:
+            child = children[0]
+            return h[child.type](self, child)
+        elif len(children) == 2:
+            left, right = children
+            return '(' + h[left.type](self, left) + ') ' + \
+                arith_exp.value + ' ' + h[right.type](self, right)
         else:
-            self._process_error("Illegal operation type for " +
-                                "'term'", term.lineno)
+            self._process_error("'" + arith_exp.type + "' has incorrect " +
+                                "number of children.", arith_exp.lineno)
 
     # This function takes factor node. If the value of factor is power,
     # the function passes the node to process_power function. Otherwise,
     # the value of factor should fall in plus and minus.
+    @handles("factor")
     def _process_factor(self, factor):
-        if not isinstance(factor, Node) or factor.type != "factor":
-            self._process_error("Something bad happened while processing " +
-                                "'factor'. Unfortunately, " +
-                                "that is all we know.")
-        if len(factor.children) != 1:
+        children = factor.children
+        if len(children) != 1:
             self._process_error("'factor' has incorrect " +
                                 "number of children.", factor.lineno)
+        child = children[0]
         if factor.value == "power":
-            return self._process_power(factor[0])
-        elif factor.value in ['+', '-']:
-            return '(' + factor.value + \
-                self._process_factor(factor[0]) + ')'
-        else:
-            self._process_error("Illegal operation type for " +
-                                "'factor'", factor.lineno)
+            return self.handlers[child.type](self, child)
+        return '(' + factor.value + self.handlers[child.type](self, child) + \
+            ')'
 
     # This function takes power node. If the value of the power is "atom",
     # the function passes the children node to function _process_atom. If
@@ -943,108 +1265,77 @@ pocket = pocket_class()\n'''
     # just passes. If the value type is poceket or otherwise (for narratr it
     # could only be list), the function passes nodes to process_pocket or
     # process_list functions.
+    @handles("power")
     def _process_power(self, power):
-        if not isinstance(power, Node) or power.type != "power":
-            self._process_error("Something bad happened while processing " +
-                                "'power'. Unfortunately, " +
-                                "that is all we know.")
+        h = self.handlers
+        children = power.children
+        first = children[0]
         if power.value == "atom":
-            return self._process_atom(power[0])
+            return h[first.type](self, first)
         elif power.value == "trailer":
-            if power[0].v_type == "id":
-                if power[0].value in ["str", "int", "float"]:
+            if first.v_type == "id":
+                if first.value in ["str", "int", "float"]:
                     pass
-                elif not self.symtab.get(power[0].value, "GLOBAL"):
-                    if power[0].value == "pocket":
+                elif not self.symtab.get(first.value, "GLOBAL"):
+                    if first.value == "pocket":
                         return self._process_pocket(power)
-            atom = self._process_atom(power[0])
-            trailers = ''
-            for trailer in power.children[1:]:
-                trailers += self._process_trailer(trailer)
-            return atom + trailers
+            return h[first.type](self, first) + \
+                "".join([h[trailer.type](self, trailer)
+                         for trailer in children[1:]])
         else:
             self._process_error("Illegal operation type for " +
                                 "'power'", power.lineno)
 
     # This function processes trailers.
+    @handles("trailer")
     def _process_trailer(self, trailer):
-        if not isinstance(trailer, Node) or trailer.type != "trailer":
-            self._process_error("Something bad happened while processing " +
-                                "'trailer'. Unfortunately, " +
-                                "that is all we know.")
-        if len(trailer.children) != 1:
+        children = trailer.children
+        if len(children) != 1:
             self._process_error("'trailer' has incorrect " +
                                 "number of children.", trailer.lineno)
         if trailer.value == "dot":
-            return "." + str(trailer[0])
-        elif trailer.value == "calllist":
-            return self._process_calllist(trailer[0])
-        else:
-            self._process_error("Illegal value type for 'trailer'",
-                                trailer.lineno)
+            return "." + str(children[0])
+        return self.handlers[children[0].type](self, children[0])
 
     # This function processes calllist. If the value of calllist is
     # "args", the function passes its children node to process_args
     # function.
+    @handles("calllist")
     def _process_calllist(self, calllist):
-        if not isinstance(calllist, Node) or calllist.type != "calllist":
-            self._process_error("Something bad happened while processing " +
-                                "'calllist'. Unfortunately, " +
-                                "that is all we know.")
-        if len(calllist.children) not in [0, 1]:
-            self._process_error("'calllist' has incorrect " +
-                                "number of children.", calllist.lineno)
         if not calllist.value:
             return '()'
-        elif calllist.value == 'args':
-            return '(' + self._process_args(calllist[0]) + ')'
-        else:
-            self._process_error("Illegal value type for 'calllist'",
-                                calllist.lineno)
+        if len(calllist.children) != 1:
+            self._process_error("'calllist' has incorrect " +
+                                "number of children.", calllist.lineno)
+        return '(' + self.visit(calllist.children[0]) + ')'
 
-    # This function processes args. If the value of the node is
-    # "expression", the function passes its children node to
-    # process_expression. Otherwise, it iterates through all
-    # the expression nodes of its children node.
+    # This function processes args, a list of expressions.
+    @handles("args")
     def _process_args(self, args):
-        if not isinstance(args, Node) or args.type != "args":
-            self._process_error("Something bad happened while processing " +
-                                "'args'. Unfortunately, " +
-                                "that is all we know.")
         if len(args.children) < 1:
             self._process_error("'args' has incorrect " +
                                 "number of children.", args.lineno)
-        if args.value == "expression":
-            return self._process_expression(args[0])
-        elif args.value == 'args':
-            argscode = []
-            for expression in args.children:
-                argscode.append(self._process_expression(expression))
-            return ", ".join(argscode)
-        else:
-            self._process_error("Illegal value type for 'args'",
-                                args.lineno)
+        h = self.handlers
+        return ", ".join([h[expression.type](self, expression)
+                          for expression in args.children])
 
     # This function processes list node for list declaration and plus
     # arithmetic operation.
+    @handles("list")
     def _process_list(self, nlist):
-        commands = ''
-        if not isinstance(nlist, Node) or nlist.type != "list":
-            self._process_error("Something bad happened while processing " +
-                                "'list'. Unfortunately, " +
-                                "that is all we know.")
         if len(nlist.children) == 0:
             return "[]"
-        else:
-            commands += '['
-            commands += self._process_testlist(nlist[0])
-            commands += ']'
-            return commands
+        return '[' + self.visit(nlist.children[0]) + ']'
 
     # This function takes pocket node and deals with the pocket
     # as list in python.
     def _process_pocket(self, pocket_node):
-        commands = ""
+        return "pocket." + self._pocket_method(pocket_node) + \
+            self.visit(pocket_node[2])
+
+    # Checks that a power node starting with pocket calls one of the
+    # pocket's methods, and returns the method's name.
+    def _pocket_method(self, pocket_node):
         if len(pocket_node.children) != 3:
             self._process_error("pocket has wrong number of children",
                                 pocket_node.lineno)
@@ -1054,25 +1345,11 @@ pocket = pocket_class()\n'''
         if len(pocket_node[1].children) != 1:
             self._process_error("no method specified for pocket",
                                 pocket_node.lineno)
-        if pocket_node[1].children[0] == "add":
-            commands += "pocket.add"
-            commands += self._process_trailer(pocket_node[2])
-        elif pocket_node[1].children[0] == "get":
-            commands += "pocket.get"
-            commands += self._process_trailer(pocket_node[2])
-        elif pocket_node[1].children[0] == "remove":
-            commands += "pocket.remove"
-            commands += self._process_trailer(pocket_node[2])
-        elif pocket_node[1].children[0] == "has":
-            commands += "pocket.has"
-            commands += self._process_trailer(pocket_node[2])
-        elif pocket_node[1].children[0] == "update":
-            commands += "pocket.update"
-            commands += self._process_trailer(pocket_node[2])
-        else:
+        method = pocket_node[1].children[0]
+        if method not in _POCKET_METHODS:
             self._process_error("invalid method for pocket",
                                 pocket_node.lineno)
-        return commands
+        return method
 
     # This function takes id node which is recognized as list.
     # It interprets and implements the list operations in Python.
@@ -1104,19 +1381,12 @@ pocket = pocket_class()\n'''
                                 nlist.lineno)
         return commands
 
-    # This function processes error in code generator.
+    # This function processes error in code generator. It reports the error
+    # and abandons the block being generated.
     def _process_error(self, error, lineno=0):
-        if lineno != 0:
-            stderr.write("ERROR: Line " + str(lineno) + ": " + str(error) +
-                         "\n")
-        else:
-            stderr.write("ERROR: " + str(error) + "\n")
-        exit(1)
+        self.diagnostics.error(str(error), lineno or None)
+        raise _BlockError()
 
     # This function processes warning in code generator.
     def _process_warning(self, warning, lineno=0):
-        if lineno != 0:
-            stderr.write("WARNING: Line " + str(lineno) + ": " + str(warning) +
-                         "\n")
-        else:
-            stderr.write("WARNING: " + str(warning) + "\n")
+        self.diagnostics.warning(str(warning), lineno or None)
@@ -0,0 +1,101 @@
+# -----------------------------------------------------------------------------
+# narrtr: diagnostics.py
+# This file defines how the narratr compiler reports errors and warnings.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+import sys
+
+
+class Diagnostic:
+    """One error or warning found while compiling.
+
+    severity      "error" or "warning".
+    message       what is wrong, without the location.
+    line          the line it was found on, counting from 1, or None.
+    column        the column it was found at, counting from 1, or None."""
+    def __init__(self, severity, message, line=None, column=None):
+        self.severity = severity
+        self.message = message
+        self.line = line
+        self.column = column
+
+    def as_dict(self):
+        return {"severity": self.severity, "message": self.message,
+                "line": self.line, "column": self.column}
+
+    def __str__(self):
+        where = ""
+        if self.line:
+            where = "Line " + str(self.line)
+            if self.column:
+                where += ", column " + str(self.column)
+            where += ": "
+        return self.severity.upper() + ": " + where + self.message
+
+    def __repr__(self):
+        return "<" + str(self) + ">"
+
+
+class Diagnostics:
+    """A sink that the lexer, parser and code generator report into.
+
+    Nothing is written anywhere until report() is called, so a program that
+    embeds the compiler decides what to do with every diagnostic."""
+    def __init__(self):
+        self.diagnostics = []
+
+    def error(self, message, line=None, column=None):
+        self.diagnostics.append(Diagnostic("error", message, line, column))
+
+    def warning(self, message, line=None, column=None):
+        self.diagnostics.append(Diagnostic("warning", message, line, column))
+
+    def errors(self):
+        return [d for d in self.diagnostics if d.severity == "error"]
+
+    def warnings(self):
+        return [d for d in self.diagnostics if d.severity == "warning"]
+
+    def extend(self, other):
+        """Add every diagnostic in another sink to this one."""
+        self.diagnostics.extend(other.diagnostics)
+
+    def clear(self):
+        del self.diagnostics[:]
+
+    def report(self, stream=None):
+        """Write every diagnostic, one per line, to stream (or stderr)."""
+        if stream is None:
+            stream = sys.stderr
+        for d in self.diagnostics:
+            stream.write(str(d) + "\n")
+
+    def __iter__(self):
+        return iter(self.diagnostics)
+
+    def __len__(self):
+        return len(self.diagnostics)
+
+
+class CompileError(Exception):
+    """Raised when a program does not compile.
+
+    diagnostics holds every error (and warning) found, not just the first."""
+    def __init__(self, diagnostics):
+        Exception.__init__(self, "\n".join(str(d) for d in
+                                           diagnostics.errors()))
+        self.diagnostics = diagnostics
+
+
+def column(text, pos):
+    """The column, counting from 1, of position pos in text."""
+    return pos - text.rfind("\n", 0, pos)
@@ -0,0 +1,82 @@
+# -----------------------------------------------------------------------------
+# narrtr: emitter.py
+# This file defines how generated code is written out.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Emitter:
+    """Collects generated code and writes it to a stream in chunks.
+
+    stream        any object with a write() method, such as an open file. Text
+                  is buffered until chunk_size characters are waiting and then
+                  written in a single call, so memory use stays flat however
+                  much is emitted. If stream is None, everything is kept and
+                  getvalue() returns it.
+    chunk_size    how many characters to buffer before writing.
+
+    line() writes whole lines at the current indentation level, which
+    indent() and dedent() move in and out by one step."""
+    def __init__(self, stream=None, chunk_size=CHUNK_SIZE, step="    "):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.step = step
+        self.level = 0
+        self.buffer = []
+        self.buffered = 0
+        self.written = 0
+
+    def write(self, text):
+        """Emit text exactly as given."""
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.stream is not None and self.buffered >= self.chunk_size:
+            self.flush()
+
+    def line(self, text=""):
+        """Emit text as a line of its own at the current indentation."""
+        if text:
+            self.write(self.step * self.level + text + "\n")
+        else:
+            self.write("\n")
+
+    def indent(self):
+        self.level += 1
+
+    def dedent(self):
+        if self.level == 0:
+            raise ValueError("Can't dedent past the left margin.")
+        self.level -= 1
+
+    def flush(self):
+        """Write out everything buffered so far."""
+        if self.stream is None or not self.buffer:
+            return
+        self.stream.write("".join(self.buffer))
+        self.written += self.buffered
+        del self.buffer[:]
+        self.buffered = 0
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    def getvalue(self):
+        """Return everything emitted, when there is no stream."""
+        if self.stream is not None:
+            raise ValueError("Emitted code has been written to a stream.")
+        if len(self.buffer) > 1:
+            self.buffer[:] = ["".join(self.buffer)]
+        return self.buffer[0] if self.buffer else ""
+
+    def __len__(self):
+        """How many characters have been emitted."""
+        return self.written + self.buffered
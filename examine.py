@@ -40,6 +40,7 @@ def show_tokens(filename):
 	    while t:
 	        tokenlist.append(str(t))
 	        t = m.token()
+	    m.diagnostics.report()
 	if verbose:
 		for f in tokenlist:
 			print f
@@ -63,6 +64,7 @@ def show_ast(filename):
 		return ast, p.symtab
 	except:
 		print "Yo that did not parse."
+		p.diagnostics.report()
 		if verbose:
 			traceback.print_exc()
 
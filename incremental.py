@@ -0,0 +1,346 @@
+# -----------------------------------------------------------------------------
+# narrtr: incremental.py
+# This file recompiles only the parts of a narratr program that changed.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Incremental recompilation at scene and item granularity.
+
+A program is a set of independent scene and item blocks plus start states.
+split_blocks() cuts the source text into those blocks without parsing it.
+IncrementalCompiler hashes each scene and item block, and keeps the code
+generated for it under that hash. When the program is compiled again, only
+blocks whose text changed are lexed, parsed (which resolves their names) and
+handed to the code generator; the code for every other block is spliced in
+from the previous build."""
+
+import os
+import re
+import hashlib
+from codegen import CodeGen
+from optimize import references, live_blocks
+from node import Node
+from cache import compiler_version
+from diagnostics import Diagnostics, CompileError
+
+_HEADER = re.compile(r"(scene|item|start)(?![a-zA-Z_0-9])")
+_SCENE = re.compile(r"scene\s+\$([0-9]+)")
+_ITEM = re.compile(r"item\s+([a-zA-Z_][a-zA-Z_0-9]*)")
+_START = re.compile(r"start[ \t\r\f\v]*:[ \t\r\f\v]*\$([0-9]+)" +
+                    r"[ \t\r\f\v]*(%.*)?$")
+
+
+class Block:
+    """One top-level block of source text.
+
+    kind      "scene", "item" or "start".
+    text      the source of the block, from its keyword to its closing brace
+              (or the end of the line, for start states).
+    lineno    the line the block starts on.
+    key       the scene ID or item name the block declares, or the scene
+              ID a start state names."""
+    def __init__(self, kind, text, lineno, key=None):
+        self.kind = kind
+        self.text = text
+        self.lineno = lineno
+        self.key = key
+
+    def __repr__(self):
+        return "Block(" + self.kind + ", " + repr(self.key) + ", line " + \
+            str(self.lineno) + ")"
+
+
+def split_blocks(source):
+    """Cut source text into a list of Blocks.
+
+    This only tracks strings, comments and braces, so it is much cheaper
+    than lexing. Every block must begin at the start of a line. Returns None
+    if the text can't be cut up safely, in which case the program should be
+    compiled as a whole so that the parser reports whatever is wrong."""
+    blocks = []
+    n = len(source)
+    i = 0
+    lineno = 1
+    linestart = True
+    while i < n:
+        ch = source[i]
+        if ch == "\n":
+            lineno += 1
+            linestart = True
+            i += 1
+            continue
+        if ch in " \t\r\f\v":
+            linestart = False
+            i += 1
+            continue
+        # The lexer only accepts comments that end in a newline.
+        if ch == "%":
+            i = source.find("\n", i)
+            if i == -1:
+                return None
+            continue
+        match = _HEADER.match(source, i)
+        if not linestart or not match:
+            return None
+        kind = match.group(1)
+        start = i
+        first = lineno
+        if kind == "start":
+            i = source.find("\n", i)
+            if i == -1:
+                i = n
+        else:
+            i = _block_end(source, i)
+            if i is None:
+                return None
+            lineno += source.count("\n", start, i)
+            linestart = False
+        text = source[start:i]
+        if kind == "start":
+            match = _START.match(text)
+            if not match:
+                return None
+            key = int(match.group(1))
+        elif kind == "scene":
+            match = _SCENE.match(text)
+            if not match:
+                return None
+            key = int(match.group(1))
+        elif kind == "item":
+            match = _ITEM.match(text)
+            if not match:
+                return None
+            key = match.group(1)
+        blocks.append(Block(kind, text, first, key))
+    return blocks
+
+
+# Returns the index just past the brace that closes the block starting at i,
+# or None if the braces never balance.
+def _block_end(source, i):
+    n = len(source)
+    depth = 0
+    while i < n:
+        ch = source[i]
+        if ch == '"':
+            i += 1
+            while i < n and source[i] != '"':
+                if source[i] == "\\":
+                    i += 1
+                i += 1
+        elif ch == "%":
+            i = source.find("\n", i)
+            if i == -1:
+                return None
+            continue
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+            if depth < 0:
+                return None
+        i += 1
+    return None
+
+
+class IncrementalCompiler:
+    """Compiles programs, reusing the generated code of unchanged blocks.
+
+    previous is the fragments dictionary of an earlier build of the same
+    program, such as one saved in a CompileCache. After each compile(),
+    fragments holds just the error-free blocks of the program last compiled,
+    and compiled and reused count how many blocks went through the compiler
+    and how many were spliced in. Scenes that can't be reached and items
+    that are never used are left out, as CodeGen.process() leaves them out,
+    unless keep_all is True."""
+    def __init__(self, previous=None, keep_all=False):
+        self.fragments = previous or {}
+        self.keep_all = keep_all
+        self.diagnostics = Diagnostics()
+        self.compiled = 0
+        self.reused = 0
+
+    # The code generated for a block depends on the block's text, on the
+    # compiler, on which global names are items (a scene may refer to an
+    # item in place of the pocket, for instance) and on which scenes exist
+    # (moves can only lead to those). Adding or removing an item or a scene
+    # therefore invalidates every block.
+    def _hash(self, block, context):
+        h = hashlib.sha1(compiler_version())
+        h.update("\0")
+        h.update(context)
+        h.update("\0")
+        h.update(block.text)
+        return h.hexdigest()
+
+    def compile(self, source, parser):
+        """Return the generated code for source.
+
+        parser is a ParserForNarratr, used for the blocks that changed.
+        Afterwards diagnostics holds the warnings and errors of this compile.
+        If there were errors, CompileError is raised once every block has
+        been looked at, and the blocks that did compile are still kept for
+        the next build."""
+        self.diagnostics = Diagnostics()
+        self.compiled = self.reused = 0
+        blocks = split_blocks(source)
+        if not blocks:
+            self.fragments = {}
+            ast = self._parse(source, parser)
+            if ast is None:
+                raise CompileError(self.diagnostics)
+            c = CodeGen(self.diagnostics)
+            c.process(ast, parser.symtab)
+            return c.code()
+
+        names = [b.key for b in blocks if b.kind == "item"]
+        scene_ids = [b.key for b in blocks if b.kind == "scene"]
+        context = " ".join(sorted(names)) + " $" + \
+            " $".join(str(s) for s in sorted(scene_ids))
+        fragments = {}
+        scenes = {}
+        items = {}
+        starts = []
+        lines = {}
+        declared = set()
+        for block in blocks:
+            if block.kind == "start":
+                starts.append(block)
+                continue
+            if (block.kind, block.key) in declared:
+                self.diagnostics.error(
+                    ("A scene" if block.kind == "scene" else "An item") +
+                    " with the id '" + str(block.key) + "' already exists.",
+                    block.lineno)
+            declared.add((block.kind, block.key))
+            h = self._hash(block, context)
+            fragment = fragments.get(h) or self.fragments.get(h)
+            if fragment is None:
+                fragment = self._compile_block(block, parser, names,
+                                               scene_ids)
+                self.compiled += 1
+                if fragment is None:
+                    continue
+            else:
+                self.reused += 1
+            fragments[h] = fragment
+            block_type, key, code, refs = fragment
+            lines[block_type, key] = block.lineno
+            if block_type == "scene_block":
+                scenes[key] = fragment
+            else:
+                items[key] = fragment
+        self.fragments = fragments
+        # The start state can only be checked against every scene, so if a
+        # block had errors, they are all there is to report.
+        if self.diagnostics.errors():
+            raise CompileError(self.diagnostics)
+
+        live = None
+        if not self.keep_all:
+            start = starts[0].key if starts else 1
+            live = live_blocks(start,
+                               dict((k, f[3]) for k, f in scenes.iteritems()),
+                               dict((k, f[3]) for k, f in items.iteritems()))
+
+        # Blocks are added in the order a full parse would produce them, so
+        # the result is the same as compiling the whole program.
+        c = CodeGen(self.diagnostics)
+        for i, table in enumerate((scenes, items)):
+            for key, fragment in table.iteritems():
+                if live is None or key in live[i]:
+                    c.add_generated(*fragment[:3])
+                else:
+                    c.drop(fragment[0], key, lines[fragment[0], key])
+        for block in starts:
+            c.process_block(Node(block.key, "start_state",
+                                 lineno=block.lineno))
+        return c.code()
+
+    # Parses text, moving the parser's diagnostics into ours. Returns None if
+    # there were errors.
+    def _parse(self, text, parser):
+        try:
+            return parser.parse(text)
+        except CompileError:
+            return None
+        finally:
+            self.diagnostics.extend(parser.diagnostics)
+
+    # Parses and generates code for a single block. The text is padded with
+    # newlines so that line numbers in the AST, and in any errors, match the
+    # whole program's. The other items and scenes are entered in the symbol
+    # table as the full parse would have entered them. Returns None if the
+    # block has errors.
+    def _compile_block(self, block, parser, names, scene_ids):
+        ast = self._parse("\n" * (block.lineno - 1) + block.text + "\n",
+                          parser)
+        if ast is None:
+            return None
+        if block.kind == "scene":
+            node = ast.blocks.scenes.values()[0]
+        else:
+            node = ast.blocks.items.values()[0]
+        for name in names:
+            if not parser.symtab.get(name, "GLOBAL"):
+                parser.symtab.insert(name, None, "item", "GLOBAL", False)
+        for sid in scene_ids:
+            if not parser.symtab.get(sid, "GLOBAL"):
+                parser.symtab.insert(sid, None, "scene", "GLOBAL", False)
+        code = CodeGen(self.diagnostics).process_block(node, node.value,
+                                                       parser.symtab)
+        if code is None:
+            return None
+        return node.type, node.value, code, references(node)
+
+
+# Returns the key the blocks of the last build of the file at path are kept
+# under in cache.
+def _path_key(cache, path):
+    return cache.key("incremental\0" + os.path.abspath(path))
+
+
+def compile_file(path, source, parser, cache):
+    """Compile source, the contents of the file at path, incrementally.
+
+    The blocks of the last build of path are loaded from cache, a
+    CompileCache, and the blocks of this build are saved back to it, even
+    if the compile fails. Returns the generated code and the
+    IncrementalCompiler used."""
+    key = _path_key(cache, path)
+    compiler = IncrementalCompiler(cache.load(key))
+    try:
+        code = compiler.compile(source, parser)
+    finally:
+        try:
+            cache.store(key, compiler.fragments)
+        except (IOError, OSError):
+            pass
+    return code, compiler
+
+
+def seed_fragments(path, fragments, cache):
+    """Make fragments, the blocks kept with a cache hit for the file at
+    path, the last build of path, so that the next compile_file() of path
+    only recompiles the blocks that changed since. Nothing is written if
+    they already are, or if fragments is None."""
+    if fragments is None:
+        return
+    key = _path_key(cache, path)
+    previous = cache.load(key)
+    if previous is not None and set(previous) == set(fragments):
+        return
+    try:
+        cache.store(key, fragments)
+    except (IOError, OSError):
+        pass
@@ -15,9 +15,9 @@
 #
 # -----------------------------------------------------------------------------
 
-from sys import stderr, exit
 import re
 import ply.lex as lex
+from diagnostics import Diagnostics, column
 
 
 class LexerForNarratr:
@@ -69,12 +69,31 @@ class LexerForNarratr:
         list(reserved.values())
 
     # The constructor here builds the lexer. The re.MULTILINE flag is critical
-    # in matching indents.
-    def __init__(self, **kwargs):
+    # in matching indents. Errors are reported to diagnostics, a Diagnostics
+    # sink; the parser passes in its own.
+    def __init__(self, diagnostics=None, **kwargs):
         self.lexer = lex.lex(module=self, reflags=re.MULTILINE, **kwargs)
+        if diagnostics is None:
+            diagnostics = Diagnostics()
+        self.diagnostics = diagnostics
+        self.reset()
+
+    # This method clears the indentation state and line count left behind by
+    # a previous input, so one lexer can be reused for many inputs without
+    # rebuilding its rules.
+    def reset(self):
         self.indentstack = [0]
         self.dedenting = False
         self.lasttoken = None
+        self.lexer.lineno = 1
+
+    # This method moves the lexer to lexpos, which must be the start of a
+    # top-level block, so that the parser can start over from there after a
+    # syntax error.
+    def resync(self, lexpos):
+        self.indentstack = [0]
+        self.dedenting = False
+        self.lexer.lexpos = lexpos
 
     # Regular expression rules for simple tokens are specified here.
     t_LCURLY = r'{'
@@ -217,15 +236,14 @@ class LexerForNarratr:
     def t_ignore_whitespace(self, t):
         r'[ \t\r\f\v]+'
 
-    # This rule is triggered if an error is encountered. The program exits with
-    # an error code after printing an error
+    # This rule is triggered if an error is encountered. The error is
+    # reported and the offending character skipped, so that lexing carries on
+    # and later errors are found in the same pass.
     def t_error(self, t):
-        if isinstance(t, lex.LexToken):
-            stderr.write("ERROR: Unrecognized character at Line " +
-                         str(t.lexer.lineno) + ": '" + str(t.value) + "'\n")
-        elif isinstance(t, str):
-            stderr.write("ERROR: " + str(p) + "\n")
-        exit(1)
+        self.diagnostics.error("Unrecognized character '" + t.value[0] + "'",
+                               t.lexer.lineno,
+                               column(t.lexer.lexdata, t.lexpos))
+        t.lexer.skip(1)
 
     # This method provides an interface to the lexer's input(string) function
     def input(self, string_to_scan):
@@ -17,7 +17,14 @@
 
 import sys
 import parser
-from codegen import CodeGen
+import build
+import serve
+from codegen import CodeGen, generate_file, install_runtime
+from package import write_package
+import astgen
+from cache import CompileCache, DEFAULT_DIR
+from incremental import compile_file, seed_fragments
+from diagnostics import Diagnostics, CompileError
 from node import Node
 import argparse
 
@@ -51,25 +58,134 @@ def print_symtab(symtab):
     print symtab
 
 
+# Reports every error (and warning) from a failed compile and exits.
+def fail(diagnostics):
+    if verbose:
+        print
+    diagnostics.report()
+    exit(1)
+
+
 def parse(source):
     if verbose:
         print "parsing...",
     p = parser.ParserForNarratr()
-    ast = p.parse(source)
+    try:
+        ast = p.parse(source)
+    except CompileError as e:
+        fail(e.diagnostics)
     symtab = p.symtab
     if verbose:
         print u'\u2713'
     return ast, symtab
 
 
-def generate_code(ast, symtab, outfile):
+def generate_code(ast, symtab, keep_all=False):
     if verbose:
         print "generating code...",
-    c = CodeGen()
-    c.process(ast, symtab)
-    c.construct(outfile)
+    c = CodeGen(keep_all=keep_all)
+    try:
+        c.process(ast, symtab)
+        code = c.code()
+    except CompileError as e:
+        fail(e.diagnostics)
+    if verbose:
+        print u'\u2713', "(%d nodes folded away)" % c.folder.removed
+    c.diagnostics.report()
+    return code, c.diagnostics
+
+
+# Generates code straight into the output file, for when nothing needs it as
+# a string.
+def stream_code(ast, symtab, path, keep_all=False):
+    if verbose:
+        print "generating code and writing file...",
+    try:
+        c = generate_file(ast, symtab, path, keep_all=keep_all)
+    except CompileError as e:
+        fail(e.diagnostics)
+    except (IOError, OSError) as e:
+        print "\nERROR: Couldn't write output file " + path
+        exit(1)
+    if verbose:
+        print u'\u2713', "(%d nodes folded away)" % c.folder.removed
+    c.diagnostics.report()
+
+
+# Writes the game as a package, with each scene in a module of its own.
+def package_code(ast, symtab, path, keep_all=False):
+    if verbose:
+        print "generating code and writing package...",
+    try:
+        p = write_package(ast, symtab, path, keep_all=keep_all)
+    except CompileError as e:
+        fail(e.diagnostics)
+    except (IOError, OSError) as e:
+        print "\nERROR: Couldn't write output package " + path
+        exit(1)
+    if verbose:
+        print u'\u2713', "(%d scene modules)" % p.scenes_added
+    p.diagnostics.report()
+
+
+# Compiles straight to a Python code object, which can be saved as a .pyc or
+# run without ever being written out as Python source.
+def compile_code(ast, symtab, filename, keep_all=False):
+    if verbose:
+        print "compiling to bytecode...",
+    diagnostics = Diagnostics()
+    try:
+        code = astgen.compile_program(ast, symtab, filename, diagnostics,
+                                      keep_all)
+    except CompileError as e:
+        fail(e.diagnostics)
     if verbose:
         print u'\u2713'
+    diagnostics.report()
+    return code
+
+
+def write_pyc(path, code):
+    if verbose:
+        print "writing file...",
+    try:
+        astgen.write_pyc(code, path)
+    except (IOError, OSError) as e:
+        print "\nERROR: Couldn't write output file " + path
+        exit(1)
+    else:
+        if verbose:
+            print u'\u2713'
+
+
+def compile_incremental(path, source, cache):
+    if verbose:
+        print "compiling changed blocks...",
+    try:
+        code, compiler = compile_file(path, source,
+                                      parser.ParserForNarratr(), cache)
+    except CompileError as e:
+        fail(e.diagnostics)
+    if verbose:
+        print u'\u2713', "(%d blocks compiled, %d reused)" % (
+            compiler.compiled, compiler.reused)
+    compiler.diagnostics.report()
+    return code, compiler
+
+
+def write(path, code):
+    if verbose:
+        print "writing file...",
+    try:
+        with open(path, 'w') as f:
+            f.write(code)
+        install_runtime(path)
+    except (IOError, OSError) as e:
+        print "\nERROR: Couldn't write output file " + path
+        exit(1)
+    else:
+        if verbose:
+            print u'\u2713'
 
 
 def read(path):
@@ -88,7 +204,23 @@ def read(path):
 
 
 def main():
-    argparser = argparse.ArgumentParser()
+    # "narratr.py build ..." compiles many files at once; see build.py.
+    if sys.argv[1:2] == ["build"]:
+        build.main(sys.argv[2:])
+        return
+    # "narratr.py serve ..." runs the compiler as a service; see serve.py.
+    if sys.argv[1:2] == ["serve"]:
+        serve.main(sys.argv[2:])
+        return
+    # "narratr.py tables" regenerates the prebuilt parser tables.
+    if sys.argv[1:] == ["tables"]:
+        print "wrote " + parser.build_tables()
+        return
+
+    argparser = argparse.ArgumentParser(
+        epilog='to compile many files in one run, see "%(prog)s build -h".' +
+        ' to run the compiler as a service, see "%(prog)s serve -h".' +
+        ' after changing the grammar, run "%(prog)s tables".')
     argparser.add_argument('-t', '--tree', action='store_true',
                            help='print a representation of the abstract' +
                            ' syntax tree from the parser')
@@ -100,20 +232,84 @@ def main():
                            ' [input file].py')
     argparser.add_argument('-i', '--inert', action="store_true",
                            help='does not try to use code generator')
+    argparser.add_argument('--pyc', action="store_true",
+                           help='write Python bytecode, which python runs' +
+                           ' directly, instead of source. the output file' +
+                           ' defaults to [input file].pyc')
+    argparser.add_argument('--package', action="store_true",
+                           help='write a directory with a module for each' +
+                           ' scene, which is only loaded when the player' +
+                           ' first enters it. for very large games. the' +
+                           ' output defaults to [input file].pkg, which' +
+                           ' python runs like a file')
+    argparser.add_argument('--run', action="store_true",
+                           help='play the game straight away, instead of' +
+                           ' writing it out')
     argparser.add_argument('-s', '--symtab', action='store_true',
                            help='print the symbol table')
+    argparser.add_argument('--keep-all', action="store_true",
+                           help='keep scenes that can\'t be reached and' +
+                           ' items that are never used, which are otherwise' +
+                           ' left out. implies --no-cache')
+    argparser.add_argument('--cache-dir', action="store", default=DEFAULT_DIR,
+                           help='directory for cached compiles. defaults' +
+                           ' to ' + DEFAULT_DIR)
+    argparser.add_argument('--no-cache', action="store_true",
+                           help='always recompile, and do not touch the' +
+                           ' compile cache')
     args = argparser.parse_args(sys.argv[1:])
+    if args.package and (args.pyc or args.run):
+        argparser.error("--package can't be used with --pyc or --run")
 
     global verbose
     verbose = args.verbose
 
     if args.output is None:
-        outputfile = args.source + ".py"
+        outputfile = args.source + (".pyc" if args.pyc else
+                                    ".pkg" if args.package else ".py")
     else:
         outputfile = args.output[0]
 
     source = read(args.source)
-    ast, symtab = parse(source)
+
+    # A cache hit gives us the AST, symbol table and generated code of an
+    # identical source compiled by this same compiler, so we can skip both
+    # parse() and generate_code(). Entries written by an incremental compile
+    # have no AST or symbol table, so they can only stand in for a compile
+    # that doesn't print them. The errors and warnings of the compile are
+    # kept with it, and reported again when its code is used, and so are its
+    # blocks, which become the last build of this file so that the next edit
+    # only recompiles what it changed.
+    cache = None
+    cached = None
+    code = None
+    ast = symtab = None
+    needs_ast = args.tree or args.symtab or args.inert or args.pyc or \
+        args.run or args.package
+    # The cache only holds compiles that leave unused blocks out.
+    if not args.no_cache and not args.keep_all:
+        cache = CompileCache(args.cache_dir)
+        cached = cache.get(source)
+        if cached and cached[0] is None and needs_ast:
+            cached = None
+    if cached:
+        if verbose:
+            print "using cached compile", u'\u2713'
+        ast, symtab, code, diagnostics, fragments = cached
+        seed_fragments(args.source, fragments, cache)
+    elif cache and not needs_ast:
+        # Only the blocks that changed since the last build of this file
+        # are parsed and generated; see incremental.py.
+        code, compiler = compile_incremental(args.source, source, cache)
+        diagnostics = compiler.diagnostics
+        try:
+            cache.put(source, None, None, code, diagnostics,
+                      compiler.fragments)
+        except (IOError, OSError):
+            if verbose:
+                print "(could not write to the compile cache)"
+    else:
+        ast, symtab = parse(source)
     if args.tree:
         print "\n------------------- AST ---------------------"
         print_tree(ast, 0)
@@ -124,8 +320,39 @@ def main():
         print_symtab(symtab)
         print "------------------- /Symtab ---------------------\n"
 
-    if not args.inert:
-        generate_code(ast, symtab, outputfile)
+    if args.pyc or args.run:
+        # Bytecode is built from the AST, not from generated source.
+        if not args.inert:
+            code = compile_code(ast, symtab, args.source, args.keep_all)
+            if args.pyc:
+                write_pyc(outputfile, code)
+            if args.run:
+                if verbose:
+                    print "Your game is starting. Have fun!\n"
+                astgen.run(code)
+                return
+    elif args.package:
+        # The package is generated from the AST, as the cached code is a
+        # single file.
+        if not args.inert:
+            package_code(ast, symtab, outputfile, args.keep_all)
+    elif not args.inert:
+        if code is None and cache is None:
+            # Without a cache to keep it for, the code goes straight to the
+            # output file as it is generated.
+            stream_code(ast, symtab, outputfile, args.keep_all)
+        else:
+            if code is None:
+                code, diagnostics = generate_code(ast, symtab,
+                                                  args.keep_all)
+                try:
+                    cache.put(source, ast, symtab, code, diagnostics)
+                except (IOError, OSError):
+                    if verbose:
+                        print "(could not write to the compile cache)"
+            elif cached:
+                diagnostics.report()
+            write(outputfile, code)
     if verbose:
         print "Your game is ready. Have fun!"
 
@@ -0,0 +1,148 @@
+
+# narratr_parsetab.py
+# This file is automatically generated. Do not edit.
+_tabversion = '3.2'
+
+_lr_method = 'LALR'
+
+_lr_signature = '\xe0\x17\t\x93\xec\t\xe7\xd5\xcaJ\xac"\x91\xf6\x804'
+    
+_lr_action_items = {'DEDENT':([2,4,12,39,89,90,99,100,114,137,143,144,146,147,148,149,176,177,185,190,197,198,200,201,206,214,217,219,220,],[-11,-8,-10,-23,-34,-29,-31,-30,-32,-33,176,-27,-112,-28,-26,-111,-9,-25,196,-24,-22,-21,-119,-116,-115,-114,-118,-113,-117,]),'NOTEQUALS':([40,42,44,45,55,58,60,61,66,70,71,72,73,75,76,80,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,166,182,],[-91,-92,-99,-101,-83,-93,-69,-86,-79,-88,-102,126,-94,-100,-90,-68,-94,-85,-84,-95,-87,-97,-89,-77,-78,-104,-96,-82,-81,-80,-98,-67,-103,]),'ELIF':([2,4,12,39,89,90,99,100,114,137,176,190,201,206,217,220,],[-11,-8,-10,-23,-34,-29,-31,-30,-32,-33,-9,-24,204,211,-118,-117,]),'LESS':([40,42,44,45,55,58,60,61,66,70,71,72,73,75,76,80,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,166,182,],[-91,-92,-99,-101,-83,-93,-69,-86,-79,-88,-102,125,-94,-100,-90,-68,-94,-85,-84,-95,-87,-97,-89,-77,-78,-104,-96,-82,-81,-80,-98,-67,-103,]),'SETUP':([2,12,33,85,],[-11,-10,86,86,]),'SCENEID':([9,13,48,151,194,],[19,22,95,180,202,]),'LCURLY':([19,24,29,34,],[28,32,-107,-108,]),'WHILE':([2,4,12,39,89,90,94,99,100,114,137,143,144,146,147,148,149,176,177,190,200,201,206,214,217,219,220,],[-11,-8,-10,-23,-34,-29,145,-31,-30,-32,-33,145,-27,-112,-28,-26,-111,-9,-25,-24,-119,-116,-115,-114,-118,-113,-117,]),'CLEANUP':([2,4,12,39,89,90,99,100,114,137,141,170,176,186,187,190,],[-11,-8,-10,-23,-34,-29,-31,-30,-32,-33,174,174,-9,-20,-19,-24,]),'TRUE':([2,4,12,32,38,39,46,50,51,53,69,74,81,82,89,90,94,99,100,108,109,110,114,115,117,118,119,120,123,124,125,126,127,128,129,131,133,137,139,143,144,145,146,147,148,149,150,160,167,173,176,177,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,45,45,-23,45,45,45,45,45,45,45,45,-34,-29,45,-31,-30,45,45,45,-32,45,45,45,45,45,45,-71,-70,-75,-72,-74,-73,45,45,-33,45,45,-27,45,-112,-28,-26,-111,45,45,-76,45,-9,-25,45,45,-24,45,45,-119,-116,45,-115,45,45,45,-114,45,-118,45,-113,-117,]),'MINUS':([2,4,12,32,38,39,40,42,44,45,46,50,51,53,55,58,60,61,66,69,70,71,73,74,75,76,81,82,89,90,92,93,94,96,99,100,108,109,110,111,112,114,115,117,118,119,120,121,123,124,125,126,127,128,129,131,133,137,139,142,143,144,145,146,147,148,149,150,153,154,155,158,160,162,163,164,165,167,173,176,177,182,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,46,46,-23,-91,-92,-99,-101,46,46,46,46,-83,-93,109,-86,-79,46,-88,-102,-94,46,-100,-90,46,46,-34,-29,-94,-85,46,-84,-31,-30,46,46,46,-95,-87,-32,46,46,46,46,46,-97,46,-71,-70,-75,-72,-74,-73,46,46,-33,46,-89,46,-27,46,-112,-28,-26,-111,46,-77,-78,-104,-96,46,-82,-81,-80,-98,-76,46,-9,-25,-103,46,46,-24,46,46,-119,-116,46,-115,46,46,46,-114,46,-118,46,-113,-117,]),'DOT':([40,42,44,45,58,61,70,71,73,75,76,92,111,112,121,142,155,158,165,182,],[-91,-92,-99,-101,-93,113,-88,-102,-94,-100,-90,-94,-95,-87,-97,-89,-104,-96,-98,-103,]),'DIVIDE':([40,42,44,45,55,58,61,66,70,71,73,75,76,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,182,],[-91,-92,-99,-101,-83,-93,-86,119,-88,-102,-94,-100,-90,-94,-85,-84,-95,-87,-97,-89,119,119,-104,-96,-82,-81,-80,-98,-103,]),'RSQUARE':([40,42,43,44,45,55,58,60,61,63,66,68,69,70,71,72,75,76,77,80,92,93,96,111,112,121,122,135,142,153,154,155,158,159,161,162,163,164,165,166,169,182,],[-91,-92,-64,-99,-101,-83,-93,-69,-86,-62,-79,-59,121,-88,-102,-66,-100,-90,-60,-68,-94,-85,-84,-95,-87,-97,165,-65,-89,-77,-78,-104,-96,-63,-58,-82,-81,-80,-98,-67,-61,-103,]),'MOVETO':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,48,-23,-34,-29,48,-31,-30,-32,-33,48,48,-27,-112,-28,-26,-111,48,-9,-25,48,-24,48,48,-119,-116,-115,48,48,-114,48,-118,48,-113,-117,]),'RCURLY':([2,4,12,32,39,47,57,83,89,90,99,100,114,137,175,176,190,196,197,198,203,],[-11,-8,-10,-9,-23,-8,101,136,-34,-29,-31,-30,-32,-33,189,-9,-24,-9,-22,-21,208,]),'RPARAN':([23,30,31,40,42,43,44,45,55,58,60,61,63,66,70,71,72,75,76,77,80,88,91,92,93,96,110,111,112,121,135,142,153,154,155,156,157,158,159,162,163,164,165,166,169,180,182,195,202,],[29,-110,34,-91,-92,-64,-99,-101,-83,-93,-69,-86,-62,-79,-88,-102,-66,-100,-90,-60,-68,-109,142,-94,-85,-84,155,-95,-87,-97,-65,-89,-77,-78,-104,182,-106,-96,-63,-82,-81,-80,-98,-67,-61,193,-103,-105,207,]),'NEWLINE':([0,2,4,8,10,11,12,15,16,17,22,28,32,33,36,37,40,41,42,43,44,45,47,49,52,54,55,56,58,60,61,62,63,65,66,67,68,70,71,72,73,74,75,76,77,78,79,80,81,84,89,90,92,93,95,96,97,98,99,100,101,106,111,112,114,121,132,134,135,136,137,139,142,153,154,155,158,159,161,162,163,164,165,166,168,169,171,173,176,182,184,186,188,189,191,192,193,196,197,199,207,208,210,213,216,218,],[2,-11,12,2,2,2,-10,2,2,2,-16,2,2,12,2,2,-91,-41,-92,-64,-99,-101,12,-43,-42,2,-83,2,-93,-69,-86,2,-62,-47,-79,-44,-59,-88,-102,-66,-94,-37,-100,-90,-60,-48,-49,-68,-39,2,12,12,-94,-85,-57,-84,-35,-36,12,12,-15,-50,-95,-87,12,-97,-38,-40,-65,-14,12,2,-89,-77,-78,-104,-96,-63,-58,-82,-81,-80,-98,-67,-45,-61,12,2,2,-103,-46,12,2,-13,2,2,-51,2,12,12,-52,-12,2,2,2,2,]),'SCENE':([0,1,2,4,7,8,10,11,12,15,16,17,18,20,21,22,25,26,27,101,136,189,208,],[-9,9,-11,-8,9,-9,-9,-9,-10,-9,-9,-9,-4,-3,-2,-16,-7,-6,-5,-15,-14,-13,-12,]),'INTEGERDIVIDE':([40,42,44,45,55,58,61,66,70,71,73,75,76,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,182,],[-91,-92,-99,-101,-83,-93,-86,118,-88,-102,-94,-100,-90,-94,-85,-84,-95,-87,-97,-89,118,118,-104,-96,-82,-81,-80,-98,-103,]),'SAY':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,51,-23,-34,-29,51,-31,-30,-32,-33,51,51,-27,-112,-28,-26,-111,51,-9,-25,51,-24,51,51,-119,-116,-115,51,51,-114,51,-118,51,-113,-117,]),'EXPOSITION':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,53,-23,-34,-29,53,-31,-30,-32,-33,53,53,-27,-112,-28,-26,-111,53,-9,-25,53,-24,53,53,-119,-116,-115,53,53,-114,53,-118,53,-113,-117,]),'ACTION':([2,4,12,39,87,89,90,99,100,114,137,138,171,172,176,190,],[-11,-8,-10,-23,140,-34,-29,-31,-30,-32,-33,140,-18,-17,-9,-24,]),'PLUS':([2,4,12,32,38,39,40,42,44,45,46,50,51,53,55,58,60,61,66,69,70,71,73,74,75,76,81,82,89,90,92,93,94,96,99,100,108,109,110,111,112,114,115,117,118,119,120,121,123,124,125,126,127,128,129,131,133,137,139,142,143,144,145,146,147,148,149,150,153,154,155,158,160,162,163,164,165,167,173,176,177,182,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,50,50,-23,-91,-92,-99,-101,50,50,50,50,-83,-93,108,-86,-79,50,-88,-102,-94,50,-100,-90,50,50,-34,-29,-94,-85,50,-84,-31,-30,50,50,50,-95,-87,-32,50,50,50,50,50,-97,50,-71,-70,-75,-72,-74,-73,50,50,-33,50,-89,50,-27,50,-112,-28,-26,-111,50,-77,-78,-104,-96,50,-82,-81,-80,-98,-76,50,-9,-25,-103,50,50,-24,50,50,-119,-116,50,-115,50,50,50,-114,50,-118,50,-113,-117,]),'MOVES':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,59,-23,-34,-29,59,-31,-30,-32,-33,59,59,-27,-112,-28,-26,-111,59,-9,-25,59,-24,59,59,-119,-116,-115,59,59,-114,59,-118,59,-113,-117,]),'$end':([2,3,4,7,8,10,11,12,15,16,17,18,20,21,22,25,26,27,101,136,189,208,],[-11,0,-8,-1,-9,-9,-9,-10,-9,-9,-9,-4,-3,-2,-16,-7,-6,-5,-15,-14,-13,-12,]),'COLON':([5,40,42,43,44,45,55,58,60,61,63,66,70,71,72,75,76,77,80,86,92,93,96,111,112,121,135,140,142,153,154,155,158,159,162,163,164,165,166,169,174,178,179,182,205,209,212,215,],[13,-91,-92,-64,-99,-101,-83,-93,-69,-86,-62,-79,-88,-102,-66,-100,-90,-60,-68,139,-94,-85,-84,-95,-87,-97,-65,173,-89,-77,-78,-104,-96,-63,-82,-81,-80,-98,-67,-61,188,191,192,-103,210,213,216,218,]),'STRING':([2,4,12,32,38,39,46,50,51,53,69,74,81,82,89,90,94,99,100,108,109,110,114,115,117,118,119,120,123,124,125,126,127,128,129,131,133,137,139,143,144,145,146,147,148,149,150,160,167,173,176,177,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,58,58,-23,58,58,58,58,58,58,58,58,-34,-29,58,-31,-30,58,58,58,-32,58,58,58,58,58,58,-71,-70,-75,-72,-74,-73,58,58,-33,58,58,-27,58,-112,-28,-26,-111,58,58,-76,58,-9,-25,58,58,-24,58,58,-119,-116,58,-115,58,58,58,-114,58,-118,58,-113,-117,]),'GOD':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,64,-23,-34,-29,64,-31,-30,-32,-33,64,64,-27,-112,-28,-26,-111,64,-9,-25,64,-24,64,64,-119,-116,-115,64,64,-114,64,-118,64,-113,-117,]),'IS':([73,116,],[131,160,]),'EQUALS':([40,42,44,45,55,58,60,61,66,70,71,72,73,75,76,80,92,93,96,111,112,121,130,142,153,154,155,158,162,163,164,165,166,182,],[-91,-92,-99,-101,-83,-93,-69,-86,-79,-88,-102,128,-94,-100,-90,-68,-94,-85,-84,-95,-87,-97,167,-89,-77,-78,-104,-96,-82,-81,-80,-98,-67,-103,]),'ELSE':([2,4,12,39,89,90,99,100,114,137,176,190,201,206,217,220,],[-11,-8,-10,-23,-34,-29,-31,-30,-32,-33,-9,-24,205,212,-118,-117,]),'START':([0,1,2,4,7,8,10,11,12,15,16,17,18,20,21,22,25,26,27,101,136,189,208,],[-9,5,-11,-8,5,-9,-9,-9,-10,-9,-9,-9,-4,-3,-2,-16,-7,-6,-5,-15,-14,-13,-12,]),'GREATEREQUALS':([40,42,44,45,55,58,60,61,66,70,71,72,73,75,76,80,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,166,182,],[-91,-92,-99,-101,-83,-93,-69,-86,-79,-88,-102,129,-94,-100,-90,-68,-94,-85,-84,-95,-87,-97,-89,-77,-78,-104,-96,-82,-81,-80,-98,-67,-103,]),'LSQUARE':([2,4,12,32,38,39,46,50,51,53,69,74,81,82,89,90,94,99,100,108,109,110,114,115,117,118,119,120,123,124,125,126,127,128,129,131,133,137,139,143,144,145,146,147,148,149,150,160,167,173,176,177,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,69,69,-23,69,69,69,69,69,69,69,69,-34,-29,69,-31,-30,69,69,69,-32,69,69,69,69,69,69,-71,-70,-75,-72,-74,-73,69,69,-33,69,69,-27,69,-112,-28,-26,-111,69,69,-76,69,-9,-25,69,69,-24,69,69,-119,-116,69,-115,69,69,69,-114,69,-118,69,-113,-117,]),'INTEGER':([2,4,12,32,38,39,46,50,51,53,69,74,81,82,89,90,94,99,100,108,109,110,114,115,117,118,119,120,123,124,125,126,127,128,129,131,133,137,139,143,144,145,146,147,148,149,150,160,167,173,176,177,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,44,44,-23,44,44,44,44,44,44,44,44,-34,-29,44,-31,-30,44,44,44,-32,44,44,44,44,44,44,-71,-70,-75,-72,-74,-73,44,44,-33,44,44,-27,44,-112,-28,-26,-111,44,44,-76,44,-9,-25,44,44,-24,44,44,-119,-116,44,-115,44,44,44,-114,44,-118,44,-113,-117,]),'INDENT':([2,12,33,47,171,186,197,199,],[-11,-10,85,94,94,94,94,94,]),'TIMES':([40,42,44,45,55,58,61,66,70,71,73,75,76,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,182,],[-91,-92,-99,-101,-83,-93,-86,120,-88,-102,-94,-100,-90,-94,-85,-84,-95,-87,-97,-89,120,120,-104,-96,-82,-81,-80,-98,-103,]),'ID':([2,4,6,12,23,32,35,38,39,46,50,51,53,64,69,74,81,82,89,90,94,99,100,108,109,110,113,114,115,117,118,119,120,123,124,125,126,127,128,129,131,133,137,139,143,144,145,146,147,148,149,150,160,167,173,176,177,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,14,-10,30,73,88,92,-23,92,92,92,92,116,92,92,92,92,-34,-29,73,-31,-30,92,92,92,158,-32,92,92,92,92,92,92,-71,-70,-75,-72,-74,-73,92,92,-33,73,73,-27,92,-112,-28,-26,-111,92,92,-76,73,-9,-25,92,73,-24,73,73,-119,-116,92,-115,73,92,73,-114,73,-118,73,-113,-117,]),'IF':([2,4,12,39,89,90,94,99,100,114,137,143,144,146,147,148,149,176,177,190,200,201,206,214,217,219,220,],[-11,-8,-10,-23,-34,-29,150,-31,-30,-32,-33,150,-27,-112,-28,-26,-111,-9,-25,-24,-119,-116,-115,-114,-118,-113,-117,]),'AND':([40,42,43,44,45,55,58,60,61,63,66,70,71,72,73,75,76,80,92,93,96,111,112,121,135,142,153,154,155,158,159,162,163,164,165,166,169,182,],[-91,-92,-64,-99,-101,-83,-93,-69,-86,115,-79,-88,-102,-66,-94,-100,-90,-68,-94,-85,-84,-95,-87,-97,-65,-89,-77,-78,-104,-96,-63,-82,-81,-80,-98,-67,115,-103,]),'DOWN':([59,152,],[102,102,]),'LPARAN':([2,4,12,14,32,38,39,40,42,44,45,46,50,51,53,58,61,69,70,71,73,74,75,76,81,82,89,90,92,94,99,100,102,103,104,105,107,108,109,110,111,112,114,115,117,118,119,120,121,123,124,125,126,127,128,129,131,133,137,139,142,143,144,145,146,147,148,149,150,155,158,160,165,167,173,176,177,181,182,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,23,38,38,-23,-91,-92,-99,-101,38,38,38,38,-93,110,38,-88,-102,-94,38,-100,-90,38,38,-34,-29,-94,38,-31,-30,-56,-54,151,-55,-53,38,38,38,-95,-87,-32,38,38,38,38,38,-97,38,-71,-70,-75,-72,-74,-73,38,38,-33,38,-89,38,-27,38,-112,-28,-26,-111,38,-104,-96,38,-98,-76,38,-9,-25,194,-103,38,38,-24,38,38,-119,-116,38,-115,38,38,38,-114,38,-118,38,-113,-117,]),'RIGHT':([59,152,],[103,103,]),'FALSE':([2,4,12,32,38,39,46,50,51,53,69,74,81,82,89,90,94,99,100,108,109,110,114,115,117,118,119,120,123,124,125,126,127,128,129,131,133,137,139,143,144,145,146,147,148,149,150,160,167,173,176,177,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,71,71,-23,71,71,71,71,71,71,71,71,-34,-29,71,-31,-30,71,71,71,-32,71,71,71,71,71,71,-71,-70,-75,-72,-74,-73,71,71,-33,71,71,-27,71,-112,-28,-26,-111,71,71,-76,71,-9,-25,71,71,-24,71,71,-119,-116,71,-115,71,71,71,-114,71,-118,71,-113,-117,]),'GREATER':([40,42,44,45,55,58,60,61,66,70,71,72,73,75,76,80,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,166,182,],[-91,-92,-99,-101,-83,-93,-69,-86,-79,-88,-102,124,-94,-100,-90,-68,-94,-85,-84,-95,-87,-97,-89,-77,-78,-104,-96,-82,-81,-80,-98,-67,-103,]),'WIN':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,74,-23,-34,-29,74,-31,-30,-32,-33,74,74,-27,-112,-28,-26,-111,74,-9,-25,74,-24,74,74,-119,-116,-115,74,74,-114,74,-118,74,-113,-117,]),'LESSEQUALS':([40,42,44,45,55,58,60,61,66,70,71,72,73,75,76,80,92,93,96,111,112,121,142,153,154,155,158,162,163,164,165,166,182,],[-91,-92,-99,-101,-83,-93,-69,-86,-79,-88,-102,127,-94,-100,-90,-68,-94,-85,-84,-95,-87,-97,-89,-77,-78,-104,-96,-82,-81,-80,-98,-67,-103,]),'FLOAT':([2,4,12,32,38,39,46,50,51,53,69,74,81,82,89,90,94,99,100,108,109,110,114,115,117,118,119,120,123,124,125,126,127,128,129,131,133,137,139,143,144,145,146,147,148,149,150,160,167,173,176,177,183,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,75,75,-23,75,75,75,75,75,75,75,75,-34,-29,75,-31,-30,75,75,75,-32,75,75,75,75,75,75,-71,-70,-75,-72,-74,-73,75,75,-33,75,75,-27,75,-112,-28,-26,-111,75,75,-76,75,-9,-25,75,75,-24,75,75,-119,-116,75,-115,75,75,75,-114,75,-118,75,-113,-117,]),'UP':([59,152,],[105,105,]),'BREAK':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,78,-23,-34,-29,78,-31,-30,-32,-33,78,78,-27,-112,-28,-26,-111,78,-9,-25,78,-24,78,78,-119,-116,-115,78,78,-114,78,-118,78,-113,-117,]),'ITEM':([0,1,2,4,7,8,10,11,12,15,16,17,18,20,21,22,25,26,27,101,136,189,208,],[-9,6,-11,-8,6,-9,-9,-9,-10,-9,-9,-9,-4,-3,-2,-16,-7,-6,-5,-15,-14,-13,-12,]),'CONTINUE':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,79,-23,-34,-29,79,-31,-30,-32,-33,79,79,-27,-112,-28,-26,-111,79,-9,-25,79,-24,79,79,-119,-116,-115,79,79,-114,79,-118,79,-113,-117,]),'LOSE':([2,4,12,32,39,89,90,94,99,100,114,137,139,143,144,146,147,148,149,173,176,177,188,190,191,192,200,201,206,210,213,214,216,217,218,219,220,],[-11,-8,-10,81,-23,-34,-29,81,-31,-30,-32,-33,81,81,-27,-112,-28,-26,-111,81,-9,-25,81,-24,81,81,-119,-116,-115,81,81,-114,81,-118,81,-113,-117,]),'NOT':([2,4,12,32,38,39,40,42,44,45,51,53,55,58,60,61,66,69,70,71,72,73,74,75,76,80,81,82,89,90,92,93,94,96,99,100,111,112,114,115,117,121,131,133,137,139,142,143,144,145,146,147,148,149,150,153,154,155,158,160,162,163,164,165,166,173,176,177,182,188,190,191,192,200,201,204,206,210,211,213,214,216,217,218,219,220,],[-11,-8,-10,82,82,-23,-91,-92,-99,-101,82,82,-83,-93,-69,-86,-79,82,-88,-102,130,-94,82,-100,-90,-68,82,82,-34,-29,-94,-85,82,-84,-31,-30,-95,-87,-32,82,82,-97,82,82,-33,82,-89,82,-27,82,-112,-28,-26,-111,82,-77,-78,-104,-96,82,-82,-81,-80,-98,-67,82,-9,-25,-103,82,-24,82,82,-119,-116,82,-115,82,82,82,-114,82,-118,82,-113,-117,]),'COMMA':([30,31,40,42,43,44,45,55,58,60,61,63,65,66,68,70,71,72,73,75,76,77,80,88,92,93,96,97,98,106,111,112,121,122,132,134,135,142,153,154,155,156,157,158,159,161,162,163,164,165,166,168,169,182,184,193,195,207,],[-110,35,-91,-92,-64,-99,-101,-83,-93,-69,-86,-62,117,-79,-59,-88,-102,-66,-94,-100,-90,-60,-68,-109,-94,-85,-84,117,117,152,-95,-87,-97,117,117,117,-65,-89,-77,-78,-104,183,-106,-96,-63,-58,-82,-81,-80,-98,-67,117,-61,-103,117,-51,-105,-52,]),'OR':([40,42,43,44,45,55,58,60,61,63,66,70,71,72,73,75,76,77,80,92,93,96,111,112,121,135,142,153,154,155,158,159,162,163,164,165,166,169,182,],[-91,-92,-64,-99,-101,-83,-93,-69,-86,-62,-79,-88,-102,-66,-94,-100,-90,133,-68,-94,-85,-84,-95,-87,-97,-65,-89,-77,-78,-104,-96,-63,-82,-81,-80,-98,-67,-61,-103,]),'LEFT':([59,152,],[107,107,]),}
+
+_lr_action = { }
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = { }
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expression_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[36,36,36,36,36,36,36,36,36,36,36,36,]),'program':([0,],[3,]),'statements':([94,],[143,]),'start_state':([1,7,],[8,15,]),'say_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[37,37,37,37,37,37,37,37,37,37,37,37,]),'simple_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[39,144,39,144,39,39,39,39,39,39,39,39,]),'number':([32,38,46,50,51,53,69,74,81,82,94,108,109,110,115,117,118,119,120,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,]),'break_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[41,41,41,41,41,41,41,41,41,41,41,41,]),'boolean':([32,38,46,50,51,53,69,74,81,82,94,108,109,110,115,117,118,119,120,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'not_test':([32,38,51,53,69,74,81,82,94,115,117,131,133,139,143,145,150,160,173,188,191,192,204,210,211,213,216,218,],[43,43,43,43,43,43,43,135,43,159,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'setup_block':([33,85,],[87,138,]),'scene_block':([1,7,],[11,17,]),'newlines':([0,8,10,11,15,16,17,28,32,36,37,54,56,62,84,139,173,176,188,191,192,196,210,213,216,218,],[4,4,4,4,4,4,4,33,47,89,90,99,100,114,137,171,186,4,197,199,199,4,199,199,199,199,]),'elif_statements':([201,],[206,]),'fparams':([23,],[31,]),'while_statement':([94,143,],[146,146,]),'block_statement':([94,143,],[147,147,]),'item_block':([1,7,],[10,16,]),'moves_declaration':([32,94,139,143,173,188,191,192,210,213,216,218,],[49,49,49,49,49,49,49,49,49,49,49,49,]),'continue_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[52,52,52,52,52,52,52,52,52,52,52,52,]),'win_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[54,54,54,54,54,54,54,54,54,54,54,54,]),'statement':([94,143,],[148,177,]),'factor':([32,38,46,50,51,53,69,74,81,82,94,108,109,110,115,117,118,119,120,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[55,55,93,96,55,55,55,55,55,55,55,55,55,55,55,55,162,163,164,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,]),'exposition_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[56,56,56,56,56,56,56,56,56,56,56,56,]),'suite':([32,139,173,188,191,192,210,213,216,218,],[57,172,187,198,200,201,214,217,219,220,]),'if_statement':([94,143,],[149,149,]),'action_block':([87,138,],[141,170,]),'arithmetic_expression':([32,38,51,53,69,74,81,82,94,110,115,117,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,]),'direction':([59,152,],[104,181,]),'blocks':([1,],[7,]),'power':([32,38,46,50,51,53,69,74,81,82,94,108,109,110,115,117,118,119,120,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,]),'lose_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[62,62,62,62,62,62,62,62,62,62,62,62,]),'args':([110,],[156,]),'testlist':([32,51,53,69,74,81,94,131,139,143,160,173,188,191,192,210,213,216,218,],[65,97,98,122,132,134,65,168,65,65,184,65,65,65,65,65,65,65,65,]),'comparison_op':([72,],[123,]),'and_test':([32,38,51,53,69,74,81,94,117,131,133,139,143,145,150,160,173,188,191,192,204,210,211,213,216,218,],[63,63,63,63,63,63,63,63,63,63,169,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,]),'moveto_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[67,67,67,67,67,67,67,67,67,67,67,67,]),'test':([32,38,51,53,69,74,81,94,117,131,139,143,145,150,160,173,188,191,192,204,210,211,213,216,218,],[68,91,68,68,68,68,68,68,161,68,68,68,178,179,68,68,68,68,68,209,68,215,68,68,68,]),'itemparams':([14,],[24,]),'atom':([32,38,46,50,51,53,69,74,81,82,94,108,109,110,115,117,118,119,120,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,]),'cleanup_block':([141,170,],[175,185,]),'comparison':([32,38,51,53,69,74,81,82,94,115,117,131,133,139,143,145,150,160,173,188,191,192,204,210,211,213,216,218,],[72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,]),'term':([32,38,51,53,69,74,81,82,94,108,109,110,115,117,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[66,66,66,66,66,66,66,66,66,153,154,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,]),'expression':([32,38,51,53,69,74,81,82,94,110,115,117,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[80,80,80,80,80,80,80,80,80,157,80,80,166,80,80,80,80,80,80,80,80,195,80,80,80,80,80,80,80,80,80,]),'list':([32,38,46,50,51,53,69,74,81,82,94,108,109,110,115,117,118,119,120,123,131,133,139,143,145,150,160,173,183,188,191,192,204,210,211,213,216,218,],[76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,]),'or_test':([32,38,51,53,69,74,81,94,117,131,139,143,145,150,160,173,188,191,192,204,210,211,213,216,218,],[77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,]),'calllist':([61,],[111,]),'directionlist':([59,],[106,]),'newlines_optional':([0,8,10,11,15,16,17,32,176,196,],[1,18,20,21,25,26,27,83,190,203,]),'flow_statement':([32,94,139,143,173,188,191,192,210,213,216,218,],[84,84,84,84,84,84,84,84,84,84,84,84,]),'trailer':([61,],[112,]),}
+
+_lr_goto = { }
+for _k, _v in _lr_goto_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = { }
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> newlines_optional blocks','program',2,'p_program','/root/package/parser.py',71),
+  ('blocks -> scene_block newlines_optional','blocks',2,'p_blocks','/root/package/parser.py',78),
+  ('blocks -> item_block newlines_optional','blocks',2,'p_blocks','/root/package/parser.py',79),
+  ('blocks -> start_state newlines_optional','blocks',2,'p_blocks','/root/package/parser.py',80),
+  ('blocks -> blocks scene_block newlines_optional','blocks',3,'p_blocks','/root/package/parser.py',81),
+  ('blocks -> blocks item_block newlines_optional','blocks',3,'p_blocks','/root/package/parser.py',82),
+  ('blocks -> blocks start_state newlines_optional','blocks',3,'p_blocks','/root/package/parser.py',83),
+  ('newlines_optional -> newlines','newlines_optional',1,'p_newlines_optional','/root/package/parser.py',127),
+  ('newlines_optional -> <empty>','newlines_optional',0,'p_newlines_optional','/root/package/parser.py',128),
+  ('newlines -> newlines NEWLINE','newlines',2,'p_newlines','/root/package/parser.py',132),
+  ('newlines -> NEWLINE','newlines',1,'p_newlines','/root/package/parser.py',133),
+  ('scene_block -> SCENE SCENEID LCURLY newlines INDENT setup_block action_block cleanup_block DEDENT newlines_optional RCURLY','scene_block',11,'p_scene_block','/root/package/parser.py',140),
+  ('scene_block -> SCENE SCENEID LCURLY newlines setup_block action_block cleanup_block RCURLY','scene_block',8,'p_scene_block','/root/package/parser.py',141),
+  ('item_block -> ITEM ID itemparams LCURLY newlines_optional RCURLY','item_block',6,'p_item_block','/root/package/parser.py',164),
+  ('item_block -> ITEM ID itemparams LCURLY suite RCURLY','item_block',6,'p_item_block','/root/package/parser.py',165),
+  ('start_state -> START COLON SCENEID','start_state',3,'p_start_state','/root/package/parser.py',180),
+  ('setup_block -> SETUP COLON suite','setup_block',3,'p_setup_block','/root/package/parser.py',184),
+  ('setup_block -> SETUP COLON newlines','setup_block',3,'p_setup_block','/root/package/parser.py',185),
+  ('action_block -> ACTION COLON suite','action_block',3,'p_action_block','/root/package/parser.py',192),
+  ('action_block -> ACTION COLON newlines','action_block',3,'p_action_block','/root/package/parser.py',193),
+  ('cleanup_block -> CLEANUP COLON suite','cleanup_block',3,'p_cleanup_block','/root/package/parser.py',200),
+  ('cleanup_block -> CLEANUP COLON newlines','cleanup_block',3,'p_cleanup_block','/root/package/parser.py',201),
+  ('suite -> simple_statement','suite',1,'p_suite','/root/package/parser.py',211),
+  ('suite -> newlines INDENT statements DEDENT newlines_optional','suite',5,'p_suite','/root/package/parser.py',212),
+  ('statements -> statements statement','statements',2,'p_statements','/root/package/parser.py',222),
+  ('statements -> statement','statements',1,'p_statements','/root/package/parser.py',223),
+  ('statement -> simple_statement','statement',1,'p_statement','/root/package/parser.py',231),
+  ('statement -> block_statement','statement',1,'p_statement','/root/package/parser.py',232),
+  ('simple_statement -> say_statement newlines','simple_statement',2,'p_simple_statement','/root/package/parser.py',243),
+  ('simple_statement -> exposition_statement newlines','simple_statement',2,'p_simple_statement','/root/package/parser.py',244),
+  ('simple_statement -> win_statement newlines','simple_statement',2,'p_simple_statement','/root/package/parser.py',245),
+  ('simple_statement -> lose_statement newlines','simple_statement',2,'p_simple_statement','/root/package/parser.py',246),
+  ('simple_statement -> flow_statement newlines','simple_statement',2,'p_simple_statement','/root/package/parser.py',247),
+  ('simple_statement -> expression_statement newlines','simple_statement',2,'p_simple_statement','/root/package/parser.py',248),
+  ('say_statement -> SAY testlist','say_statement',2,'p_say_statement','/root/package/parser.py',267),
+  ('exposition_statement -> EXPOSITION testlist','exposition_statement',2,'p_exposition_statement','/root/package/parser.py',271),
+  ('win_statement -> WIN','win_statement',1,'p_win_statement','/root/package/parser.py',276),
+  ('win_statement -> WIN testlist','win_statement',2,'p_win_statement','/root/package/parser.py',277),
+  ('lose_statement -> LOSE','lose_statement',1,'p_lose_statement','/root/package/parser.py',286),
+  ('lose_statement -> LOSE testlist','lose_statement',2,'p_lose_statement','/root/package/parser.py',287),
+  ('flow_statement -> break_statement','flow_statement',1,'p_flow_statement','/root/package/parser.py',301),
+  ('flow_statement -> continue_statement','flow_statement',1,'p_flow_statement','/root/package/parser.py',302),
+  ('flow_statement -> moves_declaration','flow_statement',1,'p_flow_statement','/root/package/parser.py',303),
+  ('flow_statement -> moveto_statement','flow_statement',1,'p_flow_statement','/root/package/parser.py',304),
+  ('expression_statement -> ID IS testlist','expression_statement',3,'p_expression_statement','/root/package/parser.py',321),
+  ('expression_statement -> GOD ID IS testlist','expression_statement',4,'p_expression_statement','/root/package/parser.py',322),
+  ('expression_statement -> testlist','expression_statement',1,'p_expression_statement','/root/package/parser.py',323),
+  ('break_statement -> BREAK','break_statement',1,'p_break_statement','/root/package/parser.py',335),
+  ('continue_statement -> CONTINUE','continue_statement',1,'p_continue_statement','/root/package/parser.py',339),
+  ('moves_declaration -> MOVES directionlist','moves_declaration',2,'p_moves_declaration','/root/package/parser.py',343),
+  ('directionlist -> direction LPARAN SCENEID RPARAN','directionlist',4,'p_directionlist','/root/package/parser.py',352),
+  ('directionlist -> directionlist COMMA direction LPARAN SCENEID RPARAN','directionlist',6,'p_directionlist','/root/package/parser.py',353),
+  ('direction -> LEFT','direction',1,'p_direction','/root/package/parser.py',365),
+  ('direction -> RIGHT','direction',1,'p_direction','/root/package/parser.py',366),
+  ('direction -> UP','direction',1,'p_direction','/root/package/parser.py',367),
+  ('direction -> DOWN','direction',1,'p_direction','/root/package/parser.py',368),
+  ('moveto_statement -> MOVETO SCENEID','moveto_statement',2,'p_moveto_statement','/root/package/parser.py',372),
+  ('testlist -> testlist COMMA test','testlist',3,'p_testlist','/root/package/parser.py',381),
+  ('testlist -> test','testlist',1,'p_testlist','/root/package/parser.py',382),
+  ('test -> or_test','test',1,'p_test','/root/package/parser.py',393),
+  ('or_test -> or_test OR and_test','or_test',3,'p_or_test','/root/package/parser.py',397),
+  ('or_test -> and_test','or_test',1,'p_or_test','/root/package/parser.py',398),
+  ('and_test -> and_test AND not_test','and_test',3,'p_and_test','/root/package/parser.py',406),
+  ('and_test -> not_test','and_test',1,'p_and_test','/root/package/parser.py',407),
+  ('not_test -> NOT not_test','not_test',2,'p_not_test','/root/package/parser.py',415),
+  ('not_test -> comparison','not_test',1,'p_not_test','/root/package/parser.py',416),
+  ('comparison -> comparison comparison_op expression','comparison',3,'p_comparison','/root/package/parser.py',426),
+  ('comparison -> expression','comparison',1,'p_comparison','/root/package/parser.py',427),
+  ('expression -> arithmetic_expression','expression',1,'p_expression','/root/package/parser.py',437),
+  ('comparison_op -> LESS','comparison_op',1,'p_comparison_op','/root/package/parser.py',441),
+  ('comparison_op -> GREATER','comparison_op',1,'p_comparison_op','/root/package/parser.py',442),
+  ('comparison_op -> LESSEQUALS','comparison_op',1,'p_comparison_op','/root/package/parser.py',443),
+  ('comparison_op -> GREATEREQUALS','comparison_op',1,'p_comparison_op','/root/package/parser.py',444),
+  ('comparison_op -> EQUALS','comparison_op',1,'p_comparison_op','/root/package/parser.py',445),
+  ('comparison_op -> NOTEQUALS','comparison_op',1,'p_comparison_op','/root/package/parser.py',446),
+  ('comparison_op -> NOT EQUALS','comparison_op',2,'p_comparison_op','/root/package/parser.py',447),
+  ('arithmetic_expression -> arithmetic_expression PLUS term','arithmetic_expression',3,'p_arithmetic_expression','/root/package/parser.py',457),
+  ('arithmetic_expression -> arithmetic_expression MINUS term','arithmetic_expression',3,'p_arithmetic_expression','/root/package/parser.py',458),
+  ('arithmetic_expression -> term','arithmetic_expression',1,'p_arithmetic_expression','/root/package/parser.py',459),
+  ('term -> term TIMES factor','term',3,'p_term','/root/package/parser.py',481),
+  ('term -> term DIVIDE factor','term',3,'p_term','/root/package/parser.py',482),
+  ('term -> term INTEGERDIVIDE factor','term',3,'p_term','/root/package/parser.py',483),
+  ('term -> factor','term',1,'p_term','/root/package/parser.py',484),
+  ('factor -> PLUS factor','factor',2,'p_factor','/root/package/parser.py',501),
+  ('factor -> MINUS factor','factor',2,'p_factor','/root/package/parser.py',502),
+  ('factor -> power','factor',1,'p_factor','/root/package/parser.py',503),
+  ('power -> power trailer','power',2,'p_power','/root/package/parser.py',512),
+  ('power -> atom','power',1,'p_power','/root/package/parser.py',513),
+  ('atom -> LPARAN test RPARAN','atom',3,'p_atom_node','/root/package/parser.py',523),
+  ('atom -> list','atom',1,'p_atom_node','/root/package/parser.py',524),
+  ('atom -> number','atom',1,'p_atom_node','/root/package/parser.py',525),
+  ('atom -> boolean','atom',1,'p_atom_node','/root/package/parser.py',526),
+  ('atom -> STRING','atom',1,'p_atom_string','/root/package/parser.py',535),
+  ('atom -> ID','atom',1,'p_atom_id','/root/package/parser.py',539),
+  ('trailer -> calllist','trailer',1,'p_trailer','/root/package/parser.py',546),
+  ('trailer -> DOT ID','trailer',2,'p_trailer','/root/package/parser.py',547),
+  ('list -> LSQUARE RSQUARE','list',2,'p_list','/root/package/parser.py',554),
+  ('list -> LSQUARE testlist RSQUARE','list',3,'p_list','/root/package/parser.py',555),
+  ('number -> INTEGER','number',1,'p_number_int','/root/package/parser.py',562),
+  ('number -> FLOAT','number',1,'p_number_float','/root/package/parser.py',566),
+  ('boolean -> TRUE','boolean',1,'p_boolean','/root/package/parser.py',570),
+  ('boolean -> FALSE','boolean',1,'p_boolean','/root/package/parser.py',571),
+  ('calllist -> LPARAN args RPARAN','calllist',3,'p_calllist','/root/package/parser.py',575),
+  ('calllist -> LPARAN RPARAN','calllist',2,'p_calllist','/root/package/parser.py',576),
+  ('args -> args COMMA expression','args',3,'p_args','/root/package/parser.py',583),
+  ('args -> expression','args',1,'p_args','/root/package/parser.py',584),
+  ('itemparams -> LPARAN RPARAN','itemparams',2,'p_itemparams','/root/package/parser.py',594),
+  ('itemparams -> LPARAN fparams RPARAN','itemparams',3,'p_itemparams','/root/package/parser.py',595),
+  ('fparams -> fparams COMMA ID','fparams',3,'p_fparams','/root/package/parser.py',603),
+  ('fparams -> ID','fparams',1,'p_fparams','/root/package/parser.py',604),
+  ('block_statement -> if_statement','block_statement',1,'p_block_statement','/root/package/parser.py',617),
+  ('block_statement -> while_statement','block_statement',1,'p_block_statement','/root/package/parser.py',618),
+  ('if_statement -> IF test COLON suite elif_statements ELSE COLON suite','if_statement',8,'p_if_statement','/root/package/parser.py',631),
+  ('if_statement -> IF test COLON suite ELSE COLON suite','if_statement',7,'p_if_statement','/root/package/parser.py',632),
+  ('if_statement -> IF test COLON suite elif_statements','if_statement',5,'p_if_statement','/root/package/parser.py',633),
+  ('if_statement -> IF test COLON suite','if_statement',4,'p_if_statement','/root/package/parser.py',634),
+  ('elif_statements -> elif_statements ELIF test COLON suite','elif_statements',5,'p_elif_statements','/root/package/parser.py',651),
+  ('elif_statements -> ELIF test COLON suite','elif_statements',4,'p_elif_statements','/root/package/parser.py',652),
+  ('while_statement -> WHILE test COLON suite','while_statement',4,'p_while_statement','/root/package/parser.py',664),
+]
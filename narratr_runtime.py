@@ -0,0 +1,192 @@
+# -----------------------------------------------------------------------------
+# narrtr: narratr_runtime.py
+# This file is the runtime that every generated narratr game imports.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""The parts of a narratr game that are the same in every game.
+
+A generated game imports what it needs from here: the Scene base class of
+its scenes, the Scenes that makes them, the pocket class and _unset. The
+compiler puts a copy of this file next to each game it writes (see
+codegen.install_runtime()), so python compiles it to bytecode once and every
+game in that directory shares it."""
+
+from sys import exit
+
+# The value of a god variable that hasn't been declared yet.
+_unset = object()
+
+
+# ABOUT THE POCKET CLASS: here we define the pocket class. Each game makes
+# its own instance, so that games run one after another in the same process
+# don't share a pocket. The methods are fairly self explanatory.
+class pocket_class:
+    def __init__(self):
+        self.data = {}
+
+    def add(self, key, val, verbose=True):
+        if self.data.get(key, None):
+            print " ** '" + key + "' is already in your pocket. **"
+        else:
+            self.data[key] = val
+            if verbose:
+                print " ** '" + key + "' is now in your pocket. **"
+
+    def update(self, key, val):
+        self.data[key] = val
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def remove(self, key):
+        del self.data[key]
+
+    def has(self, key):
+        if self.data.get(key, None):
+            return True
+        return False
+
+
+# ABOUT THE RESPONSE CODE: the default response code, which is dropped
+# into a function called get_response(), waits for user input. When it
+# it receives this input, it strips the case (i.e. everything is made
+# lower case), removes all punctuation except double quotes (to allow
+# the programmer to add conversational capabilities), converts all
+# whitespace characters into a single space, and then checks for specific
+# situations we agree with the programmer to handle by default. The first
+# two happen in a single translate() through a table built once, and the
+# input is split into words once; the result is a command_class, which is
+# the normalized string (so action blocks can compare response to one) with
+# its first word as verb, the rest as args, and the input as typed as raw.
+# 'exit' will terminate the game (there is no current way to save game
+# state), and "move" followed by a single word will check the dictionary of
+# directions (which it takes as an argument) for an applicable direction.
+# The dictionary maps each direction to the ID of the scene it leads to.
+# If it does not appear in the dictionary, an error is reported so the user
+# is not confused.  If it does appear, it wraps the next scene's ID in a
+# list so that it can easily be identified by the caller function, which
+# will return that scene's setup method (without calling it). This is a
+# centerpiece of our approach to avoiding an overflow of activation
+# records in large games.
+class command_class(str):
+    lower = "".join(map(chr, range(256))).lower()
+    punctuation = "!#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
+
+    def __new__(cls, raw):
+        words = raw.translate(cls.lower, cls.punctuation).split()
+        self = str.__new__(cls, " ".join(words))
+        self.raw = raw
+        self.verb = words[0] if words else ""
+        self.args = words[1:]
+        return self
+
+
+def get_response(direction):
+    response = command_class(raw_input(" -->> "))
+    if response == "exit":
+        print "== GAME TERMINATED =="
+        exit(0)
+    elif response.verb == "move" and len(response.args) == 1:
+        if response.args[0] in direction:
+            return [direction[response.args[0]]]
+        else:
+            print "\"" + response.args[0] + "\" is not a "\
+                + "valid direction from this scene."
+    else:
+        return response
+
+
+class Scenes(dict):
+    """The scenes of a game, by scene ID, each made when it is first entered.
+
+    classes maps the name of each scene's class (s_ and its ID) to the
+    class, as a game's globals() do (or a SceneModules does, for a game
+    written as a package). A game makes its Scenes at start-up, but no
+    scene until the player first goes to it, so starting a game costs the
+    same however many scenes it has, and the scenes the player never visits
+    are never made. Once made, a scene is kept, so its god variables last
+    from one visit to the next.
+
+    A scene whose moves are the same every time it is entered has them
+    worked out at compile time, as a class-level table from direction to
+    scene ID (see codegen._static_moves()), and that table is its
+    _directions from the start. Scenes whose moves depend on the game have
+    Scene's empty table, and set their _directions when their moves
+    declaration runs."""
+    def __init__(self, classes):
+        dict.__init__(self)
+        self.classes = classes
+
+    def __missing__(self, sid):
+        scene = self.classes["s_" + str(sid)]()
+        scene._scenes = self
+        scene._directions = scene.moves
+        self[sid] = scene
+        return scene
+
+
+class SceneModules(object):
+    """The scene classes of a game written as a package (see package.py).
+
+    Each scene's class is in a module of its own, named after the class,
+    which is only imported the first time the scene is needed, so a game
+    starts without loading any of its scenes, and only holds the ones the
+    player has been to. globals are those of the game's entry module, which
+    the modules are imported relative to."""
+    def __init__(self, globals):
+        self.globals = globals
+
+    def __getitem__(self, name):
+        return getattr(__import__(name, self.globals), name)
+
+
+class Scene(object):
+    """The base class of every scene in a game.
+
+    A scene's class only holds the code of its own blocks: setup() runs its
+    setup block and then action(), respond() runs its action block for one
+    response, and cleanup() runs its cleanup block. A scene with no code
+    for a block uses the method here, which just moves on to action() for
+    setup() and does nothing for the others.
+
+    action() is the loop every action block runs in. It asks for responses
+    until one moves the player, or respond() returns the setup method of
+    the scene to move to (as a moveto does); either way, it returns that
+    method. Returning rather than calling it keeps the stack from growing
+    however many moves are made (see the main loop of a generated game).
+    A scene finds the others in _scenes, the Scenes that made it, and keeps
+    the directions it can be left by in _directions. The names of the
+    variables a scene adds all have a prefix (see
+    codegen._place_variables()), so none of them can take the place of
+    these."""
+    __slots__ = ("_directions", "_scenes")
+    moves = {}
+
+    def setup(self):
+        return self.action()
+
+    def action(self):
+        respond = self.respond
+        while True:
+            response = get_response(self._directions)
+            if isinstance(response, list):
+                self.cleanup()
+                return self._scenes[response[0]].setup
+            next = respond(response)
+            if next is not None:
+                return next
+
+    def respond(self, response):
+        pass
+
+    def cleanup(self):
+        pass
@@ -16,9 +16,37 @@
 # -----------------------------------------------------------------------------
 
 
-# Class for nodes in the narratr AST.
-class Node:
-    def __init__(self, v, t, c=[], v_type=None, lineno=0, key=None):
+# Leaf nodes all share this empty tuple as their children, instead of each
+# allocating (or, as with a mutable default, sharing) an empty list.
+_NO_CHILDREN = ()
+
+# Named accessors for the children of particular node types. For a node of
+# one of these types, node.<name> is its child at the given position (None
+# if there isn't one), or for a slice, the list of children in it. The
+# blocks node keeps its scenes and items in dicts keyed by scene ID and item
+# name, followed by any start states.
+ACCESSORS = {
+    "program": {"blocks": 0},
+    "blocks": {"scenes": 0, "items": 1, "start_states": slice(2, None)},
+    "scene_block": {"setup": 0, "action": 1, "cleanup": 2},
+    "item_block": {"params": 0, "suite": 1},
+    "setup_block": {"suite": 0},
+    "action_block": {"suite": 0},
+    "cleanup_block": {"suite": 0},
+    "if_statement": {"test": 0, "suite": 1, "elifs": 2, "orelse": 3},
+    "elif_statement": {"test": 0, "suite": 1},
+    "while_statement": {"test": 0, "suite": 1},
+    "moves_declaration": {"directions": 0},
+}
+
+
+# Class for nodes in the narratr AST. An AST for a large story has hundreds
+# of thousands of these, so they have slots rather than a __dict__, and
+# their type strings are interned so that every node of a type shares one.
+class Node(object):
+    __slots__ = ("value", "type", "children", "v_type", "lineno", "key")
+
+    def __init__(self, v, t, c=None, v_type=None, lineno=0, key=None):
         """Create node for narratr AST.
 
         Constructor takes:
@@ -32,17 +60,42 @@ class Node:
                   optional, but include for all new nodes.
         """
         self.value = v
-        self.type = t
-        self.children = c
+        self.type = intern(t) if type(t) is str else t
+        self.children = c if c is not None else _NO_CHILDREN
         self.v_type = v_type
         self.lineno = lineno
         self.key = key
 
+    # This is only called for attributes that aren't slots, and looks the
+    # name up in ACCESSORS.
+    def __getattr__(self, name):
+        if name in Node.__slots__ or name.startswith("__"):
+            raise AttributeError(name)
+        index = ACCESSORS.get(self.type, {}).get(name)
+        if index is None:
+            raise AttributeError("'" + str(self.type) + "' node has no " +
+                                 "attribute '" + name + "'")
+        if type(index) is slice:
+            return self.children[index]
+        if index < len(self.children):
+            return self.children[index]
+        return None
+
+    # Nodes are pickled (for the compile cache) as a tuple of their slots.
+    def __getstate__(self):
+        return (self.value, self.type, self.children, self.v_type,
+                self.lineno, self.key)
+
+    def __setstate__(self, state):
+        (self.value, self.type, self.children, self.v_type, self.lineno,
+         self.key) = state
+
     # This method is helpful for string representations
     def __repr__(self):
         return "Node(%r, %r, %r, %r, %r, %r)" % (self.value, self.type,
-                                                 self.children, self.v_type,
-                                                 self.lineno, self.key)
+                                                 list(self.children),
+                                                 self.v_type, self.lineno,
+                                                 self.key)
 
     def is_leaf(self):
         """This method checks if a node is a leaf node."""
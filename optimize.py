@@ -0,0 +1,391 @@
+# -----------------------------------------------------------------------------
+# narrtr: optimize.py
+# This file simplifies the narratr AST before code is generated from it.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""Optimizations on the narratr AST.
+
+Constant folding: expressions made only of literals, such as 60 * 60 or
+"Hello, " + "World", are worked out at compile time and replaced in the AST
+by a single literal, so the generated code doesn't work them out every time
+it runs. Arithmetic, string concatenation, comparisons, and boolean and, or
+and not are folded. An "and" or "or" whose left side alone decides it
+(False and x, True or x) is folded too, as Python would never evaluate the
+right side. Anything that would fail, such as division by zero, is left for
+the game to fail at when it gets there.
+
+Tree shaking: the scenes that no chain of moves and movetos leads to from
+the start scene can never be played, and the items that no scene that can
+be played (or item it uses) names are never made. live_blocks() finds the
+rest, so that the dead ones can be left out of the generated game.
+
+Dispatch: an if statement whose conditions, its elifs' included, all
+compare one name to literals, as in if response == "look" or response ==
+"l": ... elif response == "take lamp": ..., checks its conditions one after
+another. dispatch_chain() recognizes these, so the code generator can look
+the name up in a table of the literals instead.
+
+Constant items: an item with no parameters whose body only gives its
+variables literal values, as in item lamp() { name is "lamp" }, is the same
+every time it is made. constant_fields() finds these, so that the code
+generator can make one and hand it out every time."""
+
+import math
+import operator
+from node import Node
+
+# Stands for "not a constant", as None is a value an expression can't have.
+_UNKNOWN = object()
+
+_OPERATORS = {"+": operator.add, "-": operator.sub, "*": operator.mul,
+              "/": operator.truediv, "//": operator.floordiv}
+_COMPARISONS = {"==": operator.eq, "!=": operator.ne, "not": operator.ne,
+                "<": operator.lt, ">": operator.gt, "<=": operator.le,
+                ">=": operator.ge}
+
+# The nodes that make up expressions. A constant one of these is replaced by
+# a literal atom.
+_EXPRESSIONS = frozenset(["expression", "or_test", "and_test", "not_test",
+                          "comparison", "arithmetic_expression", "term",
+                          "factor", "power", "atom"])
+
+_WRAPPERS = _EXPRESSIONS | frozenset(["test"])
+
+# Chains that compare to fewer literals than this aren't worth a table.
+DISPATCH_MIN = 4
+
+
+def _is_number(value):
+    return type(value) in (int, long, float)
+
+
+# Returns the nodes among children. The blocks node keeps its scenes and
+# items in dicts.
+def _child_nodes(children):
+    nodes = []
+    for c in children:
+        if isinstance(c, Node):
+            nodes.append(c)
+        elif type(c) is dict:
+            nodes.extend(c.itervalues())
+    return nodes
+
+
+# Counts the nodes in the tree under node, node included.
+def _size(node):
+    count = 0
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        count += 1
+        stack.extend(_child_nodes(n.children))
+    return count
+
+
+class ConstantFolder:
+    """Folds the constant expressions in narratr ASTs.
+
+    fold() changes the tree it is given in place. removed counts the nodes
+    taken out of every tree folded so far, and folded the expressions that
+    were replaced by literals."""
+    def __init__(self):
+        self.removed = 0
+        self.folded = 0
+
+    def fold(self, root):
+        """Fold every constant expression under root, and return root."""
+        # The value of each constant node seen so far, keyed by the node.
+        values = {}
+        # The tree is walked without recursion, as expressions can be
+        # nested deeper than Python's stack. Each node is seen once on the
+        # way down and again, after its children, on the way up.
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((c, False) for c in _child_nodes(node.children))
+                continue
+            value = self._evaluate(node, values)
+            if value is not _UNKNOWN:
+                values[node] = value
+                continue
+            # Only the children of an expression that isn't constant itself
+            # are replaced, so that each constant is replaced whole.
+            for i, child in enumerate(node.children):
+                if not isinstance(child, Node) or child not in values:
+                    continue
+                if child.type == "test":
+                    # A test is kept, as statements check for one. Its child
+                    # is replaced in its place.
+                    self._replace(child, 0, values[child])
+                elif node.type == "power":
+                    # The atom a trailer follows is kept, as 1.real isn't
+                    # Python, but what is in its parentheses is folded.
+                    if child.value == "test":
+                        self._replace(child.children[0], 0, values[child])
+                elif child.type in _EXPRESSIONS:
+                    self._replace(node, i, values[child])
+        return root
+
+    # Replaces the child at index i of node with a literal of value.
+    def _replace(self, node, i, value):
+        child = node.children[i]
+        if child.type == "atom" and (child.value in ("number", "boolean") or
+                                     child.v_type == "string"):
+            return
+        literal = _literal(value, child.lineno)
+        if type(node.children) is not list:
+            node.children = list(node.children)
+        node.children[i] = literal
+        self.removed += _size(child) - _size(literal)
+        self.folded += 1
+
+    # Returns the value of node if it is a constant, given the values of its
+    # constant children, or _UNKNOWN.
+    def _evaluate(self, node, values):
+        t = node.type
+        children = node.children
+        if t in ("number", "boolean"):
+            return node.value
+        if t != "test" and t not in _EXPRESSIONS:
+            return _UNKNOWN
+        if t == "atom":
+            if not children:
+                return node.value if node.v_type == "string" else _UNKNOWN
+            if node.value == "list":
+                return _UNKNOWN
+        elif t == "power" and node.value != "atom":
+            return _UNKNOWN
+        left = values.get(children[0], _UNKNOWN) if children else _UNKNOWN
+        if left is _UNKNOWN:
+            return _UNKNOWN
+        if t == "not_test" and node.value == "not":
+            return not left
+        if t == "factor" and node.value != "power":
+            if not _is_number(left):
+                return _UNKNOWN
+            return -left if node.value == "-" else +left
+        if len(children) == 1:
+            return left
+        # "False and x" and "True or x" are decided by their left side.
+        if t == "or_test" and left or t == "and_test" and not left:
+            return left
+        right = values.get(children[-1], _UNKNOWN)
+        if right is _UNKNOWN or t in ("or_test", "and_test"):
+            return right
+        try:
+            if t == "comparison":
+                return _COMPARISONS[children[1].value](left, right)
+            if t in ("arithmetic_expression", "term"):
+                return _arithmetic(node.value, left, right)
+        except (ArithmeticError, KeyError):
+            pass
+        return _UNKNOWN
+
+
+# Works out left op right for numbers, or the concatenation of two strings.
+def _arithmetic(op, left, right):
+    if _is_number(left) and _is_number(right):
+        result = _OPERATORS[op](left, right)
+        if type(result) is float and (math.isinf(result) or
+                                      math.isnan(result)):
+            return _UNKNOWN
+        return result
+    if op == "+" and type(left) is str and type(right) is str:
+        return left + right
+    return _UNKNOWN
+
+
+# Builds the atom the parser would for a literal of value.
+def _literal(value, lineno):
+    if type(value) is str:
+        return Node(value, "atom", [], "string", lineno)
+    if type(value) is bool:
+        return Node("boolean", "atom",
+                    [Node(value, "boolean", [], "boolean", lineno)],
+                    "boolean", lineno)
+    v_type = "float" if type(value) is float else "integer"
+    return Node("number", "atom", [Node(value, "number", [], v_type, lineno)],
+                v_type, lineno)
+
+
+def fold_constants(root):
+    """Fold the constant expressions under root in place.
+
+    Returns how many nodes were removed from the tree."""
+    folder = ConstantFolder()
+    folder.fold(root)
+    return folder.removed
+
+
+def references(block):
+    """Return what a scene or item block refers to.
+
+    The result is a pair: the scene IDs the block's moves declarations and
+    moveto statements lead to, and every name it uses (some of which may be
+    items)."""
+    scenes = set()
+    names = set()
+    stack = [block]
+    while stack:
+        node = stack.pop()
+        t = node.type
+        if t == "sceneid":
+            scenes.add(node.value)
+        elif t == "atom" and node.v_type == "id" and not node.children:
+            names.add(node.value)
+        stack.extend(_child_nodes(node.children))
+    return frozenset(scenes), frozenset(names)
+
+
+def live_blocks(start, scenes, items):
+    """Find the scenes and items a game can use, starting from start.
+
+    scenes maps each scene ID, and items each item name, to the block's
+    references(). Returns the set of scene IDs that can be reached and the
+    set of item names that can be made. If there is no scene start, the
+    program is broken in a way that has to be fixed first, and everything
+    is returned."""
+    if start not in scenes:
+        return set(scenes), set(items)
+    live_scenes = set()
+    live_items = set()
+    stack = [(scenes, live_scenes, start)]
+    while stack:
+        table, live, key = stack.pop()
+        if key in live or key not in table:
+            continue
+        live.add(key)
+        targets, names = table[key]
+        stack.extend((scenes, live_scenes, t) for t in targets)
+        stack.extend((items, live_items, n) for n in names if n in items)
+    return live_scenes, live_items
+
+
+# Returns the node an expression node stands for, skipping the nodes that
+# just wrap another (including parentheses), but not not or unary minus.
+def _unwrap(node):
+    while len(node.children) == 1 and node.type in _WRAPPERS:
+        if node.type == "atom" and node.value != "test" or \
+                node.type == "not_test" and node.value == "not" or \
+                node.type == "factor" and node.value != "power":
+            break
+        node = node.children[0]
+    return node
+
+
+# Returns the value of a literal atom, or _UNKNOWN.
+def _literal_value(node):
+    if node.type != "atom":
+        return _UNKNOWN
+    if not node.children:
+        return node.value if node.v_type == "string" else _UNKNOWN
+    if node.value in ("number", "boolean"):
+        return node.children[0].value
+    return _UNKNOWN
+
+
+# Returns the name atom and the literals a test compares it to with ==, if
+# it is one comparison or several joined by or, or None.
+def _comparisons(test):
+    subject = None
+    literals = []
+    stack = [_unwrap(test)]
+    while stack:
+        node = stack.pop()
+        if node.type == "or_test" and len(node.children) == 2:
+            stack.append(_unwrap(node.children[1]))
+            stack.append(_unwrap(node.children[0]))
+            continue
+        if node.type != "comparison" or len(node.children) != 3 or \
+                node.children[1].value != "==":
+            return None
+        left = _unwrap(node.children[0])
+        right = _unwrap(node.children[2])
+        value = _literal_value(right)
+        if value is _UNKNOWN:
+            left, right = right, left
+            value = _literal_value(right)
+        if value is _UNKNOWN or left.type != "atom" or left.children or \
+                left.v_type != "id":
+            return None
+        if subject is None:
+            subject = left
+        elif (left.value, left.key) != (subject.value, subject.key):
+            return None
+        literals.append(value)
+    return subject, literals
+
+
+def dispatch_chain(if_statement):
+    """Find out whether an if statement can be dispatched through a table.
+
+    That is the case if it and its elifs each test whether one name equals
+    some literals (with == and or), and there are at least DISPATCH_MIN
+    literals in all. Returns None if not, or a pair: the name's atom, and
+    the literals of each branch, in order."""
+    tests = [if_statement.children[0]]
+    if if_statement.children[2]:
+        tests.extend(e.children[0] for e in if_statement.children[2].children)
+    subject = None
+    branches = []
+    for test in tests:
+        found = _comparisons(test)
+        if found is None:
+            return None
+        if subject is None:
+            subject = found[0]
+        elif (found[0].value, found[0].key) != (subject.value, subject.key):
+            return None
+        branches.append(found[1])
+    if sum(len(b) for b in branches) < DISPATCH_MIN:
+        return None
+    return subject, branches
+
+
+def constant_fields(item):
+    """Find out whether every instance of an item would be the same.
+
+    That is the case if the item takes no parameters and each statement in
+    its body gives one of its variables a literal value (str, number or
+    boolean, none of which can be changed). Returns None if not, or a list
+    of (name, value) pairs, in the order the names are first given values,
+    with each name's last value. Code generation makes such an item once and
+    hands out that instance, so its instances compare equal."""
+    if item.children[0].children:
+        return None
+    statements = []
+    if len(item.children) == 2:
+        suite = item[1]
+        if suite.value == "simple":
+            statements = [suite[0]]
+        else:
+            for statement in suite[0].children:
+                if statement.value != "simple":
+                    return None
+                statements.append(statement[0])
+    fields = []
+    values = {}
+    for statement in statements:
+        if statement.value != "expression" or statement[0].value != "is":
+            return None
+        target, testlist = statement[0].children
+        if len(testlist.children) != 1:
+            return None
+        value = _literal_value(_unwrap(testlist[0]))
+        if value is _UNKNOWN:
+            return None
+        if target.value not in values:
+            fields.append(target.value)
+        values[target.value] = value
+    return [(name, values[name]) for name in fields]
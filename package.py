@@ -0,0 +1,142 @@
+# -----------------------------------------------------------------------------
+# narrtr: package.py
+# This file writes narratr games as packages of modules, one per scene.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""A code generator backend that writes a game as a package of modules.
+
+A game written as one file has to be read, compiled and run from top to
+bottom, every scene of it, before the player sees the first prompt. For a
+game with thousands of scenes, most of which a player never visits, that is
+most of its start-up time and memory. PackageGen generates the same code as
+CodeGen, but writes it out as a directory:
+
+__main__.py     the entry module: the main loop, and the Scenes the game
+                makes its scenes with.
+s_N.py          one module for each scene, holding the scene's class.
+items.py        the pocket and every item class.
+__init__.py     empty, so the directory is a package as well.
+
+The entry module imports nothing but the runtime, and its Scenes gets each
+scene's class from a SceneModules (see narratr_runtime.py), which imports
+the scene's module the first time the player enters it. The first scene to
+be made imports items.py. So starting a game costs the same however many
+scenes it has, and a game only ever holds the scenes the player has been
+to. python runs the directory as it would a single file:
+"python story.ntr.pkg".
+
+Each scene gets a module of its own rather than sharing one with the
+scenes it is strongly connected to, since in most games every scene can be
+got back to from every other, which would put the whole game in a single
+module."""
+
+import os
+from codegen import CodeGen, install_runtime
+from emitter import Emitter
+from optimize import references
+
+
+def write_package(ast, symtab, directory, diagnostics=None, keep_all=False):
+    """Generate the code for a parsed program as a package in directory.
+
+    Returns the PackageGen used; raises CompileError if there were errors,
+    and IOError or OSError if the package can't be written."""
+    p = PackageGen(diagnostics, keep_all=keep_all)
+    p.process(ast, symtab)
+    p.write(directory)
+    return p
+
+
+class PackageGen(CodeGen):
+    # The main program gets each scene's class from its own module, the
+    # first time it is needed.
+    scene_classes = "SceneModules(globals())"
+
+    # Takes the same arguments as CodeGen, except for stream: the modules
+    # are kept in memory until write() is called. What code() returns is
+    # the entry module.
+    def __init__(self, diagnostics=None, optimize=True, keep_all=False):
+        CodeGen.__init__(self, diagnostics, optimize=optimize,
+                         keep_all=keep_all)
+        self.frontmatter = "#!/usr/bin/env python\n" + \
+                           "from narratr_runtime import Scenes, " + \
+                           "SceneModules\n\n"
+        self.out = Emitter()
+        self.out.write(self.frontmatter)
+        # The entry module only has a main program.
+        self.section = "main"
+        # The code of each scene's class, by scene ID, and the names each
+        # scene uses.
+        self.scene_modules = {}
+        self.uses = {}
+        self.items = []
+
+    def _scene_gen(self, scene, sid):
+        self.uses[sid] = references(scene)[1]
+        return CodeGen._scene_gen(self, scene, sid)
+
+    def add_generated(self, block_type, key, code):
+        if block_type == "scene_block":
+            self.scene_modules[key] = code
+        CodeGen.add_generated(self, block_type, key, code)
+
+    # Scenes go in modules of their own, and items in items.py, rather than
+    # in the entry module.
+    def _add_scene(self, scene):
+        self.scenes_added += 1
+
+    def _add_item(self, item):
+        self.items.append(item)
+        self.items_added += 1
+
+    def modules(self):
+        """Return the source of every module of the package, by file name.
+
+        Raises CompileError if any errors have been reported."""
+        modules = {"__init__.py": "", "__main__.py": self.code()}
+        modules["items.py"] = "from __future__ import division\n" + \
+            "from sys import exit\n" + \
+            "from narratr_runtime import pocket_class, _unset\n\n" + \
+            "pocket = pocket_class()\n" + \
+            "".join("\n\n" + item + "\n" for item in self.items)
+        for sid, scene in self.scene_modules.iteritems():
+            # A scene only imports the items it uses.
+            items = sorted(self.uses.get(sid, ()) & set(self.item_names))
+            modules["s_" + str(sid) + ".py"] = \
+                "from __future__ import division\n" + \
+                "from sys import exit\n" + \
+                "from narratr_runtime import Scene, _unset\n" + \
+                "from items import " + ", ".join(["pocket"] + items) + \
+                "\n\n\n" + scene + "\n"
+        return modules
+
+    def write(self, directory):
+        """Write the package into directory, creating it if need be.
+
+        Nothing is written unless the program compiled. A module that is
+        already there as it would be written is left alone, so python can
+        keep using the bytecode it compiled it to; modules of scenes that
+        are no longer in the program are left too, but are never imported.
+        A copy of the runtime is put in the package. Raises CompileError if
+        any errors have been reported."""
+        modules = self.modules()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        for name, source in modules.iteritems():
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                with open(path) as f:
+                    if f.read() == source:
+                        continue
+            with open(path, 'w') as f:
+                f.write(source)
+        install_runtime(os.path.join(directory, "__main__.py"))
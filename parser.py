@@ -16,24 +16,79 @@
 #
 # -----------------------------------------------------------------------------
 
-from sys import stderr, exit
+import os
+import sys
 import ply.yacc as yacc
+from operator import itemgetter
 from ply.lex import LexToken
 from lexer import LexerForNarratr
 from node import Node
 from symtab import SymTabEntry, SymTab
+from diagnostics import Diagnostics, CompileError, column
+
+# The LALR tables for the grammar below are generated ahead of time into
+# this module (see build_tables()), so that constructing a parser does not
+# have to introspect and validate the grammar every time.
+TABMODULE = "narratr_parsetab"
+try:
+    import narratr_parsetab
+except ImportError:
+    narratr_parsetab = None
 
 # Error checking: Make sure when item added to list, the item is of the same
 # type as the rest of the list.
 
 
+# p_error() raises this to abandon the parse after a syntax error, once the
+# lexer has been moved to the start of the next top-level block. parse()
+# then starts a new parse from there.
+class _Resync(Exception):
+    pass
+
+
 class ParserForNarratr:
 
-    def __init__(self, **kwargs):
-        self.lexer = LexerForNarratr()
+    # By default the parser is loaded straight from the prebuilt tables in
+    # narratr_parsetab. Passing prebuilt=False, or any keyword arguments for
+    # yacc(), builds it from the grammar in this class instead. Errors found
+    # by the lexer and parser are collected in diagnostics, a Diagnostics
+    # sink, which is cleared at the start of every parse.
+    def __init__(self, prebuilt=True, diagnostics=None, **kwargs):
+        if diagnostics is None:
+            diagnostics = Diagnostics()
+        self.diagnostics = diagnostics
+        self.lexer = LexerForNarratr(diagnostics)
         self.tokens = self.lexer.tokens
-        self.parser = yacc.yacc(module=self, **kwargs)
+        self.parser = None
+        if prebuilt and not kwargs and narratr_parsetab is not None:
+            self.parser = self._load_tables(narratr_parsetab)
+        if self.parser is None:
+            self.parser = yacc.yacc(module=self, **kwargs)
         self.symtab = SymTab()
+        self.refs = []
+
+    # This method puts the parser back in the state of a newly constructed
+    # one: a new, empty symbol table, no diagnostics and a reset lexer. The
+    # parse tables are kept, which is what makes reusing a parser cheap.
+    def reset(self):
+        self.symtab = SymTab()
+        self.refs = []
+        self.diagnostics.clear()
+        self.lexer.reset()
+
+    # This loads a parser from a generated table module without any of the
+    # grammar checks yacc() does. The tables are trusted to match this
+    # class; tests/test_parser_other.py checks that they do. Returns None if
+    # the tables were written by a different version of PLY.
+    def _load_tables(self, tables):
+        lr = yacc.LRTable()
+        try:
+            lr.read_table(tables)
+        except yacc.VersionError:
+            return None
+        lr.bind_callables(dict((prod.func, getattr(self, prod.func))
+                               for prod in lr.lr_productions if prod.func))
+        return yacc.LRParser(lr, self.p_error)
 
     def p_program(self, p):
         "program : newlines_optional blocks"
@@ -118,10 +173,9 @@ class ParserForNarratr:
         try:
             self.symtab.insert(p[2], p[0], "scene", "GLOBAL", False)
         except:
-            self._semantic_error("Error at line " + str(p.lineno(1)) +
-                                 ": A scene with the id '" + str(p[2]) +
-                                 "' already exists.")
-        self.pass_down(p[0], p[2])
+            self._semantic_error("A scene with the id '" + str(p[2]) +
+                                 "' already exists.", lineno=p.lineno(1))
+        self.resolve(p[2])
 
     # This item block consists of a suite and parameters
     # both children of the item block.
@@ -139,10 +193,9 @@ class ParserForNarratr:
         try:
             self.symtab.insert(p[2], p[0], "item", "GLOBAL", False)
         except:
-            self._semantic_error("Error at line " + str(p.lineno(1)) +
-                                 ": An item with the id '" + str(p[2]) +
-                                 "' already exists.")
-        self.pass_down(p[0], "item." + p[2])
+            self._semantic_error("An item with the id '" + str(p[2]) +
+                                 "' already exists.", lineno=p.lineno(1))
+        self.resolve("item." + p[2])
 
     def p_start_state(self, p):
         'start_state : START COLON SCENEID'
@@ -229,6 +282,7 @@ class ParserForNarratr:
                 value = "lose"
         else:
             self._semantic_error("Syntax Error forming simple_statement.")
+            return
         p[0] = Node(value, 'simple_statement', [p[1]], lineno=p[1].lineno)
 
     def p_say_statement(self, p):
@@ -281,6 +335,7 @@ class ParserForNarratr:
                 value = "moveto"
         else:
             self._semantic_error("Parse error in flow_statement.")
+            return
         p[0] = Node(value, "flow_statement", [p[1]], lineno=p[1].lineno)
 
     # Here we handle variable declarations,
@@ -295,9 +350,11 @@ class ParserForNarratr:
         elif p[1] == "god":
             p[0] = Node("godis", "expression_statement", [Node(p[2], "god_id"),
                         p[4]], lineno=p.lineno(1))
+            self.refs.append((p.lexpos(1), p[0]))
         else:
             p[0] = Node("is", "expression_statement", [Node(p[1], "id"), p[3]],
                         lineno=p.lineno(1))
+            self.refs.append((p.lexpos(1), p[0]))
 
     def p_break_statement(self, p):
         '''break_statement : BREAK'''
@@ -436,10 +493,14 @@ class ParserForNarratr:
                         p[0] = Node(p[2], 'arithmetic_expression',
                                     [p[1], p[3]], "string", p.lineno(2))
                     else:
-                        self._semantic_error(p, err_type="combination_error")
+                        p[0] = self._semantic_error(
+                            p, err_type="combination_error",
+                            n_type='arithmetic_expression')
                 # Reject any expression trying to subtract strings.
                 elif p[2] == "-":
-                    self._semantic_error(p, err_type="combination_error")
+                    p[0] = self._semantic_error(
+                        p, err_type="combination_error",
+                        n_type='arithmetic_expression')
             else:
                 p[0] = self.combination_rules(p, 'arithmetic_expression')
 
@@ -454,13 +515,14 @@ class ParserForNarratr:
             # Type checking: reject anything with strings
             if (p[1].v_type in ["string", "list"] or
                     p[3].v_type in ["string", "list"]):
-                self._semantic_error(p, err_type="combination_error")
-
-            p[0] = self.combination_rules(p, 'term')
+                p[0] = self._semantic_error(p, err_type="combination_error",
+                                            n_type='term')
+            else:
+                p[0] = self.combination_rules(p, 'term')
             # For integer division, we can just reset the v_type
             if p[2] == "//":
                 p[0].v_type = "integer"
-            p[0].lineno = p.lineno(1)
+            p[0].lineno = p.lineno(2)
         else:
             p[0] = Node("factor", 'term', [p[1]], p[1].v_type,
                         lineno=p[1].lineno)
@@ -469,7 +531,7 @@ class ParserForNarratr:
         '''factor : PLUS factor
                   | MINUS factor
                   | power'''
-        if p[1].type == 'power':
+        if isinstance(p[1], Node):
             p[0] = Node("power", "factor", [p[1]], p[1].v_type,
                         lineno=p[1].lineno)
         else:
@@ -506,6 +568,7 @@ class ParserForNarratr:
     def p_atom_id(self, p):
         '''atom : ID'''
         p[0] = Node(p[1], 'atom', [], "id", lineno=p.lineno(1))
+        self.refs.append((p.lexpos(1), p[0]))
 
     # This expression calls a function
     # in one of two syntactic ways.
@@ -635,42 +698,39 @@ class ParserForNarratr:
 
     # In order to create SymTab entries (in particular, in order to know
     # the appropriate scope) for named entities discovered below a main
-    # branch (i.e. variables in a scene), we need to travel back down
-    # the branches once we get to the main node. This function does so,
-    # creating symtab entries as it goes. It is called recursively on
-    # every branch, looking for named entities. It takes as its argument
-    # a branch and the scope to be assigned to all found named entities.
-    def pass_down(self, branch, scope):
-        for i, child in enumerate(branch.children):
-            if not isinstance(child, Node):
+    # branch (i.e. variables in a scene), every declaration and every use
+    # of a name is noted in self.refs, with its position in the source, as
+    # it is reduced. When the scene or item block is reduced, and so its
+    # scope is known, this function resolves each of them once, in source
+    # order, creating symtab entries as it goes. No part of the tree is
+    # walked again.
+    def resolve(self, scope):
+        refs = self.refs
+        self.refs = []
+        # Reductions happen bottom-up, so a declaration is noted after the
+        # names used on its right-hand side.
+        refs.sort(key=itemgetter(0))
+        symtab = self.symtab
+        for pos, node in refs:
+            if node.type == "atom":
+                if symtab.get(node.value, scope):
+                    node.key = symtab.getKey(node.value, scope)
                 continue
-            if child.type == "expression_statement":
-                if child[0].type == "id":
-                    child[0].key = self.symtab.getKey(child[0].value, scope)
-                    entry = self.symtab.getWithKey(child[0].key)
-                    if not entry:
-                        self.symtab.insert(child[0].value, None, None, scope,
-                                           False)
-                elif child[0].type == "god_id":
-                    child[0].key = self.symtab.getKey(child[0].value, scope)
-                    entry = self.symtab.getWithKey(child[0].key)
-                    if not entry:
-                        self.symtab.insert(child[0].value, None, None, scope,
-                                           True)
-                    else:
-                        if entry.god:
-                            self._semantic_error("Re-declaring god " +
-                                                 "variable in same scope",
-                                                 lineno=child.lineno)
-                        else:
-                            self._semantic_error("Declaring previously " +
-                                                 "declared variable as god",
-                                                 lineno=child.lineno)
-            elif child.type == "atom" and child.v_type == "id":
-                entry = self.symtab.get(child.value, scope)
-                if entry:
-                    child.key = self.symtab.getKey(child.value, scope)
-            self.pass_down(child, scope)
+            target = node[0]
+            target.key = symtab.getKey(target.value, scope)
+            entry = symtab.getWithKey(target.key)
+            if not entry:
+                symtab.insert(target.value, None, None, scope,
+                              target.type == "god_id")
+            elif target.type == "god_id":
+                if entry.god:
+                    self._semantic_error("Re-declaring god " +
+                                         "variable in same scope",
+                                         lineno=node.lineno)
+                else:
+                    self._semantic_error("Declaring previously " +
+                                         "declared variable as god",
+                                         lineno=node.lineno)
 
     # This checks numbers for interoperability. If they are of
     # differing types, the result is always the more general of
@@ -688,44 +748,121 @@ class ParserForNarratr:
                 p[0] = Node(p[2], n_type, [p[1], p[3]],
                             "float", p.lineno(2))
             else:
-                self._semantic_error(p, "combination_error")
+                p[0] = self._semantic_error(p, "combination_error",
+                                            n_type=n_type)
         elif p[1].v_type == "float":
             if p[3].v_type in ["integer", "float"]:
                 p[0] = Node(p[2], n_type, [p[1], p[3]],
                             "float", p.lineno(2))
             else:
-                self._semantic_error(p, "combination_error")
+                p[0] = self._semantic_error(p, "combination_error",
+                                            n_type=n_type)
         elif p[1].v_type == "list":
             if p[3].v_type == "list":
                 p[0] = Node(p[2], n_type, [p[1], p[3]],
                             "list", p.lineno(2))
             else:
-                self._semantic_error(p, "combination_error")
+                p[0] = self._semantic_error(p, "combination_error",
+                                            n_type=n_type)
         elif p[1].v_type == "boolean":
-            self.p_error(p, "combination_error")
+            p[0] = self._semantic_error(p, "combination_error",
+                                        n_type=n_type)
         else:
             p[0] = Node(p[2], n_type, [p[1], p[3]], "unknown", p.lineno(2))
 
         return p[0]
 
-    # This is a wrapper function for error statements in the parser.
+    # This is a wrapper function for error statements in the parser. The
+    # error is reported, and then the parser recovers by skipping ahead to
+    # the next scene, item or start state and starting over from there, so
+    # one pass finds the errors in every block. (yacc's own restart() can't
+    # be used for this, as it leaves the parser in its old state.)
     def p_error(self, p):
-        stderr.write("ERROR: Syntax Error at Line " + str(p.lineno) +
-                     ": " + "at token '" + str(p.value) + "'\n")
-        exit(1)
-
-    # This is a wrapper funciton for semantic errors.
-    def _semantic_error(self, p, err_type=None, lineno=0):
+        if p is None:
+            # Running out of input while recovering from an earlier error
+            # is only a symptom of that error.
+            if not self.diagnostics.errors():
+                self.diagnostics.error("Syntax Error: unexpected end of " +
+                                       "input", self.lexer.lexer.lineno)
+            return
+        self.diagnostics.error("Syntax Error at token '" + str(p.value) +
+                               "'", p.lineno, self._column(p.lexpos))
+        while True:
+            token = self.lexer.token()
+            if token is None or token.type in ("SCENE", "ITEM", "START"):
+                break
+        if token is not None:
+            self.lexer.resync(token.lexpos)
+            raise _Resync()
+
+    # This is a wrapper funciton for semantic errors. The error is reported
+    # and parsing carries on. For combination errors, it returns a node of
+    # type n_type with an unknown value type to stand in for the expression.
+    def _semantic_error(self, p, err_type=None, lineno=0, n_type=None):
         if err_type == "combination_error":
-            stderr.write("ERROR: Type error at line " + str(p.lineno(2)) +
-                         ": cannot combine '" + p[1].v_type +
-                         "' with '" + p[3].v_type + "'\n")
+            self.diagnostics.error("Type error: cannot combine '" +
+                                   str(p[1].v_type) + "' with '" +
+                                   str(p[3].v_type) + "'", p.lineno(2),
+                                   self._column(p.lexpos(2)))
+            return Node(p[2], n_type, [p[1], p[3]], "unknown", p.lineno(2))
         elif isinstance(p, LexToken):
-            stderr.write("ERROR: Syntax Error at Line " + str(p.lineno) +
-                         ": " + "at token '" + str(p.value) + "'\n")
+            self.diagnostics.error("Syntax Error at token '" +
+                                   str(p.value) + "'", p.lineno,
+                                   self._column(p.lexpos))
         elif isinstance(p, str):
-            stderr.write("ERROR: Line " + str(lineno) + ": " + p + "\n")
-        exit(1)
-
-    def parse(self, string_to_parse, **kwargs):
-        return self.parser.parse(string_to_parse, lexer=self.lexer, **kwargs)
+            self.diagnostics.error(p, lineno or None)
+
+    def _column(self, lexpos):
+        return column(self.lexer.lexer.lexdata, lexpos)
+
+    # Parses a whole program. By default (fresh=True) the parser is reset
+    # first, so each call sees only its own input and the symbol table
+    # afterwards describes only that program. Pass fresh=False to carry the
+    # symbol table over from the previous call. Raises CompileError, holding
+    # every error found, if the program has any.
+    def parse(self, string_to_parse, fresh=True, **kwargs):
+        if fresh:
+            self.reset()
+        else:
+            self.diagnostics.clear()
+            self.lexer.reset()
+            self.refs = []
+        while True:
+            try:
+                ast = self.parser.parse(string_to_parse, lexer=self.lexer,
+                                        **kwargs)
+                break
+            except _Resync:
+                # Passing no input carries on from where the lexer is. The
+                # names noted in the abandoned block are dropped with it.
+                string_to_parse = None
+                self.refs = []
+        if self.diagnostics.errors():
+            raise CompileError(self.diagnostics)
+        return ast
+
+
+def build_tables(outputdir=None):
+    """Regenerate the narratr_parsetab module from the grammar.
+
+    This must be run, and the result committed, whenever a grammar rule in
+    ParserForNarratr changes. The tables are written next to this file
+    unless outputdir is given. Returns the path of the new module."""
+    if outputdir is None:
+        outputdir = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(outputdir, TABMODULE + ".py")
+    # yacc() only writes tables it had to generate, so the old ones must be
+    # out of the way first.
+    for stale in [path, path + "c"]:
+        if os.path.exists(stale):
+            os.remove(stale)
+    for name in sys.modules.keys():
+        if name.split(".")[-1] == TABMODULE:
+            del sys.modules[name]
+    cwd = os.getcwd()
+    os.chdir(outputdir)
+    try:
+        ParserForNarratr(prebuilt=False, tabmodule=TABMODULE, debug=0)
+    finally:
+        os.chdir(cwd)
+    return path
@@ -0,0 +1,210 @@
+# -----------------------------------------------------------------------------
+# narrtr: serve.py
+# This file runs the narratr compiler as a long-lived service.
+#
+# Copyright (C) 2015 Team narratr
+# All Rights Reserved
+# Team narratr: Yelin Hong, Shloka Kini, Nivvedan Senthamil Selvan, Jonah
+# Smith, Cecilia Watt
+#
+# Any questions, bug reports and complaints are to be directed at the primary
+# author.
+#
+# -----------------------------------------------------------------------------
+
+"""A compile service listening on a Unix socket.
+
+Clients connect and send one JSON object per line, and get one JSON object
+per line back. A compile request looks like
+
+    {"source": "scene $1 { ... }"}
+
+and is answered with
+
+    {"ok": true, "diagnostics": [...], "ast": {...}, "code": "...",
+     "elapsed_ms": 1.3}
+
+where each diagnostic is {"severity": "error", "line": 3, "column": 5,
+"message": "..."}
+and "ast" summarizes the program's scenes, items and start scene. "code" is
+null if the program did not compile. Sending {"command": "stats"} returns
+the latency percentiles of the compiles served so far."""
+
+import os
+import json
+import stat
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import SocketServer
+from Queue import Queue
+from collections import deque
+import parser
+import codegen
+from node import Node
+from diagnostics import CompileError
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "narratr.sock")
+
+# Every worker compiles this once at startup, so the first real request does
+# not pay for anything being loaded lazily.
+WARMUP = "scene $1 {\n    setup:\n    action:\n    cleanup:\n}\nstart: $1\n"
+
+
+def summarize(ast):
+    """A small JSON-able description of a program's top-level blocks."""
+    summary = {"scenes": [], "items": [], "start": None}
+    if not isinstance(ast, Node) or not ast.children:
+        return summary
+    blocks = ast.blocks
+    summary["scenes"] = sorted(blocks.scenes)
+    summary["items"] = sorted(blocks.items)
+    for start in blocks.start_states:
+        if isinstance(start, Node):
+            summary["start"] = start.value
+            break
+    return summary
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Nearest-rank percentiles of samples, keyed like "p50"."""
+    result = {"count": len(samples)}
+    ordered = sorted(samples)
+    for point in points:
+        if ordered:
+            rank = max(0, int(round(point / 100.0 * len(ordered))) - 1)
+            result["p" + str(point)] = ordered[rank]
+        else:
+            result["p" + str(point)] = None
+    result["max"] = ordered[-1] if ordered else None
+    return result
+
+
+class CompileService:
+    """A pool of warm parsers, and the statistics of the compiles run."""
+    def __init__(self, workers=2, history=10000):
+        self.workers = Queue()
+        for i in range(workers):
+            p = parser.ParserForNarratr()
+            codegen.CodeGen().process(p.parse(WARMUP), p.symtab)
+            self.workers.put(p)
+        self.latencies = deque(maxlen=history)
+        self.lock = threading.Lock()
+
+    def compile(self, source):
+        """Compile source text, returning the response dictionary."""
+        if isinstance(source, unicode):
+            source = source.encode("utf-8")
+        start = time.time()
+        p = self.workers.get()
+        ast = None
+        code = None
+        try:
+            ast = p.parse(source)
+            c = codegen.CodeGen(p.diagnostics)
+            c.process(ast, p.symtab)
+            code = c.code()
+        except CompileError:
+            code = None
+        finally:
+            # The next request to use this parser clears its diagnostics.
+            diagnostics = [d.as_dict() for d in p.diagnostics]
+            self.workers.put(p)
+        elapsed = (time.time() - start) * 1000
+        with self.lock:
+            self.latencies.append(elapsed)
+        return {"ok": code is not None,
+                "diagnostics": diagnostics,
+                "ast": summarize(ast),
+                "code": code,
+                "elapsed_ms": elapsed}
+
+    def stats(self):
+        with self.lock:
+            samples = list(self.latencies)
+        return percentiles(samples)
+
+
+class _Handler(SocketServer.StreamRequestHandler):
+    def handle(self):
+        service = self.server.service
+        for line in iter(self.rfile.readline, ""):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    response = {"ok": False, "error": "unknown request"}
+                elif request.get("command") == "stats":
+                    response = service.stats()
+                elif "source" in request:
+                    response = service.compile(request["source"])
+                else:
+                    response = {"ok": False, "error": "unknown request"}
+            except ValueError:
+                response = {"ok": False, "error": "request is not JSON"}
+            self.wfile.write(json.dumps(response) + "\n")
+            self.wfile.flush()
+
+
+class CompileServer(SocketServer.ThreadingMixIn,
+                    SocketServer.UnixStreamServer):
+    daemon_threads = True
+
+    # A socket left at path by a service that didn't shut down cleanly is
+    # removed; anything else there is left alone, and binding fails.
+    def __init__(self, path, service):
+        _remove_socket(path)
+        self.path = path
+        self.service = service
+        SocketServer.UnixStreamServer.__init__(self, path, _Handler)
+
+    def server_close(self):
+        SocketServer.UnixStreamServer.server_close(self)
+        _remove_socket(self.path)
+
+
+# Removes path if it is a socket; never a file the user may want.
+def _remove_socket(path):
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.remove(path)
+
+
+def request(path, message):
+    """Send one request to a running service and return its response."""
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(path)
+        f = s.makefile("rw")
+        f.write(json.dumps(message) + "\n")
+        f.flush()
+        return json.loads(f.readline())
+    finally:
+        s.close()
+
+
+def main(argv):
+    argparser = argparse.ArgumentParser(prog="narratr.py serve")
+    argparser.add_argument('--socket', action="store", default=DEFAULT_SOCKET,
+                           help='path of the Unix socket to listen on.' +
+                           ' defaults to ' + DEFAULT_SOCKET)
+    argparser.add_argument('-j', '--workers', type=int, default=2,
+                           help='number of warm parsers to keep. defaults' +
+                           ' to 2')
+    args = argparser.parse_args(argv)
+
+    server = CompileServer(args.socket, CompileService(max(1, args.workers)))
+    print "narratr compile service listening on " + args.socket
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = server.service.stats()
+        print "\nserved %d compiles" % stats["count"]
+        if stats["count"]:
+            print "latency (ms): p50 %.2f  p90 %.2f  p99 %.2f  max %.2f" % \
+                (stats["p50"], stats["p90"], stats["p99"], stats["max"])
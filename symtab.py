@@ -47,27 +47,42 @@ class SymTabEntry:
                 + str(self.god) + "]"
 
 
+# Scopes may be given by name as well as by sentinel; these are the names.
+_SCOPE_NAMES = {"GLOBAL": GLOBAL, "POCKET": POCKET}
+
+
 class SymTab:
+    """The narratr symbol table.
+
+    Entries are keyed by (scope, symbol) tuples, with the symbol interned.
+    Scopes are scene IDs, "item.<name>" for the body of an item, POCKET or
+    GLOBAL ("GLOBAL" and "POCKET" are accepted for the last two).
+    entries() gives all the entries of one scope."""
     def __init__(self):
         self.table = {}
+        self.scopes = {}
+
+    def scope(self, scope):
+        """Return the canonical form of a scope."""
+        return _SCOPE_NAMES.get(scope, scope)
 
     def getKey(self, symbol, scope):
         """Use scope and symbol to construct the internal key representation.
 
-        Note, this is just string manipulation; it does not access the symbol
-        table entries."""
-        if scope == POCKET:
-            key = "POCKET." + str(symbol)
-        elif scope == GLOBAL:
-            key = "GLOBAL." + str(symbol)
-        else:
-            key = str(scope) + "." + str(symbol)
-        return key
+        Note, this does not access the symbol table entries."""
+        if type(symbol) is str:
+            symbol = intern(symbol)
+        if type(scope) is str:
+            scope = _SCOPE_NAMES.get(scope) or intern(scope)
+        return (scope, symbol)
 
     def overwrite(self, entry):
         """Overwrites an existing entry in the Symbol Table."""
         if isinstance(entry, SymTabEntry):
-            self.table[self.getKey(entry.symbol, entry.scope)] = entry
+            key = self.getKey(entry.symbol, entry.scope)
+            entry.scope, entry.symbol = key
+            self.table[key] = entry
+            self.scopes.setdefault(key[0], {})[key[1]] = entry
         else:
             raise Exception("Insert needs a valid Symbol Table entry.")
 
@@ -85,13 +100,17 @@ class SymTab:
     def get(self, symbol, scope):
         """The interface used to get a SymTab Entry from the table.
 
-        Returns None if there is no entry."""
-        return self.table.get(self.getKey(symbol, scope), None)
+        Only scope itself is searched. Returns None if there is no entry."""
+        return self.table.get((_SCOPE_NAMES.get(scope, scope), symbol), None)
 
     def getWithKey(self, key):
         """Get a symbol table entry if you already have the key."""
         return self.table.get(key, None)
 
+    def entries(self, scope):
+        """Return the entries declared directly in scope, by symbol."""
+        return self.scopes.get(self.scope(scope), {})
+
     def update(self, symbol, value, symboltype, scope, god=False):
         """Update an existing entry in the symbol table."""
         if self.getKey(symbol, scope) not in self.table:
@@ -100,9 +119,17 @@ class SymTab:
         else:
             self.overwrite(SymTabEntry(symbol, value, symboltype, scope, god))
 
-    # String representation of the Symbol Table
+    # String representation of the Symbol Table, one scope at a time.
     def __repr__(self):
         items = []
-        for key in self.table:
-            items.append(str(key) + " : " + self.table[key].__repr__())
+        for scope, entries in self.scopes.iteritems():
+            if scope == GLOBAL:
+                name = "GLOBAL"
+            elif scope == POCKET:
+                name = "POCKET"
+            else:
+                name = str(scope)
+            for symbol, entry in entries.iteritems():
+                items.append(name + "." + str(symbol) + " : " +
+                             entry.__repr__())
         return "\n".join(items)
@@ -0,0 +1,136 @@
+import narratr.parser as parser
+import narratr.codegen as codegen
+import narratr.astgen as astgen
+from narratr.diagnostics import CompileError
+from cStringIO import StringIO
+import os
+import sys
+import shutil
+import tempfile
+import traceback
+import subprocess
+import unittest
+
+
+# Runs a game in this process with input as its stdin, returning what it
+# printed. run is called with the game's namespace.
+def play(run, input):
+    stdin, stdout = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = StringIO(input), StringIO()
+    try:
+        run({"__name__": "__main__"})
+    except (SystemExit, EOFError):
+        pass
+    finally:
+        output = sys.stdout.getvalue()
+        sys.stdin, sys.stdout = stdin, stdout
+    return output
+
+
+def compile_source(source, filename="<narratr>"):
+    p = parser.ParserForNarratr()
+    return astgen.compile_program(p.parse(source), p.symtab, filename)
+
+
+class TestAstGen(unittest.TestCase):
+
+    def test_every_node_type_handled(self):
+        """Test that AstGen has its own handler for every CodeGen one."""
+        a = astgen.AstGen()
+        for t, handler in codegen.CodeGen().handlers.iteritems():
+            self.assertNotEqual(a.handlers[t], handler, t)
+
+    def test_same_behaviour_as_source(self):
+        """Test that compiled games behave like generated source."""
+        programs = ["0_helloworld", "2_derived", "3_arithmetic",
+                    "3_comparison", "4_continue", "4_elseif", "4_while",
+                    "demo", "lockandkey", "pandora"]
+        input = "move right\nmove right\nmove left\nlook\nexit\n"
+        for name in programs:
+            with open("sampleprograms/" + name + ".ntr") as f:
+                source = f.read()
+            p = parser.ParserForNarratr()
+            c = codegen.CodeGen()
+            c.process(p.parse(source), p.symtab)
+            python = c.code()
+
+            def run_source(namespace):
+                exec python in namespace
+            code = compile_source(source)
+            self.assertEqual(play(lambda ns: astgen.run(code), input),
+                             play(run_source, input), name)
+
+    def test_line_numbers(self):
+        """Test that tracebacks point into the narratr source."""
+        code = compile_source("scene $1 {\n    setup:\n        x is 0\n" +
+                              "        say 1 / x\n    action:\n" +
+                              "    cleanup:\n}\nstart: $1\n", "story.ntr")
+        try:
+            play(lambda ns: astgen.run(code), "")
+        except ZeroDivisionError:
+            filename, lineno = traceback.extract_tb(sys.exc_info()[2])[-1][:2]
+        self.assertEqual((filename, lineno), ("story.ntr", 4))
+
+    def test_dispatch(self):
+        """Test that a response chain dispatched through a table runs."""
+        code = compile_source("scene $1 {\n    setup:\n    action:\n" +
+                              "        if response == \"a\":\n" +
+                              "            say 1\n" +
+                              "        elif response == \"b\":\n" +
+                              "            say 2\n" +
+                              "        elif response == \"c\":\n" +
+                              "            say 3\n" +
+                              "        elif response == \"d\":\n" +
+                              "            say 4\n        else:\n" +
+                              "            say 5\n    cleanup:\n}\n" +
+                              "start: $1\n")
+        self.assertEqual(play(lambda ns: astgen.run(code), "c\nz\nexit\n"),
+                         " -->> 3\n -->> 5\n -->> == GAME TERMINATED ==\n")
+
+    def test_god_variable_names(self):
+        """Test that god variables can have the names of what a scene gets
+        from Scene."""
+        code = compile_source("scene $1 {\n    setup:\n" +
+                              "        god respond is 1\n" +
+                              "        god scenes is 2\n    action:\n" +
+                              "        say respond + scenes\n" +
+                              "    cleanup:\n}\nstart: $1\n")
+        self.assertEqual(play(lambda ns: astgen.run(code), "look\nexit\n"),
+                         " -->> 3\n -->> == GAME TERMINATED ==\n")
+
+    def test_errors(self):
+        """Test that a program with errors doesn't compile."""
+        with open('sampleprograms/6_nonexistent_start_scene.ntr') as f:
+            self.assertRaises(CompileError, compile_source, f.read())
+        try:
+            compile_source("scene $1 {\n    setup:\n" +
+                           "        say pocket.foo(1)\n    action:\n" +
+                           "    cleanup:\n}\nstart: $1\n")
+        except CompileError as e:
+            self.assertEqual([str(d) for d in e.diagnostics.errors()],
+                             ["ERROR: Line 3: invalid method for pocket"])
+        else:
+            self.fail("a start scene with errors compiled")
+
+
+class TestPyc(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_pyc_runs(self):
+        """Test that python runs a written .pyc file."""
+        path = os.path.join(self.dir, "game.pyc")
+        with open('sampleprograms/3_arithmetic.ntr') as f:
+            astgen.write_pyc(compile_source(f.read()), path)
+        p = subprocess.Popen([sys.executable, path], stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output = p.communicate("")[0]
+        self.assertEqual(output, "6\n6\n3\n4\n3.0\n3\n3 three\n -->> ")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import narratr.build as build
+import unittest
+import tempfile
+import shutil
+import os
+from cStringIO import StringIO
+
+
+class TestBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, "out")
+        self.corpus = os.path.join(self.directory, "corpus")
+        os.makedirs(os.path.join(self.corpus, "more"))
+        for name in ["2_list.ntr", "4_while.ntr"]:
+            shutil.copy("sampleprograms/" + name, self.corpus)
+        shutil.copy("sampleprograms/5_moves.ntr",
+                    os.path.join(self.corpus, "more"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_build_directory(self):
+        """Test that build compiles every file under a directory."""
+        report = StringIO()
+        failed = build.build([self.corpus], 1, self.output, out=report)
+        self.assertEqual(failed, 0)
+        for name in ["2_list.ntr.py", "4_while.ntr.py",
+                     os.path.join("more", "5_moves.ntr.py")]:
+            self.assertTrue(os.path.isfile(os.path.join(self.output, name)))
+        self.assertTrue("3 files, 3 ok, 0 failed" in report.getvalue())
+
+    def test_build_parallel(self):
+        """Test that a parallel build matches a serial one."""
+        serial = os.path.join(self.directory, "serial")
+        build.build([self.corpus], 1, serial, out=StringIO())
+        build.build([self.corpus], 2, self.output, out=StringIO())
+        with open(os.path.join(serial, "4_while.ntr.py")) as f:
+            expected = f.read()
+        with open(os.path.join(self.output, "4_while.ntr.py")) as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_build_cached_warnings(self):
+        """Test that a build from the cache reports the same warnings."""
+        with open(os.path.join(self.corpus, "unreached.ntr"), 'w') as f:
+            f.write("scene $1 {\n    setup:\n    action:\n    cleanup:\n" +
+                    "}\nscene $2 {\n    setup:\n    action:\n" +
+                    "    cleanup:\n}\nstart: $1\n")
+        cache_dir = os.path.join(self.directory, "cache")
+        reports = []
+        for i in range(2):
+            report = StringIO()
+            build.build([self.corpus], 1, self.output, cache_dir, report)
+            reports.append(report.getvalue())
+        self.assertTrue("cached" in reports[1])
+        for report in reports:
+            self.assertTrue("WARNING: Line 6: Scene $2 can't be reached" in
+                            report)
+
+    def test_build_edit_after_cache_hit(self):
+        """Test that an edit after a cache hit only recompiles what changed,
+        even if the hit came from a build of another file."""
+        cache_dir = os.path.join(self.directory, "cache")
+        shutil.copy("sampleprograms/lockandkey.ntr", self.corpus)
+        build.build([self.corpus], 1, self.output, cache_dir, StringIO())
+        copy = os.path.join(self.directory, "copy")
+        os.makedirs(copy)
+        shutil.copy("sampleprograms/lockandkey.ntr", copy)
+        report = StringIO()
+        build.build([copy], 1, self.output, cache_dir, report)
+        self.assertTrue("(cached)" in report.getvalue())
+        path = os.path.join(copy, "lockandkey.ntr")
+        with open(path) as f:
+            source = f.read()
+        with open(path, 'w') as f:
+            f.write(source.replace('"You can move right. What',
+                                   '"You can only move right. What'))
+        report = StringIO()
+        build.build([copy], 1, self.output, cache_dir, report)
+        self.assertTrue("blocks reused" in report.getvalue())
+
+    def test_build_cache_write_fails(self):
+        """Test that a file still builds if the cache can't be written."""
+        def put(self, *args):
+            raise IOError("disk full")
+        original = build.CompileCache.put
+        build.CompileCache.put = put
+        try:
+            report = StringIO()
+            failed = build.build([self.corpus], 1, self.output,
+                                 os.path.join(self.directory, "cache"),
+                                 report)
+        finally:
+            build.CompileCache.put = original
+        self.assertEqual(failed, 0)
+        self.assertTrue("3 files, 3 ok, 0 failed" in report.getvalue())
+
+    def test_build_reports_failures(self):
+        """Test that a file that does not compile is counted as failed."""
+        shutil.copy("sampleprograms/6_missing_setup.ntr", self.corpus)
+        report = StringIO()
+        failed = build.build([self.corpus], 1, self.output, out=report)
+        self.assertEqual(failed, 1)
+        self.assertTrue("FAILED" in report.getvalue())
+        self.assertTrue("ERROR: Line 2" in report.getvalue())
@@ -0,0 +1,88 @@
+import narratr.parser as parser
+import narratr.codegen as codegen
+import narratr.cache as cache
+from narratr.diagnostics import Diagnostics
+import unittest
+import tempfile
+import shutil
+import os
+
+
+class TestCompileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open('sampleprograms/3_arithmetic.ntr') as f:
+            self.source = f.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def compile(self, source):
+        p = parser.ParserForNarratr()
+        ast = p.parse(source)
+        c = codegen.CodeGen()
+        c.process(ast, p.symtab)
+        return ast, p.symtab, c.code()
+
+    def test_cache_miss(self):
+        """Test that an empty cache misses."""
+        c = cache.CompileCache(self.directory)
+        self.assertEqual(c.get(self.source), None)
+
+    def test_cache_roundtrip(self):
+        """Test that a cached compile comes back with the same code."""
+        c = cache.CompileCache(self.directory)
+        ast, symtab, code = self.compile(self.source)
+        c.put(self.source, ast, symtab, code)
+        cached = c.get(self.source)
+        self.assertNotEqual(cached, None)
+        self.assertEqual(cached[2], code)
+        self.assertEqual(cached[0].type, "program")
+
+    def test_cache_keeps_diagnostics(self):
+        """Test that what a compile reported comes back with it."""
+        c = cache.CompileCache(self.directory)
+        ast, symtab, code = self.compile(self.source)
+        diagnostics = Diagnostics()
+        diagnostics.warning("Something is odd.", 3)
+        c.put(self.source, ast, symtab, code, diagnostics)
+        self.assertEqual([str(d) for d in c.get(self.source)[3]],
+                         ["WARNING: Line 3: Something is odd."])
+        c.put(self.source, ast, symtab, code)
+        self.assertEqual(len(c.get(self.source)[3]), 0)
+
+    def test_compiler_files(self):
+        """Test that the cache key covers every module of the compiler
+        that what it produces depends on."""
+        here = os.path.dirname(os.path.abspath(cache.__file__))
+        for name in cache.COMPILER_FILES:
+            self.assertTrue(os.path.isfile(os.path.join(here, name)), name)
+        for name in ["narratr_parsetab.py", "narratr_runtime.py",
+                     "diagnostics.py", "astgen.py"]:
+            self.assertTrue(name in cache.COMPILER_FILES, name)
+
+    def test_cache_key_changes_with_source(self):
+        """Test that different sources do not share an entry."""
+        c = cache.CompileCache(self.directory)
+        ast, symtab, code = self.compile(self.source)
+        c.put(self.source, ast, symtab, code)
+        self.assertEqual(c.get(self.source + "\n"), None)
+
+    def test_cache_eviction(self):
+        """Test that the cache stays under its size bound."""
+        c = cache.CompileCache(self.directory, max_bytes=1)
+        ast, symtab, code = self.compile(self.source)
+        c.put(self.source, ast, symtab, code)
+        c.put(self.source + "\n", ast, symtab, code)
+        entries = [n for n in os.listdir(self.directory)
+                   if n.endswith(".ntrc")]
+        self.assertEqual(entries, [])
+
+    def test_cache_corrupt_entry(self):
+        """Test that a damaged entry is treated as a miss."""
+        c = cache.CompileCache(self.directory)
+        with open(os.path.join(self.directory,
+                               c.key(self.source) + ".ntrc"), 'w') as f:
+            f.write("not a pickle")
+        self.assertEqual(c.get(self.source), None)
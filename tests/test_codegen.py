@@ -1,6 +1,9 @@
 import narratr.parser as parser
 import narratr.codegen as codegen
+import narratr.narratr_runtime as runtime
+from narratr.diagnostics import CompileError
 from nose.tools import *
+from cStringIO import StringIO
 import subprocess
 import sys
 
@@ -38,10 +41,284 @@ def test_nonexistent_start_scene_error():
         ast = p.parse(f.read())
     symtab = p.symtab
     c = codegen.CodeGen()
-    assert_raises(SystemExit, lambda: c.process(ast, symtab))
+    assert_raises(CompileError, lambda: c.process(ast, symtab))
 
 
-def check_expected_output(fname, output):
+def test_moves_dispatch():
+
+    """Test that moving between scenes reaches the right scenes."""
+    check_expected_output("sampleprograms/5_moves.ntr",
+                          " -->>  -->>  -->>  -->> == GAME TERMINATED ==\n",
+                          "move right\nmove right\nmove left\nexit\n")
+
+
+def test_command():
+
+    """Test that player input is normalized and split into a command."""
+    runtime.raw_input = lambda prompt: "  Kick, THE\tllama! "
+    try:
+        response = runtime.get_response({})
+        assert_equal(response, "kick the llama")
+        assert_equal((response.verb, response.args, response.raw),
+                     ("kick", ["the", "llama"], "  Kick, THE\tllama! "))
+        runtime.raw_input = lambda prompt: "Move North."
+        assert_equal(runtime.get_response({"north": 2}), [2])
+    finally:
+        del runtime.raw_input
+
+
+# Returns the code generated for a program with a single scene, $1, whose
+# setup block is setup, and an empty scene $2.
+def scene_code(setup):
+    p = parser.ParserForNarratr()
+    ast = p.parse("scene $1 {\n    setup:\n" + setup + "    action:\n" +
+                  "    cleanup:\n}\nscene $2 {\n    setup:\n" +
+                  "    action:\n    cleanup:\n}\nstart: $1\n")
+    c = codegen.CodeGen()
+    c.process(ast, p.symtab)
+    return c.code()
+
+
+def test_static_moves():
+
+    """Test that moves declared up front become a table on the class."""
+    code = scene_code("        say 1\n        moves right($2)\n")
+    assert_true("class s_1(Scene):\n    __slots__ = ()\n" +
+                "    moves = {'right': 2}\n" in code)
+    assert_true("class s_2(Scene):\n    __slots__ = ()\n\n" in code)
+    assert_false("moves = {}" in code)
+    assert_false("self._directions = {" in code)
+
+
+def test_conditional_moves():
+
+    """Test that moves that depend on the game are left where they are."""
+    code = scene_code("        if true:\n            moves right($2)\n")
+    assert_false("moves = {'right'" in code)
+    assert_true("if not self._directions: self._directions = " +
+                "{'right': 2}" in code)
+
+
+def test_lazy_scenes():
+
+    """Test that each scene is made when it is first entered, and kept."""
+    namespace = {}
+    exec scene_code("        moves right($2)\n") in namespace
+    scenes = namespace["scenes"]
+    assert_equal(scenes, {})
+    scene = scenes[1]
+    assert_true(scenes[1] is scene)
+    assert_equal(scenes.keys(), [1])
+    assert_equal((scene._directions, scene._scenes), ({"right": 2}, scenes))
+
+
+def test_variables():
+
+    """Test that variables used by one block are locals of its method, and
+    that those shared between blocks only last one visit."""
+    p = parser.ParserForNarratr()
+    ast = p.parse("scene $1 {\n    setup:\n        x is 1\n" +
+                  "        y is 2\n        god g is 0\n" +
+                  "    action:\n        say x + g\n    cleanup:\n" +
+                  "        say x\n}\nstart: $1\n")
+    c = codegen.CodeGen()
+    c.process(ast, p.symtab)
+    code = c.code()
+    assert_true("__slots__ = ('g_g', 'v_x')" in code)
+    assert_true("        self.v_x = 1\n        v_y = 2\n" in code)
+    assert_true("print (self.v_x) + self.g_g" in code)
+    assert_true("        try:\n            del self.v_x\n" in code)
+    assert_false("__namespace" in code)
+
+
+def test_action_block():
+
+    """Test that the action block runs once for each response, with its
+    variables lasting from one to the next, and that a continue outside
+    its while loops goes on to the next response."""
+    p = parser.ParserForNarratr()
+    ast = p.parse("scene $1 {\n    setup:\n    action:\n" +
+                  "        if response == \"set\":\n            x is 5\n" +
+                  "            continue\n        while true:\n" +
+                  "            break\n        say x\n    cleanup:\n}\n" +
+                  "start: $1\n")
+    c = codegen.CodeGen()
+    c.process(ast, p.symtab)
+    code = c.code()
+    assert_true("    def respond(self, response):\n" in code)
+    assert_false("def setup(self)" in code)
+    stdin, stdout = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = StringIO("set\nshow\nexit\n"), StringIO()
+    try:
+        exec code in {"__name__": "__main__"}
+    except SystemExit:
+        pass
+    finally:
+        output = sys.stdout.getvalue()
+        sys.stdin, sys.stdout = stdin, stdout
+    assert_equal(output, " -->>  -->> 5\n -->> == GAME TERMINATED ==\n")
+    ast = p.parse("scene $1 {\n    setup:\n    action:\n" +
+                  "        break\n    cleanup:\n}\nstart: $1\n")
+    assert_raises(CompileError, codegen.CodeGen().process, ast, p.symtab)
+
+
+def test_god_variables():
+
+    """Test that god variables start off unset rather than missing."""
+    p = parser.ParserForNarratr()
+    ast = p.parse("scene $1 {\n    setup:\n        god g is 0\n" +
+                  "        god h is 1\n    action:\n    cleanup:\n}\n" +
+                  "item lamp() {\n    god lit is false\n}\nstart: $1\n")
+    c = codegen.CodeGen(keep_all=True)
+    c.process(ast, p.symtab)
+    code = c.code()
+    assert_true("def __init__(self):\n        self.g_g = self.g_h = _unset\n"
+                in code)
+    assert_true("if self.g_g is _unset:\n            self.g_g = 0" in code)
+    assert_true("def __init__(self):\n        self.lit = _unset\n" +
+                "        if self.lit is _unset:" in code)
+    assert_false("AttributeError" in code)
+
+
+def test_god_variable_names():
+
+    """Test that god variables can have the names of what a scene gets
+    from Scene."""
+    p = parser.ParserForNarratr()
+    ast = p.parse("scene $1 {\n    setup:\n        god respond is 1\n" +
+                  "        god scenes is 2\n    action:\n" +
+                  "        say respond + scenes\n    cleanup:\n}\n" +
+                  "start: $1\n")
+    c = codegen.CodeGen()
+    c.process(ast, p.symtab)
+    stdin, stdout = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = StringIO("look\nexit\n"), StringIO()
+    try:
+        exec c.code() in {"__name__": "__main__"}
+    except SystemExit:
+        pass
+    finally:
+        output = sys.stdout.getvalue()
+        sys.stdin, sys.stdout = stdin, stdout
+    assert_equal(output, " -->> 3\n -->> == GAME TERMINATED ==\n")
+
+
+def test_items():
+
+    """Test that items have slots, and constant items are made once."""
+    p = parser.ParserForNarratr()
+    ast = p.parse("scene $1 {\n    setup:\n    action:\n    cleanup:\n}\n" +
+                  "item lamp() {\n    name is \"lamp\"\n    lit is false\n" +
+                  "    name is \"old lamp\"\n}\n" +
+                  "item pony(pid) {\n    id is pid\n    god g is 1\n}\n" +
+                  "start: $1\n")
+    c = codegen.CodeGen(keep_all=True)
+    c.process(ast, p.symtab)
+    code = c.code()
+    assert_true("class pony(object):\n    __slots__ = ('g', 'id')\n" in code)
+    assert_true("class lamp(object):\n    __slots__ = ()\n" +
+                "    __instance = None\n    name = 'old lamp'\n" +
+                "    lit = False\n" in code)
+    namespace = {}
+    exec code in namespace
+    lamp = namespace["lamp"]()
+    assert_true(lamp is namespace["lamp"]())
+    assert_true(lamp == namespace["lamp"]())
+    assert_equal((lamp.name, lamp.lit), ("old lamp", False))
+    pony = namespace["pony"](3)
+    assert_equal((pony.id, pony.g), (3, 1))
+    assert_false(hasattr(pony, "__dict__") or hasattr(lamp, "__dict__"))
+    c = codegen.CodeGen(optimize=False, keep_all=True)
+    c.process(ast, p.symtab)
+    assert_true("class lamp(object):\n    __slots__ = ('lit', 'name')\n" in
+                c.code())
+
+
+def test_start_scene_with_errors():
+
+    """Test that a start scene with errors is not also reported missing."""
+    p = parser.ParserForNarratr()
+    ast = p.parse("scene $1 {\n    setup:\n        say pocket.foo(1)\n" +
+                  "    action:\n    cleanup:\n}\nstart: $1\n")
+    c = codegen.CodeGen()
+    assert_raises(CompileError, c.process, ast, p.symtab)
+    assert_equal([str(d) for d in c.diagnostics.errors()],
+                 ["ERROR: Line 3: invalid method for pocket"])
+
+
+def test_item_names():
+
+    """Test that an item can't have the name of a global of the game."""
+    p = parser.ParserForNarratr()
+    for name in ["scenes", "Scene", "_unset", "s_1", "object", "globals"]:
+        ast = p.parse("scene $1 {\n    setup:\n    action:\n" +
+                      "    cleanup:\n}\nitem " + name + "() {\n" +
+                      "    x is 1\n}\nstart: $1\n")
+        c = codegen.CodeGen(keep_all=True)
+        assert_raises(CompileError, c.process, ast, p.symtab)
+        assert_equal(str(c.diagnostics.errors()[0]),
+                     "ERROR: Line 6: Item '" + name + "' has the name of " +
+                     "part of the game itself. Call it something else.")
+
+
+def test_moves_to_missing_scene():
+
+    """Test that moving to a scene that does not exist is an error."""
+    assert_raises(CompileError, scene_code, "        moves right($3)\n")
+    errors = []
+    try:
+        scene_code("        if true:\n            moves left($4)\n")
+    except CompileError as e:
+        errors = [str(d) for d in e.diagnostics.errors()]
+    assert_equal(errors[:1], ["ERROR: Line 4: Scene $4 does not exist."])
+
+
+class UpperCaseStrings(codegen.CodeGen):
+    """A backend that shouts every string literal."""
+    @codegen.handles("atom")
+    def _shout(self, atom):
+        if atom.is_leaf() and atom.v_type == "string":
+            return repr(str(atom.value).upper())
+        return codegen.CodeGen._process_atom(self, atom)
+
+
+class NoisyNumbers(codegen.CodeGen):
+    """A backend that overrides a handler without registering it again."""
+    def _process_number(self, number):
+        return "(" + str(number.value) + ")"
+
+
+def test_handler_registry():
+
+    """Test that subclasses can take over the handling of a node type."""
+    p = parser.ParserForNarratr()
+    with open('sampleprograms/3_arithmetic.ntr') as f:
+        ast = p.parse(f.read())
+    c = codegen.CodeGen()
+    c.process(ast, p.symtab)
+    plain = c.code()
+    c = UpperCaseStrings()
+    c.process(ast, p.symtab)
+    assert_true("' THREE'" in c.code())
+    assert_true("' three'" in plain)
+    c = NoisyNumbers()
+    c.process(ast, p.symtab)
+    assert_true("(3)" in c.code())
+    assert_true(codegen.CodeGen().handlers["atom"] is
+                codegen.CodeGen._process_atom.im_func)
+
+
+def test_unexpected_node_type():
+
+    """Test that a node with no handler is reported, not crashed on."""
+    c = codegen.CodeGen()
+    assert_raises(codegen._BlockError, c.visit,
+                  codegen.Node(None, "mystery"), 1)
+    assert_equal(str(c.diagnostics.errors()[0]),
+                 "ERROR: Found unexpected node type 'mystery'.")
+
+
+def check_expected_output(fname, output, response='hello'):
 
     """Run each compiled program and check for output correctness."""
     p = parser.ParserForNarratr()
@@ -58,7 +335,7 @@ def check_expected_output(fname, output):
     else:
         proc = subprocess.Popen(['python', 'temp.py'],
                                 stdout=subprocess.PIPE, stdin=subprocess.PIPE)
-        proc.stdin.write('hello')
+        proc.stdin.write(response)
         p_output = proc.communicate()[0]
         expected_output = output
         assert_equal(p_output, expected_output,
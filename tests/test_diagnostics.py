@@ -0,0 +1,66 @@
+import narratr.parser as parser
+import narratr.codegen as codegen
+import narratr.lexer as lexer
+from narratr.diagnostics import Diagnostics, CompileError
+import unittest
+
+SCENE = "scene $%d {\n    setup:\n%s    action:\n    cleanup:\n}\n"
+
+
+class TestDiagnostics(unittest.TestCase):
+
+    def test_lexer_recovers(self):
+        """Test that the lexer reports a bad character and carries on."""
+        l = lexer.LexerForNarratr()
+        l.input('say 1 ; say 2\n')
+        tokens = []
+        t = l.token()
+        while t:
+            tokens.append(t.type)
+            t = l.token()
+        self.assertEqual(tokens, ["SAY", "INTEGER", "SAY", "INTEGER",
+                                  "NEWLINE"])
+        errors = l.diagnostics.errors()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual((errors[0].line, errors[0].column), (1, 7))
+
+    def test_parser_reports_every_block(self):
+        """Test that one parse reports the syntax errors in every block."""
+        source = (SCENE % (1, "        say\n") + "\n" +
+                  SCENE % (2, "") + "\n" +
+                  SCENE % (3, "        x is is 1\n") + "start: $1\n")
+        p = parser.ParserForNarratr()
+        try:
+            p.parse(source)
+        except CompileError as e:
+            lines = [d.line for d in e.diagnostics.errors()]
+        else:
+            self.fail("parse() did not raise CompileError")
+        self.assertEqual(lines, [3, 16])
+
+    def test_parser_semantic_errors(self):
+        """Test that type and duplicate scene errors are all reported."""
+        source = (SCENE % (1, '        say "a" - "b"\n') + "\n" +
+                  SCENE % (1, '        say 1 + "b"\n'))
+        p = parser.ParserForNarratr()
+        with self.assertRaises(CompileError) as cm:
+            p.parse(source)
+        messages = [d.message for d in cm.exception.diagnostics]
+        self.assertEqual(len(messages), 3)
+        self.assertTrue("already exists" in messages[2])
+
+    def test_codegen_errors(self):
+        """Test that code generation errors are collected, not fatal."""
+        p = parser.ParserForNarratr()
+        ast = p.parse(SCENE % (1, "") + "start: $2\n")
+        c = codegen.CodeGen()
+        self.assertRaises(CompileError, c.process, ast, p.symtab)
+        self.assertEqual([str(d) for d in c.diagnostics],
+                         ["ERROR: Start scene $2 does not exist."])
+
+    def test_reparse_clears(self):
+        """Test that a parser forgets the errors of its previous parse."""
+        p = parser.ParserForNarratr()
+        self.assertRaises(CompileError, p.parse, SCENE % (1, "        say\n"))
+        p.parse(SCENE % (1, ""))
+        self.assertEqual(len(p.diagnostics), 0)
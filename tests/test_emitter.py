@@ -0,0 +1,95 @@
+import narratr.parser as parser
+import narratr.codegen as codegen
+from narratr.emitter import Emitter
+from narratr.diagnostics import CompileError
+from cStringIO import StringIO
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class CountingStream:
+    """A stream that remembers the size of each write."""
+    def __init__(self):
+        self.writes = []
+        self.text = StringIO()
+
+    def write(self, text):
+        self.writes.append(len(text))
+        self.text.write(text)
+
+
+class TestEmitter(unittest.TestCase):
+
+    def test_emitter_indentation(self):
+        """Test that lines are written at the current indentation."""
+        e = Emitter()
+        e.line("while True:")
+        e.indent()
+        e.line("if x:")
+        e.indent()
+        e.line("break")
+        e.dedent()
+        e.line()
+        e.dedent()
+        e.write("x = 1")
+        self.assertEqual(e.getvalue(), "while True:\n    if x:\n" +
+                         "        break\n\nx = 1")
+        self.assertEqual(len(e), len(e.getvalue()))
+        self.assertRaises(ValueError, e.dedent)
+
+    def test_emitter_chunks(self):
+        """Test that a stream is written to in chunks, not per write."""
+        stream = CountingStream()
+        e = Emitter(stream, chunk_size=100)
+        for i in range(1000):
+            e.write("x" * 10)
+        e.flush()
+        self.assertEqual(stream.text.getvalue(), "x" * 10000)
+        self.assertEqual(stream.writes, [100] * 100)
+        self.assertEqual(len(e), 10000)
+        self.assertRaises(ValueError, e.getvalue)
+
+
+class TestStreamingCodeGen(unittest.TestCase):
+
+    def setUp(self):
+        with open('sampleprograms/lockandkey.ntr') as f:
+            self.source = f.read()
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def generate(self, stream=None):
+        p = parser.ParserForNarratr()
+        c = codegen.CodeGen(stream=stream)
+        c.process(p.parse(self.source), p.symtab)
+        return c
+
+    def test_codegen_stream(self):
+        """Test that streamed code is the same as code kept in memory."""
+        stream = StringIO()
+        self.generate(stream).finish()
+        self.assertEqual(stream.getvalue(), self.generate().code())
+
+    def test_generate_file(self):
+        """Test that only a program that compiles replaces the file."""
+        path = os.path.join(self.dir, "game.py")
+        p = parser.ParserForNarratr()
+        codegen.generate_file(p.parse(self.source), p.symtab, path)
+        with open(path) as f:
+            self.assertEqual(f.read(), self.generate().code())
+        ast = p.parse("scene $1 {\n    setup:\n    action:\n" +
+                      "    cleanup:\n}\nstart: $2\n")
+        self.assertRaises(CompileError, codegen.generate_file, ast,
+                          p.symtab, path)
+        with open(path) as f:
+            self.assertEqual(f.read(), self.generate().code())
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ["game.py", "narratr_runtime.py"])
+
+
+if __name__ == '__main__':
+    unittest.main()
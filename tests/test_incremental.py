@@ -0,0 +1,74 @@
+import narratr.parser as parser
+import narratr.codegen as codegen
+import narratr.incremental as incremental
+from narratr.diagnostics import CompileError
+import unittest
+
+
+class TestIncremental(unittest.TestCase):
+
+    def setUp(self):
+        with open('sampleprograms/lockandkey.ntr') as f:
+            self.source = f.read()
+        self.parser = parser.ParserForNarratr()
+
+    def full_compile(self, source):
+        ast = self.parser.parse(source)
+        c = codegen.CodeGen()
+        c.process(ast, self.parser.symtab)
+        return c.code()
+
+    def test_split_blocks(self):
+        """Test that a program is cut into its top-level blocks."""
+        blocks = incremental.split_blocks(self.source)
+        kinds = [b.kind for b in blocks]
+        self.assertEqual(set(kinds), set(["scene", "item"]))
+        self.assertEqual(blocks[0].lineno, 1)
+        self.assertTrue(all(b.key is not None for b in blocks))
+
+    def test_split_blocks_unsafe(self):
+        """Test that text that can't be cut up safely is refused."""
+        self.assertEqual(incremental.split_blocks("scene $1 {\n"), None)
+        self.assertEqual(incremental.split_blocks("x = 1\n"), None)
+
+    def test_matches_full_compile(self):
+        """Test that an incremental compile generates the same code."""
+        compiler = incremental.IncrementalCompiler()
+        code = compiler.compile(self.source, self.parser)
+        self.assertEqual(code, self.full_compile(self.source))
+        self.assertEqual(compiler.reused, 0)
+
+    def test_only_changed_blocks(self):
+        """Test that only the edited scene is recompiled."""
+        compiler = incremental.IncrementalCompiler()
+        compiler.compile(self.source, self.parser)
+        total = compiler.compiled
+        edited = self.source.replace('"You can move right. What',
+                                     '"You can only move right. What')
+        self.assertNotEqual(edited, self.source)
+        code = compiler.compile(edited, self.parser)
+        self.assertEqual(compiler.compiled, 1)
+        self.assertEqual(compiler.reused, total - 1)
+        self.assertEqual(code, self.full_compile(edited))
+
+    def test_errors_match_full_compile(self):
+        """Test that a block that doesn't parse is the only error, as in a
+        full compile."""
+        with open('sampleprograms/6_different_order.ntr') as f:
+            source = f.read()
+        try:
+            self.parser.parse(source)
+        except CompileError as e:
+            expected = [str(d) for d in e.diagnostics.errors()]
+        compiler = incremental.IncrementalCompiler()
+        self.assertRaises(CompileError, compiler.compile, source,
+                          self.parser)
+        self.assertEqual([str(d) for d in compiler.diagnostics.errors()],
+                         expected)
+
+    def test_duplicate_scene(self):
+        """Test that a scene declared twice is still an error."""
+        source = "scene $1 {\n    setup:\n    action:\n    cleanup:\n}\n"
+        compiler = incremental.IncrementalCompiler()
+        self.assertRaises(CompileError, compiler.compile, source + source,
+                          self.parser)
@@ -0,0 +1,45 @@
+import narratr.parser as parser
+from narratr.node import Node
+import cPickle as pickle
+import unittest
+
+
+class TestNode(unittest.TestCase):
+
+    def setUp(self):
+        with open('sampleprograms/lockandkey.ntr') as f:
+            self.ast = parser.ParserForNarratr().parse(f.read())
+
+    def test_node_slots(self):
+        """Test that nodes have no per-instance dictionary."""
+        self.assertFalse(hasattr(Node(1, "atom"), "__dict__"))
+        self.assertRaises(AttributeError, setattr, Node(1, "atom"), "x", 1)
+
+    def test_node_leaf_children(self):
+        """Test that leaf nodes don't share a mutable list of children."""
+        a = Node(1, "atom")
+        b = Node(2, "atom")
+        self.assertTrue(a.is_leaf())
+        self.assertRaises(AttributeError, lambda: a.children.append(b))
+        self.assertEqual(len(b.children), 0)
+
+    def test_node_interned_type(self):
+        """Test that node types are interned."""
+        t = "".join(["scene", "_block"])
+        self.assertTrue(Node(1, t).type is "scene_block")
+
+    def test_node_accessors(self):
+        """Test the named child accessors."""
+        blocks = self.ast.blocks
+        self.assertTrue(blocks is self.ast[0])
+        scene = blocks.scenes[2]
+        self.assertEqual(scene.setup.type, "setup_block")
+        self.assertEqual(scene.cleanup.type, "cleanup_block")
+        self.assertEqual(blocks.items["lock"].params.type, "itemparams")
+        self.assertEqual(blocks.start_states, [])
+        self.assertRaises(AttributeError, lambda: scene.test)
+
+    def test_node_pickle(self):
+        """Test that an AST survives pickling."""
+        copy = pickle.loads(pickle.dumps(self.ast, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(repr(copy), repr(self.ast))
@@ -0,0 +1,222 @@
+import narratr.parser as parser
+import narratr.codegen as codegen
+from narratr.incremental import IncrementalCompiler
+from narratr.optimize import ConstantFolder, fold_constants
+from cStringIO import StringIO
+import sys
+import unittest
+
+
+# Wraps statements in a program with a single scene.
+def program(setup):
+    return "scene $1 {\n    setup:\n" + \
+        "".join("        " + line + "\n" for line in setup.split("\n")) + \
+        "    action:\n    cleanup:\n}\nstart: $1\n"
+
+
+# Returns the code generated for the setup statements, one per line.
+def setup_code(setup, optimize=True):
+    p = parser.ParserForNarratr()
+    c = codegen.CodeGen(optimize=optimize)
+    c.process(p.parse(program(setup)), p.symtab)
+    code = c.code()
+    start = code.index("def setup(self):") + len("def setup(self):")
+    body = code[start:code.index("return self.action()")]
+    return [line.strip() for line in body.split("\n") if line.strip()]
+
+
+class TestConstantFolding(unittest.TestCase):
+
+    def test_fold_arithmetic(self):
+        """Test that arithmetic on literals is worked out."""
+        self.assertEqual(setup_code("x is 60 * 60 + 1\ny is -(2 + 3) * 2\n" +
+                                    "z is 7 / 2\nw is 7 // 2\n" +
+                                    "v is 0.1 + 0.2"),
+                         ["v_x = 3601",
+                          "v_y = -10",
+                          "v_z = 3.5",
+                          "v_w = 3",
+                          "v_v = 0.30000000000000004"])
+
+    def test_fold_strings_and_booleans(self):
+        """Test folding concatenation, comparisons and and/or/not."""
+        self.assertEqual(setup_code('x is "Hello, " + "World"\n' +
+                                    "y is 1 < 2 and not 3 == 4\n" +
+                                    "z is false and x\nw is true or x\n" +
+                                    "v is true and x"),
+                         ["v_x = 'Hello, World'",
+                          "v_y = True",
+                          "v_z = False",
+                          "v_w = True",
+                          "v_v = (True) and v_x"])
+
+    def test_fold_partial(self):
+        """Test that only the constant parts of an expression are folded."""
+        self.assertEqual(setup_code("x is 1\ny is x + 2 * 3\n" +
+                                    "z is [1 + 1, x]\nsay str(2 + 2)\n" +
+                                    "say (2 + 2).real\n" +
+                                    "while 1 > 2:\n    say 1"),
+                         ["v_x = 1",
+                          "v_y = (v_x) + 6", "v_z = [2, v_x]",
+                          "print str(4)", "print (4).real",
+                          "while False:", "print 1"])
+
+    def test_no_fold_errors(self):
+        """Test that an expression that would fail is left alone."""
+        self.assertEqual(setup_code("x is 1 / 0"),
+                         ["v_x = (1) / 0"])
+
+    def test_no_optimize(self):
+        """Test that folding can be turned off."""
+        self.assertEqual(setup_code("x is 1 + 2", optimize=False),
+                         ["v_x = (1) + 2"])
+
+    def test_removed(self):
+        """Test counting the nodes folding removes."""
+        p = parser.ParserForNarratr()
+        ast = p.parse(program("x is 1 + 2"))
+        # The 17 nodes under the sum's test become an atom and its number.
+        self.assertEqual(fold_constants(ast), 15)
+        self.assertEqual(fold_constants(ast), 0)
+        c = codegen.CodeGen()
+        c.process(p.parse(program("x is 1 + 2\ny is 3")), p.symtab)
+        self.assertEqual((c.folder.folded, c.folder.removed), (2, 24))
+
+    def test_deep_nesting(self):
+        """Test folding expressions nested deeper than Python's stack."""
+        p = parser.ParserForNarratr()
+        ast = p.parse(program("x is " + "(" * 400 + "1" + ")" * 400))
+        folder = ConstantFolder()
+        folder.fold(ast)
+        self.assertEqual(folder.folded, 1)
+        self.assertTrue(folder.removed > 400 * 9)
+
+
+# $1 and $2 lead to each other and use the lamp. Nothing leads to $3, which
+# uses the key, and nothing uses the rock.
+SHAKEN = """scene $1 {
+    setup:
+        say lamp.name
+    action:
+        moveto $2
+    cleanup:
+}
+scene $2 {
+    setup:
+    action:
+        moveto $1
+    cleanup:
+}
+scene $3 {
+    setup:
+        say key.name
+    action:
+    cleanup:
+}
+item lamp() {
+    name is "lamp"
+}
+item key() {
+    name is "key"
+}
+item rock() {
+    name is "rock"
+}
+start: $1
+"""
+
+
+class TestTreeShaking(unittest.TestCase):
+
+    def generate(self, keep_all=False):
+        p = parser.ParserForNarratr()
+        c = codegen.CodeGen(keep_all=keep_all)
+        c.process(p.parse(SHAKEN), p.symtab)
+        return c
+
+    def test_dropped(self):
+        """Test that dead scenes and items are left out, with warnings."""
+        c = self.generate()
+        self.assertEqual(c.scene_nums, [1, 2])
+        self.assertEqual(c.item_names, ["lamp"])
+        self.assertEqual(sorted(c.dropped),
+                         [("item", "key"), ("item", "rock"), ("scene", 3)])
+        self.assertEqual(len(c.diagnostics.warnings()), 3)
+        self.assertFalse("class s_3" in c.code())
+
+    def test_keep_all(self):
+        """Test that keep_all keeps every block."""
+        c = self.generate(keep_all=True)
+        self.assertEqual(c.scene_nums, [1, 2, 3])
+        self.assertEqual(sorted(c.item_names), ["key", "lamp", "rock"])
+        self.assertEqual(c.dropped, [])
+        self.assertEqual(c.diagnostics.warnings(), [])
+
+    def test_incremental(self):
+        """Test that an incremental compile leaves out the same blocks."""
+        compiler = IncrementalCompiler()
+        code = compiler.compile(SHAKEN, parser.ParserForNarratr())
+        self.assertEqual(code, self.generate().code())
+        self.assertEqual(len(compiler.diagnostics.warnings()), 3)
+
+
+# An if/elif chain on x that dispatch_chain() recognizes.
+CHAIN = """if x == "a" or x == "b":
+    say 1
+elif x == "c":
+    say 2
+elif 3 == x or x == "a":
+    say 3
+else:
+    say 4"""
+
+
+# Runs a program, returning what it printed before it ended.
+def run(source):
+    p = parser.ParserForNarratr()
+    c = codegen.CodeGen()
+    c.process(p.parse(source), p.symtab)
+    stdout = sys.stdout
+    sys.stdout = StringIO()
+    try:
+        exec c.code() in {"__name__": "__main__"}
+    except SystemExit:
+        pass
+    finally:
+        output = sys.stdout.getvalue()
+        sys.stdout = stdout
+    return output
+
+
+class TestDispatch(unittest.TestCase):
+
+    def test_dispatch(self):
+        """Test that a chain comparing one name to literals uses a table."""
+        code = setup_code("x is 1\n" + CHAIN)
+        self.assertEqual(code[1:4],
+                         ["try:", "_branch = self.__dispatch_0.get(v_x, 0)",
+                          "except TypeError:"])
+
+    def test_same_behaviour(self):
+        """Test that each value takes the branch the chain would."""
+        for value, output in [('"a"', "1"), ('"b"', "1"), ('"c"', "2"),
+                              ("3", "3"), ("3.0", "3"), ('"d"', "4"),
+                              ("[3]", "4")]:
+            self.assertEqual(run(program("x is " + value + "\n" + CHAIN +
+                                         "\nwin")), output + "\n", value)
+
+    def test_no_dispatch(self):
+        """Test that chains that aren't worth a table, or that compare
+        something else, are left alone."""
+        for chain in ['if x == "a":\n    say 1\nelif x == "b":\n    say 2',
+                      CHAIN.replace('x == "c"', 'y == "c"'),
+                      CHAIN.replace('x == "c"', 'x != "c"'),
+                      CHAIN.replace('x == "c"', 'x == y')]:
+            code = setup_code("x is 1\ny is 2\n" + chain)
+            self.assertFalse("_branch" in "".join(code), chain)
+        code = setup_code("x is 1\n" + CHAIN, optimize=False)
+        self.assertFalse("_branch" in "".join(code))
+
+
+if __name__ == '__main__':
+    unittest.main()
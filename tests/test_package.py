@@ -0,0 +1,130 @@
+import narratr.parser as parser
+import narratr.codegen as codegen
+import narratr.package as package
+from narratr.diagnostics import CompileError
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+
+# $1 and $2 lead to each other, and $1 uses the lamp.
+GAME = """scene $1 {
+    setup:
+        say lamp.name
+        moves right($2)
+    action:
+    cleanup:
+}
+scene $2 {
+    setup:
+        moves left($1)
+    action:
+    cleanup:
+}
+item lamp() {
+    name is "lamp"
+}
+item key() {
+    name is "key"
+}
+start: $1
+"""
+
+
+# Runs a game, a file or a package, in python with input as its stdin,
+# returning what it printed.
+def play(path, input):
+    p = subprocess.Popen([sys.executable, path], stdin=subprocess.PIPE,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return p.communicate(input)[0]
+
+
+class TestPackage(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        for name in ["s_1", "s_2", "items"]:
+            sys.modules.pop(name, None)
+
+    def write(self, source, name="game.pkg", keep_all=True):
+        p = parser.ParserForNarratr()
+        path = os.path.join(self.dir, name)
+        package.write_package(p.parse(source), p.symtab, path,
+                              keep_all=keep_all)
+        return path
+
+    def test_modules(self):
+        """Test that each scene gets a module, importing the items it uses."""
+        p = parser.ParserForNarratr()
+        g = package.PackageGen()
+        g.process(p.parse(GAME), p.symtab)
+        modules = g.modules()
+        self.assertEqual(sorted(modules), ["__init__.py", "__main__.py",
+                                           "items.py", "s_1.py", "s_2.py"])
+        self.assertTrue("from items import pocket, lamp\n" in
+                        modules["s_1.py"])
+        self.assertTrue("from items import pocket\n" in modules["s_2.py"])
+        self.assertTrue("class lamp(object)" in modules["items.py"])
+        self.assertFalse("class key" in modules["items.py"])
+        self.assertTrue("scenes = Scenes(SceneModules(globals()))" in
+                        modules["__main__.py"])
+        self.assertFalse("class " in modules["__main__.py"])
+
+    def test_same_behaviour_as_file(self):
+        """Test that a package plays like the same game as one file."""
+        input = "move right\nmove right\nmove left\nlook\nexit\n"
+        for name in ["2_derived", "3_arithmetic", "5_moves", "demo",
+                     "lockandkey", "pandora"]:
+            with open("sampleprograms/" + name + ".ntr") as f:
+                source = f.read()
+            p = parser.ParserForNarratr()
+            c = codegen.CodeGen()
+            c.process(p.parse(source), p.symtab)
+            path = os.path.join(self.dir, name + ".py")
+            c.construct(path)
+            self.assertEqual(play(self.write(source, name + ".pkg",
+                                             keep_all=False), input),
+                             play(path, input), name)
+
+    def test_scenes_imported_when_entered(self):
+        """Test that a scene's module is only imported when it is entered."""
+        path = self.write(GAME)
+        sys.path.insert(0, path)
+        try:
+            namespace = {"__name__": "narratr_package"}
+            execfile(os.path.join(path, "__main__.py"), namespace)
+            scenes = namespace["scenes"]
+            self.assertFalse("s_1" in sys.modules or "items" in sys.modules)
+            scenes[1]
+            self.assertTrue("s_1" in sys.modules and "items" in sys.modules)
+            self.assertFalse("s_2" in sys.modules)
+            scenes[2]
+            self.assertTrue("s_2" in sys.modules)
+        finally:
+            sys.path.remove(path)
+
+    def test_unchanged_modules_kept(self):
+        """Test that writing a package again leaves what hasn't changed."""
+        path = self.write(GAME)
+        for name in os.listdir(path):
+            os.utime(os.path.join(path, name), (0, 0))
+        self.write(GAME.replace('say lamp.name', 'say "lamp"'))
+        changed = [name for name in sorted(os.listdir(path))
+                   if os.path.getmtime(os.path.join(path, name))]
+        self.assertEqual(changed, ["s_1.py"])
+
+    def test_errors(self):
+        """Test that nothing is written for a program with errors."""
+        with open('sampleprograms/6_nonexistent_start_scene.ntr') as f:
+            self.assertRaises(CompileError, self.write, f.read())
+        self.assertEqual(os.listdir(self.dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import narratr.parser as parser
+from narratr.diagnostics import CompileError
 import unittest
 
 
@@ -11,7 +12,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_different_order.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_missing_action(self):
 
@@ -20,7 +21,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_missing_action.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_missing_cleanup(self):
 
@@ -29,7 +30,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_missing_cleanup.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_missing_setup(self):
 
@@ -38,7 +39,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_missing_setup.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_misspelled_start(self):
 
@@ -47,7 +48,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_misspelled_start.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_multiple_actions(self):
 
@@ -56,7 +57,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_multiple_actions.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_multiple_cleanups(self):
 
@@ -65,7 +66,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_multiple_cleanups.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_multiple_setups(self):
 
@@ -74,7 +75,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_multiple_setups.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_rogue_semicolon(self):
 
@@ -83,7 +84,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_rogue_semicolon.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_scene_name_conflict(self):
 
@@ -92,7 +93,7 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_scene_name_conflict.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
 
     def test_parser_unmatched_braces(self):
 
@@ -101,4 +102,4 @@ class TestParserForErrors(unittest.TestCase):
 
         p = parser.ParserForNarratr()
         with open('sampleprograms/6_unmatched_braces.ntr') as f:
-            self.assertRaises(SystemExit, lambda: p.parse(f.read()))
+            self.assertRaises(CompileError, lambda: p.parse(f.read()))
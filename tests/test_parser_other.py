@@ -1,4 +1,5 @@
 import narratr.parser as parser
+from narratr.diagnostics import CompileError
 import unittest
 
 
@@ -12,3 +13,49 @@ class TestParserForOtherthings(unittest.TestCase):
         p = parser.ParserForNarratr()
         with open('sampleprograms/5_moves.ntr') as f:
             ast = str(p.parse(f.read()))
+
+    def test_parser_tables_current(self):
+
+        """Test that the prebuilt parser tables match the grammar."""
+        p = parser.ParserForNarratr()
+        pdict = dict((k, getattr(p, k)) for k in dir(p))
+        pinfo = parser.yacc.ParserReflect(pdict)
+        pinfo.get_all()
+        self.assertEqual(pinfo.signature(),
+                         parser.narratr_parsetab._lr_signature,
+                         "Parser tables are out of date. Run " +
+                         "'python narratr.py tables' and commit the result.")
+
+    def test_parser_prebuilt_matches_yacc(self):
+
+        """Test that prebuilt and generated parsers build the same AST."""
+        with open('sampleprograms/lockandkey.ntr') as f:
+            source = f.read()
+        prebuilt = parser.ParserForNarratr()
+        generated = parser.ParserForNarratr(prebuilt=False, write_tables=0,
+                                            debug=0)
+        self.assertEqual(repr(prebuilt.parse(source)),
+                         repr(generated.parse(source)))
+
+    def test_parser_reuse(self):
+
+        """Test that a reused parser gives the same result as a new one."""
+        with open('sampleprograms/lockandkey.ntr') as f:
+            source = f.read()
+        p = parser.ParserForNarratr()
+        first = repr(p.parse(source))
+        first_symtab = repr(p.symtab)
+        second = repr(p.parse(source))
+        self.assertEqual(first, second)
+        self.assertEqual(first_symtab, repr(p.symtab))
+        self.assertEqual(second, repr(parser.ParserForNarratr().parse(source)))
+
+    def test_parser_not_fresh(self):
+
+        """Test that fresh=False keeps the previous symbol table."""
+        with open('sampleprograms/5_moves.ntr') as f:
+            source = f.read()
+        p = parser.ParserForNarratr()
+        p.parse(source)
+        self.assertRaises(CompileError,
+                          lambda: p.parse(source, fresh=False))
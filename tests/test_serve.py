@@ -0,0 +1,70 @@
+import narratr.serve as serve
+import unittest
+import tempfile
+import threading
+import shutil
+import os
+import socket
+
+
+class TestCompileService(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "narratr.sock")
+        self.server = serve.CompileServer(self.path,
+                                          serve.CompileService(workers=2))
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_serve_compile(self):
+        """Test that the service compiles a program."""
+        with open('sampleprograms/5_moves.ntr') as f:
+            response = serve.request(self.path, {"source": f.read()})
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["diagnostics"], [])
+        self.assertEqual(response["ast"]["scenes"], [1, 2, 3])
+        self.assertEqual(response["ast"]["start"], 1)
+        self.assertTrue("class s_3" in response["code"])
+
+    def test_serve_error(self):
+        """Test that a syntax error comes back as a diagnostic."""
+        with open('sampleprograms/6_missing_setup.ntr') as f:
+            response = serve.request(self.path, {"source": f.read()})
+        self.assertFalse(response["ok"])
+        self.assertEqual(response["code"], None)
+        self.assertEqual(response["diagnostics"][0]["severity"], "error")
+        self.assertEqual(response["diagnostics"][0]["line"], 2)
+        self.assertEqual(response["diagnostics"][0]["column"], 2)
+
+    def test_serve_stats(self):
+        """Test that the service reports latency percentiles."""
+        with open('sampleprograms/0_helloworld.ntr') as f:
+            source = f.read()
+        for i in range(3):
+            serve.request(self.path, {"source": source})
+        stats = serve.request(self.path, {"command": "stats"})
+        self.assertEqual(stats["count"], 3)
+        self.assertTrue(stats["p50"] <= stats["p99"] <= stats["max"])
+
+    def test_serve_unknown_request(self):
+        """Test that JSON that isn't an object gets an answer."""
+        for message in [[1], "stats", 3, {"command": "dance"}]:
+            self.assertEqual(serve.request(self.path, message),
+                             {"ok": False, "error": "unknown request"})
+
+    def test_serve_leaves_other_files(self):
+        """Test that the service won't remove a file that isn't a socket."""
+        path = os.path.join(self.directory, "story.ntr")
+        with open(path, 'w') as f:
+            f.write("scene")
+        self.assertRaises(socket.error, serve.CompileServer, path,
+                          serve.CompileService(workers=1))
+        with open(path) as f:
+            self.assertEqual(f.read(), "scene")
@@ -0,0 +1,77 @@
+import narratr.parser as parser
+from narratr.node import Node
+from narratr.symtab import SymTab, GLOBAL, POCKET
+import cPickle as pickle
+import unittest
+
+
+class TestSymTab(unittest.TestCase):
+
+    def setUp(self):
+        self.s = SymTab()
+        self.s.insert("key", None, "item", "GLOBAL")
+        self.s.insert("x", None, None, 1)
+        self.s.insert("y", None, None, 1, True)
+        self.s.insert("x", None, None, "item.key")
+
+    def test_symtab_keys(self):
+        """Test that keys are (scope, symbol) tuples with named scopes."""
+        self.assertEqual(self.s.getKey("x", 1), (1, "x"))
+        self.assertEqual(self.s.getKey("key", "GLOBAL"), (GLOBAL, "key"))
+        self.assertEqual(self.s.getKey("a", "POCKET"), (POCKET, "a"))
+        key = self.s.getKey("".join(["k", "ey"]), GLOBAL)
+        self.assertTrue(key[1] is "key")
+        self.assertTrue(self.s.getWithKey(key) is self.s.get("key", GLOBAL))
+        self.assertEqual(self.s.get("key", "GLOBAL").scope, GLOBAL)
+
+    def test_symtab_duplicates(self):
+        """Test that a symbol can be declared once per scope."""
+        self.assertRaises(Exception, self.s.insert, "x", None, None, 1)
+        self.s.insert("x", None, None, 2)
+        self.s.update("x", 5, "integer", 2)
+        self.assertEqual(self.s.get("x", 2).value, 5)
+        self.assertRaises(Exception, self.s.update, "z", 5, "integer", 2)
+
+    def test_symtab_entries(self):
+        """Test iterating over the entries of one scope."""
+        self.assertEqual(sorted(self.s.entries(1)), ["x", "y"])
+        self.assertEqual(self.s.entries(3), {})
+        self.assertTrue("1.x : [x, None, None, 1, False]" in repr(self.s))
+        self.assertTrue("GLOBAL.key : " in repr(self.s))
+
+    def test_symtab_parsed(self):
+        """Test the symbol table the parser builds for a program."""
+        with open('sampleprograms/lockandkey.ntr') as f:
+            p = parser.ParserForNarratr()
+            p.parse(f.read())
+        self.assertEqual(p.symtab.get("lock", "GLOBAL").symboltype, "item")
+        self.assertEqual(p.symtab.get(2, "GLOBAL").symboltype, "scene")
+        s = pickle.loads(pickle.dumps(p.symtab, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(sorted(s.entries(GLOBAL)),
+                         sorted(p.symtab.entries(GLOBAL)))
+
+    def test_symtab_resolved_once_per_block(self):
+        """Test that names are attributed to their scene without recursion."""
+        depth = 400
+        source = ("scene $1 {\n    setup:\n        x is 1\n" +
+                  "        y is " + "(" * depth + "x" + ")" * depth + "\n" +
+                  "    action:\n    cleanup:\n}\n" +
+                  "scene $2 {\n    setup:\n        x is x\n" +
+                  "    action:\n    cleanup:\n}\n")
+        p = parser.ParserForNarratr()
+        ast = p.parse(source)
+        self.assertEqual(sorted(p.symtab.entries(1)), ["x", "y"])
+        atoms = []
+        stack = [ast.blocks.scenes[1]]
+        while stack:
+            node = stack.pop()
+            if node.type == "atom" and node.v_type == "id":
+                atoms.append(node)
+            stack.extend(c for c in node.children if isinstance(c, Node))
+        self.assertEqual([a.key for a in atoms], [(1, "x")])
+        self.assertEqual(p.symtab.get("x", 2).scope, 2)
+        self.assertEqual(p.refs, [])
+
+
+if __name__ == '__main__':
+    unittest.main()